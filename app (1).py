@@ -12,10 +12,18 @@ Ejecutar:
 
 import streamlit as st
 import pandas as pd
-import yfinance as yf
 import plotly.express as px
 import plotly.graph_objects as go
-import time
+import atexit
+import os
+import threading
+from datetime import date, timedelta
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from market_cache import MarketCache
+from market_data import FETCH_CONCURRENCY, fetch_concurrently
+from market_providers import DEFAULT_FIXTURES_DIR, HISTORY_DAYS, MarketDataProvider, make_provider
+from price_history import PriceHistory
 
 # ─────────────────────────────────────────────
 # CONFIGURACIÓN DE PÁGINA
@@ -157,12 +165,51 @@ SIMULATED_EXTRAS = {
     "ASML":  {"price_target": 850,  "analyst_rating": "Buy",  "pe": 32.0, "peg": 1.3, "roe": 45.0,  "eps_growth": 22.0, "div_yield": 0.9},
 }
 
+# ─────────────────────────────────────────────
+# PROVEEDOR DE DATOS Y CACHÉ PERSISTENTE
+# MARKET_PROVIDER: yfinance (por defecto), synthetic (sin red), record (yfinance
+# grabando fixtures en MARKET_FIXTURES) o replay (solo fixtures, sin red).
+# La caché (SQLite) la comparten todos los procesos: las entradas vencidas se
+# muestran al instante y se actualizan en segundo plano. Dos niveles: el precio
+# (consulta liviana, en bloque) vence rápido; los fundamentales (la pesada),
+# mucho más tarde. El historial de precios (barras diarias) se guarda aparte,
+# en columnas (Arrow), y se actualiza solo con los días nuevos.
+# ─────────────────────────────────────────────
+MARKET_PROVIDER = os.environ.get("MARKET_PROVIDER", "yfinance")
+MARKET_FIXTURES = os.environ.get("MARKET_FIXTURES", DEFAULT_FIXTURES_DIR)
+MARKET_CACHE_DB = "market_cache.db" if MARKET_PROVIDER == "yfinance" else f"market_cache_{MARKET_PROVIDER}.db"
+PRICE_HISTORY_FILE = (
+    "price_history.arrow" if MARKET_PROVIDER == "yfinance" else f"price_history_{MARKET_PROVIDER}.arrow"
+)
+PRICE_TTL = 60                  # segundos
+FUNDAMENTALS_TTL = 6 * 3600     # segundos
+
+
+@st.cache_resource
+def get_provider() -> MarketDataProvider:
+    """Proveedor de datos de mercado elegido por `MARKET_PROVIDER`."""
+    return make_provider(MARKET_PROVIDER, MARKET_FIXTURES)
+
+
+@st.cache_resource
+def get_market_cache() -> MarketCache:
+    """Caché de datos de mercado del proceso (una conexión y un pool de actualización)."""
+    cache = MarketCache(MARKET_CACHE_DB)
+    atexit.register(cache.close)
+    return cache
+
+
+@st.cache_resource
+def get_price_history() -> PriceHistory:
+    """Historial de precios del proceso (el archivo mapeado se comparte entre sesiones)."""
+    return PriceHistory(PRICE_HISTORY_FILE)
+
+
 # ─────────────────────────────────────────────
 # FUNCIÓN PRINCIPAL: fetch_stock_data
 # ─────────────────────────────────────────────
 
-@st.cache_data(ttl=3600, show_spinner=False)
-def fetch_stock_data(symbol: str) -> dict:
+def fetch_stock_data(symbol: str, price: dict = None, refresh=()) -> dict:
     """
     Obtiene datos de una acción.
 
@@ -177,14 +224,31 @@ def fetch_stock_data(symbol: str) -> dict:
     DATOS MIXTOS (yfinance los provee pero con gaps frecuentes):
       - pe_ratio, peg_ratio, roe, dividend_yield
 
+    Los datos del proveedor (`MARKET_PROVIDER`) pasan por la caché persistente
+    en dos niveles, "price" (`PRICE_TTL`) y "fundamentals" (`FUNDAMENTALS_TTL`),
+    que se combinan en la misma fila; si un nivel falla, sus campos se simulan.
+    `price` es el payload de precio ya obtenido en bloque (None: se pide solo
+    el de este símbolo). Los niveles en `refresh` se descargan de nuevo aunque
+    estén vigentes.
+
     Retorna dict normalizado con todos los campos requeridos.
     """
     sim = SIMULATED_EXTRAS.get(symbol, {})
     company_meta = next((c for c in COMPANIES if c["symbol"] == symbol), {})
 
     try:
-        ticker = yf.Ticker(symbol)
-        info = ticker.info
+        cache, provider = get_market_cache(), get_provider()
+        try:
+            fundamentals = cache.get(symbol, "fundamentals", provider.fundamentals, FUNDAMENTALS_TTL,
+                                     "fundamentals" in refresh)
+        except Exception:
+            fundamentals = {}
+        if price is None:
+            try:
+                price = cache.get(symbol, "price", provider.price, PRICE_TTL, "price" in refresh)
+            except Exception:
+                price = {}
+        info = {**fundamentals, **price}   # el precio del nivel rápido tiene prioridad
 
         # ── PRECIO ACTUAL — DATO REAL ──────────────────────────
         current_price = (
@@ -235,15 +299,41 @@ def fetch_stock_data(symbol: str) -> dict:
         }
 
 
-def load_all_data() -> pd.DataFrame:
-    """Carga y combina datos de las 20 empresas en un DataFrame."""
-    rows = []
+def load_all_data(max_workers: int = FETCH_CONCURRENCY, refresh=()) -> pd.DataFrame:
+    """
+    Carga y combina datos de las 20 empresas en un DataFrame.
+    Los precios se piden primero, todos en una sola consulta; los
+    fundamentales, en paralelo (a lo sumo `max_workers` a la vez), y la barra
+    de progreso avanza con cada respuesta, en el orden en que llegan. Al
+    final se agregan al historial de precios los días que le falten.
+    `refresh`: niveles de la caché ("price", "fundamentals") cuyas entradas
+    vigentes se ignoran.
+    """
+    rows = [None] * len(COMPANIES)
     progress = st.progress(0, text="Conectando con Yahoo Finance...")
-    for i, company in enumerate(COMPANIES):
-        data = fetch_stock_data(company["symbol"])
-        rows.append(data)
-        progress.progress((i + 1) / len(COMPANIES), text=f"Cargando {company['name']}...")
-        time.sleep(0.04)
+
+    # Los hilos comparten el contexto de la sesión para usar st.cache_resource
+    ctx = get_script_run_ctx()
+    attach_ctx = lambda: add_script_run_ctx(threading.current_thread(), ctx)
+
+    symbols = [company["symbol"] for company in COMPANIES]
+    try:
+        prices = get_market_cache().get_many(symbols, "price", get_provider().prices, PRICE_TTL,
+                                             "price" in refresh)
+    except Exception:
+        prices = {}   # cada símbolo pide su precio (o lo simula si también falla)
+    # Sin precio en bloque para un símbolo: None para que `fetch_stock_data` lo pida solo
+    fetch = lambda symbol: fetch_stock_data(symbol, prices.get(symbol), refresh)
+    results = fetch_concurrently(symbols, fetch, max_workers, initializer=attach_ctx)
+    for done, (i, _, data) in enumerate(results, start=1):
+        rows[i] = data
+        progress.progress(done / len(COMPANIES), text=f"Cargando {COMPANIES[i]['name']}...")
+
+    progress.progress(1.0, text="Actualizando historial de precios...")
+    try:
+        get_price_history().update(get_provider(), symbols)
+    except Exception:
+        pass   # sin historial nuevo: el gráfico muestra lo que ya estaba guardado
     progress.empty()
     return pd.DataFrame(rows)
 
@@ -270,15 +360,17 @@ if "df_loaded" not in st.session_state:
     st.session_state.df_loaded = False
 
 if not st.session_state.df_loaded:
-    df_raw = load_all_data()
+    df_raw = load_all_data(refresh=st.session_state.pop("refresh_data", ()))
     st.session_state.df = df_raw
     st.session_state.df_loaded = True
 else:
     df_raw = st.session_state.df
 
-# Botón para forzar actualización
-if st.sidebar.button("🔄 Actualizar precios"):
-    st.cache_data.clear()
+# Botones para forzar actualización: solo precios (liviano) o también fundamentales
+refresh_prices = st.sidebar.button("🔄 Actualizar precios")
+refresh_all = st.sidebar.button("Actualizar todo")
+if refresh_prices or refresh_all:
+    st.session_state.refresh_data = ("price", "fundamentals") if refresh_all else ("price",)
     st.session_state.df_loaded = False
     st.rerun()
 
@@ -501,6 +593,43 @@ fig_upside.update_layout(
 )
 st.plotly_chart(fig_upside, use_container_width=True)
 
+# ─────────────────────────────────────────────
+# GRÁFICO 3: EVOLUCIÓN DE PRECIOS
+# ─────────────────────────────────────────────
+st.markdown('<p class="section-head">📈 Evolución de Precios — Último Año (base 100)</p>', unsafe_allow_html=True)
+
+try:
+    since = date.today() - timedelta(days=HISTORY_DAYS)
+    closes = get_price_history().closes(df["symbol"].tolist(), start=since).astype(float)
+except Exception:
+    closes = pd.DataFrame()
+
+if closes.empty:
+    st.info("Todavía no hay historial de precios para las empresas seleccionadas.")
+else:
+    rebased = closes / closes.bfill().iloc[0] * 100
+    fig_history = go.Figure()
+    for symbol in rebased.columns:
+        fig_history.add_trace(go.Scatter(
+            x=rebased.index,
+            y=rebased[symbol],
+            name=symbol,
+            mode="lines",
+            line=dict(width=1.6),
+            hovertemplate=f"<b>{symbol}</b><br>%{{x|%d/%m/%Y}}: %{{y:.1f}}<extra></extra>",
+        ))
+    fig_history.update_layout(
+        plot_bgcolor="#0f172a",
+        paper_bgcolor="#0f172a",
+        font=dict(color="#94a3b8", family="DM Sans"),
+        legend=dict(bgcolor="rgba(0,0,0,0)", font=dict(color="#e2e8f0")),
+        xaxis=dict(gridcolor="#1e293b", tickfont=dict(color="#94a3b8")),
+        yaxis=dict(gridcolor="#1e293b", tickfont=dict(color="#94a3b8")),
+        margin=dict(l=10, r=10, t=20, b=10),
+        height=420,
+    )
+    st.plotly_chart(fig_history, use_container_width=True)
+
 # ─────────────────────────────────────────────
 # GRÁFICO RADAR – ANÁLISIS INDIVIDUAL
 # ─────────────────────────────────────────────
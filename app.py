@@ -6,9 +6,25 @@ Ejecutar con: streamlit run app.py
 """
 
 import streamlit as st
-import json
+import altair as alt
+import atexit
+import io
 import os
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
+
+import history_db
+from history_records import HistoryEntry, entry_inputs
+from history_store import HistoryWriter, iter_history, migrate_legacy_history
+from plan_export import player_filename, write_csv, write_ics
+from plan_rules import DEFAULT_PROFILE, PlanRules, default_rules
+from rerun_timing import TimingLog
+from trainer_core import DAYS_ES, DAYS_LABEL, OBJECTIVES, calculate_load, week_start
+from load_chart import load_series
+from trainer_render import (
+    day_cards_html, forecast_html, history_panel_html, load_cards_html, overload_warning_html,
+)
+from fitness_model import forecast_week, update_fitness
+from workload import ACWR_DANGER, ACWR_SWEET_SPOT, update_workload, workload_ratios
 
 # ─────────────────────────────────────────────
 # CONFIGURACIÓN DE PÁGINA
@@ -20,10 +36,31 @@ st.set_page_config(
     initial_sidebar_state="collapsed",
 )
 
+# ─────────────────────────────────────────────
+# TIEMPOS POR ETAPA
+# Siempre se miden (costo despreciable); lo demás se activa por entorno:
+#   TRAINER_DEBUG=1              panel lateral con los tiempos
+#   TRAINER_TIMING_LOG=archivo   una línea JSON por rerun
+#   TRAINER_PROFILE_DIR=carpeta  un perfil de cProfile (.prof) por rerun
+# ─────────────────────────────────────────────
+DEBUG_TIMING = os.environ.get("TRAINER_DEBUG", "") not in ("", "0")
+
+
+@st.cache_resource
+def get_timing_log() -> TimingLog:
+    """Buffer de tiempos de los últimos reruns, compartido por todas las sesiones."""
+    return TimingLog(log_path=os.environ.get("TRAINER_TIMING_LOG") or None,
+                     profile_dir=os.environ.get("TRAINER_PROFILE_DIR") or None)
+
+
+timing = get_timing_log()
+timing.begin("app")
+
 # ─────────────────────────────────────────────
 # ESTILOS CSS PERSONALIZADOS
 # ─────────────────────────────────────────────
-st.markdown("""
+with timing.stage("css"):
+    st.markdown("""
 <style>
   @import url('https://fonts.googleapis.com/css2?family=Barlow+Condensed:wght@400;600;700;800&family=Barlow:wght@300;400;500&display=swap');
 
@@ -202,444 +239,487 @@ st.markdown("""
 # ─────────────────────────────────────────────
 # CONSTANTES
 # ─────────────────────────────────────────────
-DAYS_ES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-DAYS_LABEL = {
-    "Monday": "Lunes", "Tuesday": "Martes", "Wednesday": "Miércoles",
-    "Thursday": "Jueves", "Friday": "Viernes", "Saturday": "Sábado", "Sunday": "Domingo"
+HISTORY_DB = "training_history.db"
+HISTORY_PANEL_SIZE = 5                          # entradas visibles en "Historial de carga"
+HISTORY_FILE = "training_history.jsonl"         # historial de un solo jugador (formato anterior)
+LEGACY_HISTORY_FILE = "training_history.json"   # formato original (array JSON)
+LEGACY_ATHLETE_ID = "jugador"                   # dueño del historial importado de los archivos anteriores
+
+# Criterios de orden del panel de plantilla: etiqueta → (clave, descendente)
+SQUAD_SORT = {
+    "Sobrecarga primero": (lambda r: (r["overload"], r["acwr"] or 0, r["variation_pct"] or 0), True),
+    "Carga actual": (lambda r: r["load"], True),
+    "Variación": (lambda r: (r["variation_pct"] is not None, r["variation_pct"] or 0), True),
+    "ACWR": (lambda r: (r["acwr"] is not None, r["acwr"] or 0), True),
+    "Jugador": (lambda r: r["athlete_id"], False),
 }
-HISTORY_FILE = "training_history.json"
 
 # ─────────────────────────────────────────────
 # FUNCIONES AUXILIARES
 # ─────────────────────────────────────────────
 
-def load_history() -> list:
-    """Carga el historial desde el archivo JSON. Devuelve lista vacía si no existe."""
-    if os.path.exists(HISTORY_FILE):
-        try:
-            with open(HISTORY_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            return []
-    return []
+@st.cache_resource
+def get_history_db():
+    """
+    Conexión SQLite compartida por todas las sesiones del servidor.
+    La primera vez importa el historial de los archivos anteriores.
+    """
+    conn = history_db.connect(HISTORY_DB)
+    migrate_legacy_history(LEGACY_HISTORY_FILE, HISTORY_FILE)
+    history_db.import_if_empty(conn, LEGACY_ATHLETE_ID, iter_history(HISTORY_FILE))
+    return conn
 
 
-def save_history(history: list) -> None:
-    """Guarda el historial en el archivo JSON."""
-    with open(HISTORY_FILE, "w", encoding="utf-8") as f:
-        json.dump(history, f, ensure_ascii=False, indent=2)
+@st.cache_resource
+def get_plan_rules() -> PlanRules:
+    """Reglas del plan (`plan_rules.yaml`), compiladas una vez por servidor."""
+    return default_rules()
 
 
-def calculate_load(minutes: int, fatigue: int) -> int:
+@st.cache_resource
+def get_history_writer() -> HistoryWriter:
     """
-    Calcula la carga semanal del jugador.
-    Fórmula: carga = minutos * fatiga
+    Cola de escritura compartida: los clics simultáneos se agrupan en una sola
+    transacción y la interfaz no espera a que termine.
     """
-    return minutes * fatigue
-
-
-def day_offset(base_day: str, offset: int) -> str:
-    """Devuelve el día de la semana sumando 'offset' días a 'base_day'."""
-    idx = DAYS_ES.index(base_day)
-    return DAYS_ES[(idx + offset) % 7]
+    conn = get_history_db()
+    writer = HistoryWriter(lambda items: history_db.insert_batch(conn, items))
+    atexit.register(writer.close)
+    return writer
 
 
-def intensity_bar_html(level: int, max_level: int = 5) -> str:
-    """Genera una barra de intensidad visual en HTML."""
-    colors = ["#607d8b", "#8bc34a", "#ffeb3b", "#ff9800", "#f44336"]
-    color = colors[min(level - 1, 4)]
-    width = int((level / max_level) * 100)
-    return (
-        f'<div class="intensity-bar" style="width:{width}%;background:{color};"></div>'
-        f'<span style="font-size:0.78rem;color:{color};margin-left:6px;">{level}/5</span>'
-    )
+def athlete_key(name: str) -> str:
+    """
+    Normaliza el nombre ingresado para usarlo como identificador del jugador.
+    Sin nombre devuelve "": no hay un jugador por defecto, así las sesiones
+    anónimas no comparten (ni mezclan) un mismo historial.
+    """
+    return " ".join(name.split()).lower()
 
 
-def card_class(session_type: str) -> str:
-    """Determina la clase CSS de la tarjeta según el tipo de sesión."""
-    t = session_type.lower()
-    if "match" in t or "partido" in t:
-        return "match"
-    if "rest" in t or "descanso" in t:
-        return "rest"
-    if "regen" in t or "recup" in t:
-        return "regen"
-    if "baja" in t or "activaci" in t:
-        return "low"
-    if "media" in t:
-        return "medium"
-    return "high"
-
-
-def generate_week_plan(
-    match: bool,
-    match_day: str,
-    fatigue: int,
-    objective: str
-) -> list:
+def _wait_pending_write() -> None:
     """
-    Genera el plan semanal de entrenamiento.
+    Espera la escritura encolada en un rerun anterior de esta sesión para leer
+    el historial actualizado. `build_result` hace todas sus lecturas antes de
+    encolar la suya, así que ningún rerun espera su propia escritura.
+    """
+    pending = st.session_state.pop("pending_history_write", None)
+    if pending is not None:
+        pending.result()
 
-    Parámetros:
-        match      - ¿Hay partido esta semana?
-        match_day  - Día del partido (string del día en inglés)
-        fatigue    - Nivel de fatiga (1–5)
-        objective  - 'Velocidad' | 'Resistencia' | 'Mantener'
 
-    Devuelve lista de dicts:
-        [{ 'day', 'type', 'detail', 'intensity' }, ...]
+def load_recent_history(athlete_id: str, n: int) -> list:
+    """
+    Carga solo las últimas `n` entradas del historial del jugador (la más reciente al final).
+    Devuelve lista vacía si no hay registros.
     """
+    _wait_pending_write()
+    return history_db.latest_entries(get_history_db(), athlete_id, n)
 
-    # Inicializar plan con descanso por defecto
-    plan = {day: {"type": "Descanso", "detail": "Recuperación completa. Hidratación y sueño.", "intensity": 0}
-            for day in DAYS_ES}
-
-    if match:
-        idx_match = DAYS_ES.index(match_day)
-
-        # Día del partido
-        plan[match_day] = {
-            "type": "⚽ MATCH DAY",
-            "detail": "Partido oficial. Calentamiento 15 min. Mantén concentración.",
-            "intensity": 5
-        }
-
-        # Día posterior → regenerativo
-        post = DAYS_ES[(idx_match + 1) % 7]
-        plan[post] = {
-            "type": "Regenerativo",
-            "detail": "Trote suave 15 min + estiramientos. Foco en recuperación.",
-            "intensity": 1
-        }
-
-        # 3 días antes → intensidad media
-        day_minus3 = DAYS_ES[(idx_match - 3) % 7]
-        plan[day_minus3] = _build_session("media", fatigue, objective)
-
-        # 2 días antes → intensidad baja
-        day_minus2 = DAYS_ES[(idx_match - 2) % 7]
-        plan[day_minus2] = _build_session("baja", fatigue, objective)
-
-        # 1 día antes → activación corta (NUNCA intenso)
-        day_minus1 = DAYS_ES[(idx_match - 1) % 7]
-        plan[day_minus1] = {
-            "type": "Activación",
-            "detail": "Activación corta 20 min: movilidad, pases cortos, remates suaves.",
-            "intensity": 2
-        }
 
-    else:
-        # Sin partido: plan distribuido por objetivos
-        sessions = _no_match_sessions(objective)
-        rest_days = set()
-
-        # Distribuir sesiones en días no consecutivos preferentemente
-        used = []
-        for i, session in enumerate(sessions):
-            day = DAYS_ES[i]
-            plan[day] = session
-            used.append(day)
-
-        # Los 2 días restantes quedan como descanso (ya inicializados)
-
-    # Ajuste de volumen si fatiga >= 4: reducir intensidad en 1 (mínimo 1)
-    if fatigue >= 4:
-        for day, session in plan.items():
-            if session["intensity"] > 1:
-                session["intensity"] = max(1, session["intensity"] - 1)
-                session["detail"] += " [Vol. -30% por fatiga alta]"
-
-    # Construir lista ordenada de lunes a domingo
-    return [{"day": day, **plan[day]} for day in DAYS_ES]
-
-
-def _build_session(intensity_level: str, fatigue: int, objective: str) -> dict:
-    """Genera una sesión según nivel de intensidad y objetivo."""
-    if intensity_level == "media":
-        if objective == "Velocidad":
-            return {
-                "type": "Velocidad / Media",
-                "detail": "Pasadas cortas 5×30m + circuito de agilidad 3 rondas.",
-                "intensity": 3
-            }
-        elif objective == "Resistencia":
-            return {
-                "type": "Resistencia / Media",
-                "detail": "Carrera continua 30 min ritmo moderado + técnica de balón.",
-                "intensity": 3
-            }
-        else:
-            return {
-                "type": "Balanceado / Media",
-                "detail": "Técnica de pase 20 min + trote 20 min. Ejercicios tácticos.",
-                "intensity": 3
-            }
-    else:  # baja
-        if objective == "Velocidad":
-            return {
-                "type": "Velocidad / Baja",
-                "detail": "Aceleración progresiva 4×20m. Sin forzar. Técnica de carrera.",
-                "intensity": 2
-            }
-        elif objective == "Resistencia":
-            return {
-                "type": "Aeróbico / Baja",
-                "detail": "Trote suave 25 min. Mantener frecuencia cardíaca baja.",
-                "intensity": 2
-            }
-        else:
-            return {
-                "type": "Técnica / Baja",
-                "detail": "Control, dominio y pases cortos. Ritmo tranquilo 25 min.",
-                "intensity": 2
-            }
-
-
-def _no_match_sessions(objective: str) -> list:
-    """Devuelve 5 sesiones para semana sin partido según objetivo."""
-    base = [
-        {
-            "type": "VO₂ Máx",
-            "detail": "Intervalos: 8×1 min al 90% + 1 min descanso. Mejora capacidad aeróbica.",
-            "intensity": 5
-        },
-        {
-            "type": "Pasadas Explosivas",
-            "detail": "Sprints 6×40m + cambios de dirección. Máxima potencia muscular.",
-            "intensity": 4
-        },
-        {
-            "type": "Fondo",
-            "detail": "Carrera continua 40 min a ritmo cómodo. Construir base aeróbica.",
-            "intensity": 3
-        },
-        {
-            "type": "Técnica",
-            "detail": "Control, regate, pases en corto y largo. Dominio del balón 45 min.",
-            "intensity": 2
-        },
-        {
-            "type": "Descanso Activo",
-            "detail": "Estiramientos, movilidad articular y foam roller 20 min.",
-            "intensity": 1
-        }
-    ]
+def load_entry_before(athlete_id: str, day: date):
+    """Última entrada del jugador anterior a `day` (por índice), o None si no hay."""
+    _wait_pending_write()
+    return history_db.latest_entry_before(get_history_db(), athlete_id, day.isoformat())
 
-    # Ajuste por objetivo
-    if objective == "Velocidad":
-        base[1]["detail"] = "Sprints 8×30m + reacciones explosivas. Énfasis en potencia de arranque."
-        base[1]["intensity"] = 5
-        base[0]["detail"] = "Intervalos cortos: 10×30s al máximo + 90s descanso (pasadas explosivas)."
-    elif objective == "Resistencia":
-        base[2]["detail"] = "Carrera continua 45 min ritmo moderado-alto. Trabajo aeróbico principal."
-        base[2]["intensity"] = 4
-        base[0]["detail"] = "VO₂ Máx largo: 6×2 min al 85% + 2 min recuperación activa."
 
-    return base
+def load_workload_state(athlete_id: str) -> dict:
+    """Estado acumulado de carga aguda:crónica del jugador."""
+    _wait_pending_write()
+    return history_db.get_workload_state(get_history_db(), athlete_id)
 
 
-# ─────────────────────────────────────────────
-# HEADER PRINCIPAL
-# ─────────────────────────────────────────────
-st.markdown('<p class="main-title">⚽ Smart Football<br>Trainer</p>', unsafe_allow_html=True)
-st.markdown('<p class="main-subtitle">Generador de plan semanal · Amateur Edition</p>', unsafe_allow_html=True)
-
-# ─────────────────────────────────────────────
-# SECCIÓN 1 – INPUTS DEL USUARIO
-# ─────────────────────────────────────────────
-st.markdown('<p class="section-label">01 — Esta semana</p>', unsafe_allow_html=True)
+def load_fitness_state(athlete_id: str) -> dict:
+    """Estado acumulado del modelo fitness-fatiga del jugador."""
+    _wait_pending_write()
+    return history_db.get_fitness_state(get_history_db(), athlete_id)
 
-col1, col2 = st.columns([1, 1])
 
-with col1:
-    match_raw = st.selectbox("¿Hay partido esta semana?", ["No", "Sí"], key="match_input")
-    match = (match_raw == "Sí")
+def load_period_rollup(athlete_id: str, period: str) -> list:
+    """Carga del jugador acumulada por semana o mes: filas (inicio ISO, carga)."""
+    _wait_pending_write()
+    return history_db.load_rollup(get_history_db(), athlete_id, period)
 
-with col2:
-    match_day = st.selectbox(
-        "Día del partido",
-        options=DAYS_ES,
-        format_func=lambda d: DAYS_LABEL[d],
-        disabled=not match,
-        key="match_day_input"
-    )
 
-st.markdown('<p class="section-label">02 — Tu estado</p>', unsafe_allow_html=True)
+def load_squad_summary() -> list:
+    """Resumen de carga de toda la plantilla (tabla materializada, sin recorrer historiales)."""
+    _wait_pending_write()
+    return history_db.squad_summary(get_history_db())
 
-fatigue = st.slider(
-    "Nivel de fatiga actual",
-    min_value=1, max_value=5, value=2,
-    help="1 = fresco, 5 = muy cansado"
-)
 
-# Etiqueta visual de fatiga
-fatigue_labels = {1: "🟢 Fresco", 2: "🟡 Ligero", 3: "🟠 Moderado", 4: "🔴 Fatigado", 5: "🔴 Muy fatigado"}
-st.caption(fatigue_labels[fatigue])
+def _with_week_load(rollups: dict, monday: date, load) -> dict:
+    """
+    Filas (inicio ISO, carga) de `load_rollup` por período con `load` como carga
+    de la semana que empieza en `monday` (reemplaza la anterior, como en
+    `workload`) y el mes de ese lunes recalculado con ella.
+    """
+    weeks, months = dict(rollups["week"]), dict(rollups["month"])
+    previous = weeks.get(monday.isoformat(), 0)
+    weeks[monday.isoformat()] = load
+    month = monday.replace(day=1).isoformat()
+    months[month] = months.get(month, 0) - previous + load
+    return {"week": sorted(weeks.items()), "month": sorted(months.items())}
 
-minutes_played = st.number_input(
-    "Minutos jugados la semana pasada",
-    min_value=0, max_value=300, value=60, step=5,
-    help="Incluye partido + entrenamientos"
-)
 
-st.markdown('<p class="section-label">03 — Tu objetivo</p>', unsafe_allow_html=True)
+def save_history_entry(athlete_id: str, entry: dict) -> None:
+    """Encola una entrada en el historial del jugador sin bloquear la interfaz."""
+    st.session_state.pending_history_write = get_history_writer().submit((athlete_id, entry))
 
-objective = st.radio(
-    "Objetivo principal",
-    options=["Velocidad", "Resistencia", "Mantener"],
-    horizontal=True,
-    key="objective_input"
-)
-
-st.markdown("---")
 
 # ─────────────────────────────────────────────
-# BOTÓN PRINCIPAL
+# CÁLCULO DEL RESULTADO
 # ─────────────────────────────────────────────
-generate = st.button("🏃 Generate My Week")
 
-# ─────────────────────────────────────────────
-# LÓGICA PRINCIPAL AL PRESIONAR EL BOTÓN
-# ─────────────────────────────────────────────
-if generate:
-    history = load_history()
+def build_result(athlete_id: str, match: bool, match_day: str, fatigue: int,
+                 minutes_played: int, objective: str, profile: str = DEFAULT_PROFILE) -> dict:
+    """
+    Calcula carga, plan y pronóstico de la semana y guarda la entrada en el historial.
+    El resultado queda en `st.session_state` para volver a mostrarlo sin recalcular.
+
+    Todo se calcula con el historial leído antes de encolar la entrada de hoy
+    (sumándola en memoria), así que la escritura no se espera en este rerun.
+    """
+    today = date.today()
+    monday = today - timedelta(days=today.weekday())
+    with timing.stage("load_history"):
+        history = load_recent_history(athlete_id, HISTORY_PANEL_SIZE)
+        previous = load_entry_before(athlete_id, monday)
+        rollups = {period: load_period_rollup(athlete_id, period) for period in ("week", "month")}
+        workload_state = load_workload_state(athlete_id)
+        fitness_state = load_fitness_state(athlete_id)
 
     # ── SECCIÓN 2: CÁLCULO DE CARGA ──────────────────────────────
     current_load = calculate_load(minutes_played, fatigue)
-    today_str = date.today().isoformat()
+    today_str = today.isoformat()
 
     # Construir registro nuevo
-    new_entry = {
-        "date": today_str,
-        "load": current_load,
-        "inputs": {
-            "match": match,
-            "match_day": match_day if match else None,
-            "fatigue": fatigue,
-            "minutes_played": minutes_played,
-            "objective": objective
-        }
-    }
-
-    # Obtener carga anterior (última entrada, si existe)
-    prev_load = history[-1]["load"] if history else None
+    new_entry = HistoryEntry(today_str, current_load, entry_inputs(
+        match=match,
+        match_day=match_day if match else None,
+        fatigue=fatigue,
+        minutes_played=minutes_played,
+        objective=objective,
+    ))
+
+    # Obtener carga anterior (última entrada de una semana previa, si existe): la
+    # entrada de esta semana se reemplaza, no se compara consigo misma
+    prev_load = previous["load"] if previous is not None else None
 
     # Comparar cargas
-    overload_warning = False
     variation_pct = None
     if prev_load and prev_load > 0:
         variation_pct = ((current_load - prev_load) / prev_load) * 100
-        if variation_pct > 20:
-            overload_warning = True
 
-    # Guardar en historial
-    history.append(new_entry)
-    save_history(history)
+    # Relación aguda:crónica (EWMA) incluyendo la carga de hoy: O(1) sobre el estado guardado
+    with timing.stage("workload"):
+        ratios = workload_ratios(update_workload(workload_state, today_str, current_load))
+    acwr = ratios["ewma_acwr"]
+
+    # Con 4 semanas de historial manda el ACWR; antes, la regla del 20% semana a semana
+    if ratios["chronic_ready"] and acwr is not None:
+        overload_warning = acwr > ACWR_DANGER
+    else:
+        overload_warning = variation_pct is not None and variation_pct > 20
+
+    # Historial con la entrada de hoy (reemplaza la anterior del mismo día, si la había)
+    history = ([entry for entry in history if entry["date"][:10] != today_str] + [new_entry])[-HISTORY_PANEL_SIZE:]
+    rollups = _with_week_load(rollups, monday, current_load)
 
     # ── SECCIÓN 3: GENERAR PLAN ───────────────────────────────────
-    week_plan = generate_week_plan(match, match_day, fatigue, objective)
+    with timing.stage("plan"):
+        week_plan = get_plan_rules().plan((match_day,) if match else (), fatigue, objective, profile)
+
+    # Pronóstico de disposición: la carga de esta semana repartida según la intensidad del plan
+    start = week_start(today)
+    with timing.stage("forecast"):
+        fitness_state = update_fitness(fitness_state, today_str, current_load)
+        forecast = forecast_week(fitness_state, week_plan, current_load, start)
+
+    # Guardar en historial al final: las lecturas de arriba ya no la esperan
+    with timing.stage("save_history"):
+        save_history_entry(athlete_id, new_entry)
+
+    return {
+        "athlete_id": athlete_id,
+        "current_load": current_load,
+        "prev_load": prev_load,
+        "variation_pct": variation_pct,
+        "acwr": acwr,
+        "chronic_ready": ratios["chronic_ready"],
+        "overload_warning": overload_warning,
+        "fatigue": fatigue,
+        "week_plan": week_plan,
+        "start": start,
+        "forecast": forecast,
+        "history": history,
+        "rollups": rollups,
+        "generated_at": datetime.now().strftime("%d/%m/%Y %H:%M"),
+    }
 
-    # ── MOSTRAR CARGA ─────────────────────────────────────────────
-    st.markdown('<p class="section-label">📊 Carga semanal</p>', unsafe_allow_html=True)
 
-    cols = st.columns(3)
-    with cols[0]:
-        st.markdown(
-            f'<div class="load-card" style="text-align:center">'
-            f'<div class="load-label">Carga actual</div>'
-            f'<div class="load-number">{current_load}</div>'
-            f'</div>', unsafe_allow_html=True
-        )
-    with cols[1]:
-        prev_val = prev_load if prev_load is not None else "—"
-        st.markdown(
-            f'<div class="load-card" style="text-align:center">'
-            f'<div class="load-label">Carga anterior</div>'
-            f'<div class="load-number" style="color:#607d8b">{prev_val}</div>'
-            f'</div>', unsafe_allow_html=True
-        )
-    with cols[2]:
-        if variation_pct is not None:
-            sign = "+" if variation_pct > 0 else ""
-            color = "#f44336" if variation_pct > 20 else ("#00e676" if variation_pct <= 0 else "#ffc107")
-            var_str = f"{sign}{variation_pct:.1f}%"
-        else:
-            var_str = "—"
-            color = "#607d8b"
-        st.markdown(
-            f'<div class="load-card" style="text-align:center">'
-            f'<div class="load-label">Variación</div>'
-            f'<div class="load-number" style="color:{color}">{var_str}</div>'
-            f'</div>', unsafe_allow_html=True
-        )
+# ─────────────────────────────────────────────
+# SECCIONES DE RESULTADO
+# Cada una es un fragmento: se vuelve a ejecutar sola, sin rehacer la página.
+# ─────────────────────────────────────────────
+
+@st.fragment
+@timing.timed("load_section")
+def load_section(result: dict) -> None:
+    """Tarjetas de carga y advertencia de sobrecarga."""
+    st.markdown('<p class="section-label">📊 Carga semanal</p>', unsafe_allow_html=True)
+    st.markdown(
+        load_cards_html(result["current_load"], result["prev_load"], result["variation_pct"], result["acwr"]),
+        unsafe_allow_html=True
+    )
 
     # Advertencia de sobrecarga
-    if overload_warning:
-        st.markdown(
-            f'<div class="warning-box">⚠️ <strong>Advertencia de sobrecarga:</strong> '
-            f'Tu carga aumentó un <strong>{variation_pct:.1f}%</strong> respecto a la semana pasada '
-            f'(límite recomendado: 20%). Considera reducir volumen o intensidad para evitar lesiones.</div>',
-            unsafe_allow_html=True
-        )
+    if result["overload_warning"]:
+        acwr = result["acwr"] if result["chronic_ready"] else None
+        st.markdown(overload_warning_html(acwr, result["variation_pct"]), unsafe_allow_html=True)
+
 
-    # ── MOSTRAR PLAN SEMANAL ──────────────────────────────────────
+@st.fragment
+@timing.timed("plan_section")
+def plan_section(result: dict) -> None:
+    """Las siete tarjetas del plan semanal y el pronóstico de disposición."""
     st.markdown('<p class="section-label">📅 Tu plan semanal</p>', unsafe_allow_html=True)
 
-    if fatigue >= 4:
+    if result["fatigue"] >= 4:
         st.caption("💡 Volumen reducido 30% debido a fatiga alta (≥ 4)")
 
-    for session in week_plan:
-        day_label = DAYS_LABEL[session["day"]]
-        s_type = session["type"]
-        s_detail = session["detail"]
-        s_intensity = session["intensity"]
-        css_class = card_class(s_type)
+    with timing.stage("cards"):
+        st.markdown(day_cards_html(result["week_plan"]), unsafe_allow_html=True)
 
-        bar_html = intensity_bar_html(s_intensity) if s_intensity > 0 else '<span style="font-size:0.78rem;color:#455a64;">Descanso</span>'
+    # Descargas: el archivo se genera recién al hacer clic
+    def export(writer):
+        buffer = io.StringIO()
+        writer([(result["athlete_id"], result["week_plan"])], buffer, result["start"])
+        return buffer.getvalue()
 
-        st.markdown(
-            f'<div class="day-card {css_class}">'
-            f'  <div style="display:flex;justify-content:space-between;align-items:center;">'
-            f'    <span class="day-name">{day_label}</span>'
-            f'    <span class="day-type">{s_type}</span>'
-            f'  </div>'
-            f'  <div class="day-detail">{s_detail}</div>'
-            f'  <div style="margin-top:8px;">{bar_html}</div>'
-            f'</div>',
-            unsafe_allow_html=True
+    col_ics, col_csv, _ = st.columns([1, 1, 2])
+    with col_ics:
+        st.download_button(
+            "📅 Calendario (.ics)", data=lambda: export(write_ics),
+            file_name=player_filename(result["athlete_id"], "ics"), mime="text/calendar", on_click="ignore"
+        )
+    with col_csv:
+        st.download_button(
+            "⬇️ CSV", data=lambda: export(write_csv),
+            file_name=player_filename(result["athlete_id"], "csv"), mime="text/csv", on_click="ignore"
         )
 
-    # ── SECCIÓN 4: HISTORIAL ──────────────────────────────────────
-    if len(history) > 1:
+    # ── PRONÓSTICO DE DISPOSICIÓN ─────────────────────────────────
+    st.markdown('<p class="section-label">🔋 Disposición prevista</p>', unsafe_allow_html=True)
+    st.markdown(forecast_html(result["forecast"]), unsafe_allow_html=True)
+    st.caption("Modelo fitness-fatiga (Banister): positivo = más en forma que fatigado.")
+
+
+@st.fragment
+@timing.timed("history_section")
+def history_section(result: dict) -> None:
+    """Gráfico de todo el historial de carga y últimas entradas (la de esta semana primero)."""
+    if len(result["history"]) > 1:
         st.markdown('<p class="section-label">📈 Historial de carga</p>', unsafe_allow_html=True)
 
-        # Mostrar últimas 5 entradas
-        recent = history[-5:][::-1]
-        for i, entry in enumerate(recent):
-            label = "Esta semana" if i == 0 else entry["date"]
-            emoji = "🔥" if i == 0 else "📅"
-            obj_str = entry["inputs"].get("objective", "—")
-            st.markdown(
-                f'<div style="display:flex;justify-content:space-between;padding:6px 0;'
-                f'border-bottom:1px solid rgba(255,255,255,0.05);font-size:0.88rem;">'
-                f'<span style="color:#90a4ae;">{emoji} {label}</span>'
-                f'<span style="color:#b0bec5;">{obj_str}</span>'
-                f'<span style="color:#00e676;font-family:Barlow Condensed,sans-serif;'
-                f'font-size:1rem;font-weight:700;">{entry["load"]}</span>'
-                f'</div>',
-                unsafe_allow_html=True
+        view = st.radio("Agrupar por", ["Semana", "Mes"], horizontal=True, key="history_period")
+        period = "week" if view == "Semana" else "month"
+        with timing.stage("chart"):
+            series = load_series(result["rollups"][period], period)
+            st.altair_chart(load_chart(series), width="stretch")
+        st.caption(f"Banda: ACWR {ACWR_SWEET_SPOT[0]}–{ACWR_SWEET_SPOT[1]} respecto de los 4 períodos anteriores.")
+
+        st.markdown(history_panel_html(result["history"]), unsafe_allow_html=True)
+
+
+def load_chart(series) -> alt.LayerChart:
+    """Carga por período con la banda ACWR segura superpuesta."""
+    base = alt.Chart(series).encode(x=alt.X("start:T", title=None))
+    band = base.mark_area(opacity=0.2, color="#00e676").encode(
+        y=alt.Y("band_low:Q", title="Carga"), y2="band_high:Q",
+    )
+    line = base.mark_line(color="#1de9b6", point=alt.OverlayMarkDef(size=12)).encode(
+        y="load:Q",
+        tooltip=[alt.Tooltip("start:T", title="Inicio"), alt.Tooltip("load:Q", title="Carga")],
+    )
+    return (band + line).properties(height=260)
+
+
+def timing_sidebar(last_rerun: dict) -> None:
+    """Panel de depuración: etapas del último rerun completo y percentiles del buffer."""
+    with st.sidebar:
+        st.markdown('<p class="section-label">⏱️ Tiempos por etapa</p>', unsafe_allow_html=True)
+        st.caption(f"Último rerun completo: {last_rerun['total_ms']:.1f} ms")
+        st.dataframe(
+            [{"Etapa": name, "ms": round(ms, 2)} for name, ms in last_rerun["stages"].items()],
+            hide_index=True,
+        )
+
+        names = sorted({record["rerun"] for record in timing.records()})
+        scope = st.selectbox("Reruns recientes", names, index=names.index("app"), key="timing_scope")
+        st.dataframe(timing.summary(scope), hide_index=True)
+        st.caption("Tiempos en ms de los últimos reruns del servidor (incluye los de fragmentos).")
+
+
+# ─────────────────────────────────────────────
+# HEADER PRINCIPAL
+# ─────────────────────────────────────────────
+st.markdown('<p class="main-title">⚽ Smart Football<br>Trainer</p>', unsafe_allow_html=True)
+st.markdown('<p class="main-subtitle">Generador de plan semanal · Amateur Edition</p>', unsafe_allow_html=True)
+
+
+@st.fragment
+@timing.timed("planner")
+def planner() -> None:
+    """
+    Inputs, botón y resultado. Al cambiar un input solo se vuelve a ejecutar
+    este fragmento; el último resultado generado se sigue mostrando.
+    """
+    # ─────────────────────────────────────────────
+    # SECCIÓN 1 – INPUTS DEL USUARIO
+    # ─────────────────────────────────────────────
+    with timing.stage("widgets"):
+        st.markdown('<p class="section-label">01 — Esta semana</p>', unsafe_allow_html=True)
+
+        athlete_name = st.text_input(
+            "Jugador",
+            placeholder="Tu nombre",
+            help="Cada jugador tiene su propio historial de carga",
+            key="athlete_input"
+        )
+        athlete_id = athlete_key(athlete_name)
+        if not athlete_id:
+            st.caption("Escribe tu nombre para generar el plan y guardar tu historial.")
+
+        col1, col2 = st.columns([1, 1])
+
+        with col1:
+            match_raw = st.selectbox("¿Hay partido esta semana?", ["No", "Sí"], key="match_input")
+            match = (match_raw == "Sí")
+
+        with col2:
+            match_day = st.selectbox(
+                "Día del partido",
+                options=DAYS_ES,
+                format_func=lambda d: DAYS_LABEL[d],
+                disabled=not match,
+                key="match_day_input"
             )
 
+        st.markdown('<p class="section-label">02 — Tu estado</p>', unsafe_allow_html=True)
+
+        fatigue = st.slider(
+            "Nivel de fatiga actual",
+            min_value=1, max_value=5, value=2,
+            help="1 = fresco, 5 = muy cansado"
+        )
+
+        # Etiqueta visual de fatiga
+        fatigue_labels = {1: "🟢 Fresco", 2: "🟡 Ligero", 3: "🟠 Moderado", 4: "🔴 Fatigado", 5: "🔴 Muy fatigado"}
+        st.caption(fatigue_labels[fatigue])
+
+        minutes_played = st.number_input(
+            "Minutos jugados la semana pasada",
+            min_value=0, max_value=300, value=60, step=5,
+            help="Incluye partido + entrenamientos"
+        )
+
+        st.markdown('<p class="section-label">03 — Tu objetivo</p>', unsafe_allow_html=True)
+
+        objective = st.radio(
+            "Objetivo principal",
+            options=OBJECTIVES,
+            horizontal=True,
+            key="objective_input"
+        )
+
+        # Perfiles adicionales definidos en las reglas (p. ej. U-19)
+        profiles = get_plan_rules().profiles
+        profile = DEFAULT_PROFILE
+        if len(profiles) > 1:
+            profile = st.selectbox("Perfil", profiles, key="profile_input")
+
     st.markdown("---")
-    st.caption("Smart Football Trainer · Generado el " + datetime.now().strftime("%d/%m/%Y %H:%M"))
 
-# Mensaje de bienvenida si no se ha generado el plan aún
-else:
-    st.markdown(
-        '<div style="text-align:center;padding:2rem 1rem;color:#455a64;">'
-        '<div style="font-size:3rem;">⚽</div>'
-        '<p style="font-size:0.9rem;letter-spacing:2px;text-transform:uppercase;">'
-        'Completa los campos y presiona<br><strong style="color:#00e676;">Generate My Week</strong></p>'
-        '</div>',
-        unsafe_allow_html=True
+    # ─────────────────────────────────────────────
+    # BOTÓN PRINCIPAL
+    # ─────────────────────────────────────────────
+    if st.button("🏃 Generate My Week", disabled=not athlete_id):
+        with timing.stage("build_result"):
+            st.session_state.result = build_result(
+                athlete_id, match, match_day, fatigue, minutes_played, objective, profile)
+
+    result = st.session_state.get("result")
+
+    # Mensaje de bienvenida si no se ha generado el plan aún
+    if result is None:
+        st.markdown(
+            '<div style="text-align:center;padding:2rem 1rem;color:#455a64;">'
+            '<div style="font-size:3rem;">⚽</div>'
+            '<p style="font-size:0.9rem;letter-spacing:2px;text-transform:uppercase;">'
+            'Completa los campos y presiona<br><strong style="color:#00e676;">Generate My Week</strong></p>'
+            '</div>',
+            unsafe_allow_html=True
+        )
+        return
+
+    load_section(result)
+    plan_section(result)
+    history_section(result)
+
+    st.markdown("---")
+    st.caption("Smart Football Trainer · Generado el " + result["generated_at"])
+
+
+@st.fragment
+@timing.timed("squad_dashboard")
+def squad_dashboard() -> None:
+    """Panel de la plantilla: última semana de cada jugador, con filtros y orden."""
+    st.markdown('<p class="section-label">👥 Plantilla</p>', unsafe_allow_html=True)
+
+    with timing.stage("load_summary"):
+        summary = load_squad_summary()
+    if not summary:
+        st.caption("Todavía no hay jugadores con historial.")
+        return
+
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        search = st.text_input("Buscar jugador", key="squad_search")
+    with col2:
+        sort_label = st.selectbox("Ordenar por", list(SQUAD_SORT), key="squad_sort")
+    only_overload = st.checkbox("Solo con advertencia de sobrecarga", key="squad_overload_only")
+
+    needle = athlete_key(search) if search.strip() else ""
+    rows = [
+        r for r in summary
+        if needle in r["athlete_id"] and (r["overload"] or not only_overload)
+    ]
+    key, descending = SQUAD_SORT[sort_label]
+    rows.sort(key=key, reverse=descending)
+
+    st.dataframe(
+        [{
+            "Jugador": r["athlete_id"],
+            "Semana": r["week"],
+            "Carga actual": r["load"],
+            "Carga anterior": r["prev_load"],
+            "Variación %": None if r["variation_pct"] is None else round(r["variation_pct"], 1),
+            "ACWR": None if r["acwr"] is None else round(r["acwr"], 2),
+            "Sobrecarga": "⚠️" if r["overload"] else "",
+        } for r in rows],
+        hide_index=True,
+        width="stretch",
     )
+    flagged = sum(r["overload"] for r in summary)
+    st.caption(f"{flagged} de {len(summary)} jugadores con advertencia de sobrecarga.")
+
+
+tab_week, tab_squad = st.tabs(["⚽ Mi semana", "👥 Plantilla"])
+with tab_week:
+    planner()
+with tab_squad:
+    squad_dashboard()
+
+last_rerun = timing.end()
+if DEBUG_TIMING:
+    timing_sidebar(last_rerun)
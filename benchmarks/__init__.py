@@ -0,0 +1,5 @@
+"""
+Benchmarks del Smart Football Trainer.
+Ejecutar desde la raíz del repositorio, p. ej.:
+    python -m benchmarks.bench_history_concurrency
+"""
@@ -0,0 +1,53 @@
+"""
+Tiempo de importación en frío del núcleo de planificación
+=========================================================
+Lanza intérpretes nuevos con `-X importtime` y reporta el tiempo acumulado de
+`import trainer_core`. También verifica que importar el núcleo no arrastre
+Streamlit.
+
+Ejecutar:
+    python -m benchmarks.bench_core_import [--runs 20] [--budget-ms 5]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+MODULE = "trainer_core"
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def cold_import_us(module: str) -> int:
+    """Microsegundos acumulados de importar `module` en un intérprete nuevo."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c",
+         f"import sys, {module}; assert 'streamlit' not in sys.modules"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    # Formato: "import time: self [us] | cumulative | imported package"
+    for line in result.stderr.splitlines():
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+    raise RuntimeError(f"no se encontró {module} en la salida de -X importtime")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--budget-ms", type=float, default=5.0,
+                        help="mediana máxima aceptable en milisegundos")
+    args = parser.parse_args()
+
+    samples = [cold_import_us(MODULE) / 1000 for _ in range(args.runs)]
+    median = statistics.median(samples)
+    print(f"import {MODULE}: mediana {median:.2f} ms · mín {min(samples):.2f} ms · "
+          f"máx {max(samples):.2f} ms ({args.runs} intérpretes)")
+    if median > args.budget_ms:
+        sys.exit(f"superado el presupuesto de {args.budget_ms} ms")
+
+
+if __name__ == "__main__":
+    main()
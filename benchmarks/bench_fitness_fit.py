@@ -0,0 +1,61 @@
+"""
+Ajuste del modelo fitness-fatiga sobre una plantilla sintética
+==============================================================
+Genera jugadores con parámetros de Banister conocidos (tomados de la grilla),
+simula varias temporadas de entradas semanales y mide cuánto tarda
+`fit_squad` en recuperar los parámetros de todos a la vez.
+
+Ejecutar:
+    python -m benchmarks.bench_fitness_fit [--athletes 500] [--weeks 156]
+"""
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+import fitness_model as fm
+
+
+def synthetic_squad(athletes: int, weeks: int, seed: int = 0) -> tuple:
+    """Historiales sintéticos y parámetros reales de cada jugador."""
+    rng = random.Random(seed)
+    histories, truth = {}, {}
+    start = date(2023, 1, 2)
+    for a in range(athletes):
+        params = {**fm.DEFAULT_PARAMS, "p0": 3.0, "k_fitness": 0.004, "k_fatigue": 0.008,
+                  "tau_fitness": rng.choice(fm.TAU_FITNESS_GRID),
+                  "tau_fatigue": rng.choice(fm.TAU_FATIGUE_GRID)}
+        state = fm.new_fitness_state()
+        entries = []
+        for w in range(weeks):
+            day = start + timedelta(days=7 * w)
+            observed = fm.readiness(state, day, params)["readiness"]
+            load = rng.randint(50, 600)
+            entries.append({"date": day.isoformat(), "load": load, "inputs": {"fatigue": 6 - observed}})
+            fm.update_fitness(state, day, load, params)
+        histories[f"a{a}"], truth[f"a{a}"] = entries, params
+    return histories, truth
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--athletes", type=int, default=500)
+    parser.add_argument("--weeks", type=int, default=156)
+    args = parser.parse_args()
+
+    histories, truth = synthetic_squad(args.athletes, args.weeks)
+    start = time.perf_counter()
+    fitted = fm.fit_squad(histories)
+    elapsed = time.perf_counter() - start
+
+    recovered = sum(
+        fitted[a]["tau_fitness"] == truth[a]["tau_fitness"] and fitted[a]["tau_fatigue"] == truth[a]["tau_fatigue"]
+        for a in histories
+    )
+    print(f"{args.athletes} jugadores × {args.weeks} semanas ajustados en {elapsed:.2f} s · "
+          f"τ recuperados: {recovered}/{args.athletes}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Stress test de escrituras concurrentes al historial
+===================================================
+Varios procesos, cada uno con varios hilos, agregan entradas a la vez:
+  - al historial JSON Lines (`history_store.append_entry`, con lock advisory)
+  - a la base SQLite a través de la cola `HistoryWriter`
+
+Al final se verifica que no se perdió ni se corrompió ninguna entrada y que
+el índice de offsets quedó consistente.
+
+Ejecutar:
+    python -m benchmarks.bench_history_concurrency [--processes 4] [--threads 8] [--writes 200]
+"""
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+import history_db
+from history_store import HistoryWriter, append_entry, count_entries, iter_history, read_tail
+
+
+def _entry(proc: int, thread: int, i: int) -> dict:
+    """
+    Entrada sintética identificable por proceso, hilo y número de escritura; una
+    por día (en SQLite, otra entrada del mismo día reemplazaría a la anterior).
+    """
+    return {
+        "date": (date(2026, 1, 1) + timedelta(days=i)).isoformat(),
+        "load": i,
+        "inputs": {"proc": proc, "thread": thread, "objective": "Mantener"},
+    }
+
+
+def _jsonl_worker(path: str, proc: int, threads: int, writes: int) -> None:
+    """Proceso que agrega entradas al JSON Lines desde varios hilos."""
+    def run(thread):
+        for i in range(writes):
+            append_entry(path, _entry(proc, thread, i))
+
+    workers = [threading.Thread(target=run, args=(t,)) for t in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+
+
+def _sqlite_worker(path: str, proc: int, threads: int, writes: int) -> None:
+    """Proceso que encola entradas en SQLite desde varios hilos a través de HistoryWriter."""
+    conn = history_db.connect(path)
+    writer = HistoryWriter(lambda items: history_db.insert_batch(conn, items))
+
+    def run(thread):
+        futures = [writer.submit((f"p{proc}-t{thread}", _entry(proc, thread, i))) for i in range(writes)]
+        for future in futures:
+            future.result()
+
+    workers = [threading.Thread(target=run, args=(t,)) for t in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    writer.close()
+    conn.close()
+
+
+def _hammer(target, path: str, processes: int, threads: int, writes: int) -> float:
+    """Lanza `processes` procesos con `target` y devuelve el tiempo total en segundos."""
+    start = time.perf_counter()
+    procs = [multiprocessing.Process(target=target, args=(path, p, threads, writes))
+             for p in range(processes)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+        assert p.exitcode == 0, f"proceso terminó con código {p.exitcode}"
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--writes", type=int, default=200, help="escrituras por hilo")
+    args = parser.parse_args()
+    expected = args.processes * args.threads * args.writes
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # ── JSON Lines con lock advisory ─────────────────────────────
+        path = os.path.join(tmp, "history.jsonl")
+        elapsed = _hammer(_jsonl_worker, path, args.processes, args.threads, args.writes)
+        entries = list(iter_history(path))
+        assert len(entries) == expected, f"JSONL: {len(entries)} de {expected} entradas"
+        assert count_entries(path) == expected, "JSONL: índice inconsistente"
+        assert read_tail(path, 1) == entries[-1:], "JSONL: lectura de cola inconsistente"
+        print(f"JSONL   {expected:>7} entradas  {elapsed:6.2f} s  {expected / elapsed:>9,.0f} escrituras/s")
+
+        # ── SQLite con cola de escritura ─────────────────────────────
+        path = os.path.join(tmp, "history.db")
+        history_db.connect(path).close()
+        elapsed = _hammer(_sqlite_worker, path, args.processes, args.threads, args.writes)
+        conn = history_db.connect(path)
+        total = conn.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+        conn.close()
+        assert total == expected, f"SQLite: {total} de {expected} entradas"
+        print(f"SQLite  {expected:>7} entradas  {elapsed:6.2f} s  {expected / elapsed:>9,.0f} escrituras/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Memoria y recorrido del historial: dicts vs registros vs columnas
+=================================================================
+Genera el historial diario de varios años de un jugador y compara:
+  - memoria retenida (tracemalloc) por entrada como dict, como `HistoryEntry`
+    y como `HistoryColumns`
+  - tiempo por entrada de reconstruir el estado de carga (`replay_workload`)
+    desde la lista de dicts y desde las columnas
+
+Verifica además que el replay y la versión vectorizada (`backfill_workload`)
+dan el mismo estado, y que una carga semanal constante da ACWR 1.0.
+
+Ejecutar:
+    python -m benchmarks.bench_history_records [--years 10]
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+from history_records import HistoryColumns, HistoryEntry
+from trainer_core import DAYS_ES, OBJECTIVES
+from workload import (
+    CHRONIC_WEEKS, backfill_workload, new_state, replay_workload, update_workload, workload_ratios,
+)
+
+
+def synthetic_history(days: int, seed: int = 0) -> list:
+    """Historial diario como lo guarda la app (JSON decodificado: un dict y strings propios por entrada)."""
+    rng = random.Random(seed)
+    start = date(2015, 1, 1)
+    entries = []
+    for i in range(days):
+        match = rng.random() < 0.8
+        entries.append({
+            "date": (start + timedelta(days=i)).isoformat(),
+            "load": rng.randint(0, 600),
+            "inputs": {
+                "match": match,
+                # "".join crea una copia del string, como json.loads en cada fila
+                "match_day": "".join(rng.choice(DAYS_ES)) if match else None,
+                "fatigue": rng.randint(1, 5),
+                "minutes_played": rng.randrange(0, 300, 5),
+                "objective": "".join(rng.choice(OBJECTIVES)),
+            },
+        })
+    return entries
+
+
+def check_constant_weekly_load(weeks: int = 12, load: int = 300) -> None:
+    """Una carga semanal constante (repitiendo la entrada de cada semana) da ACWR 1.0."""
+    state = new_state()
+    start = date(2026, 1, 5)
+    for w in range(weeks):
+        day = start + timedelta(weeks=w, days=w % 7)
+        for _ in range(2):      # volver a generar el plan no suma la carga
+            ratios = workload_ratios(update_workload(state, day.isoformat(), load))
+        if w + 1 >= CHRONIC_WEEKS:
+            assert ratios["chronic_ready"]
+            assert abs(ratios["acwr"] - 1.0) < 1e-9 and abs(ratios["ewma_acwr"] - 1.0) < 1e-9, ratios
+
+
+def retained_bytes(build) -> tuple:
+    """(resultado, bytes retenidos) de construir una estructura."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        return result, tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+
+def per_entry_us(fn, n: int, repeat: int = 3) -> float:
+    """Mejor tiempo de `fn` en µs por entrada."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best / n * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--years", type=int, default=10)
+    args = parser.parse_args()
+    n = args.years * 365
+
+    dicts, dict_bytes = retained_bytes(lambda: synthetic_history(n))
+    records, record_bytes = retained_bytes(lambda: [HistoryEntry.from_dict(e) for e in dicts])
+    columns, column_bytes = retained_bytes(lambda: HistoryColumns.from_entries(dicts))
+
+    print(f"{n} entradas ({args.years} años diarios)")
+    print(f"memoria   dicts {dict_bytes / n:7.1f} B/entrada · registros {record_bytes / n:6.1f} · "
+          f"columnas {column_bytes / n:5.1f}")
+
+    assert replay_workload(columns) == replay_workload(dicts)
+    replayed, backfilled = replay_workload(columns), backfill_workload(columns)[1]
+    assert replayed.keys() == backfilled.keys()
+    assert all(abs(a - b) < 1e-6 for a, b in ((replayed[k], backfilled[k]) for k in replayed)
+               if isinstance(a, float)), "backfill y replay no coinciden"
+    assert all(replayed[k] == backfilled[k] for k in ("first_week", "last_week", "weekly"))
+    check_constant_weekly_load()
+    print(f"replay    dicts {per_entry_us(lambda: replay_workload(dicts), n):5.2f} µs/entrada · "
+          f"columnas {per_entry_us(lambda: replay_workload(columns), n):5.2f}")
+
+
+if __name__ == "__main__":
+    main()
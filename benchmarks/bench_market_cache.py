@@ -0,0 +1,131 @@
+"""
+Caché persistente de datos de mercado (stale-while-revalidate)
+==============================================================
+Con `SyntheticProvider` (sin red, latencia fija):
+  1. Tiempo de `MarketCache.get` sin entrada (descarga), con entrada vigente
+     y con entrada vencida (se sirve la copia y se actualiza en segundo plano).
+  2. Varios procesos, cada uno con varios hilos, piden a la vez las mismas
+     entradas vencidas: se verifica que cada una se actualiza una sola vez en
+     total y que ninguna lectura espera la descarga.
+  3. Una instancia nueva sobre el mismo archivo (reinicio) encuentra las
+     entradas actualizadas.
+
+Ejecutar:
+    python -m benchmarks.bench_market_cache [--symbols 20] [--latency 0.2] [--processes 4] [--threads 8]
+"""
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+
+from market_cache import MarketCache
+from market_providers import SyntheticProvider
+
+TTL = 60.0
+
+
+def logged_fetch(latency: float, log_path: str = None):
+    """`SyntheticProvider.quote` que anota cada descarga en `log_path` (una línea por símbolo)."""
+    provider = SyntheticProvider(latency=latency)
+
+    def fetch(symbol):
+        payload = provider.quote(symbol)
+        if log_path:
+            with open(log_path, "a") as f:   # O_APPEND: líneas enteras aunque escriban varios procesos
+                f.write(f"{symbol}\n")
+        return payload
+    return fetch
+
+
+def timed_ms(fn) -> tuple:
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def _worker(path: str, symbols: list, threads: int, latency: float, log_path: str, slowest) -> None:
+    """Proceso que lee todas las entradas vencidas desde varios hilos a la vez."""
+    cache = MarketCache(path)
+    fetch = logged_fetch(latency, log_path)
+    barrier = threading.Barrier(threads)
+    worst = [0.0]
+
+    def run():
+        barrier.wait()
+        for symbol in symbols:
+            _, ms = timed_ms(lambda: cache.get(symbol, "fundamentals", fetch, TTL))
+            worst[0] = max(worst[0], ms)
+
+    workers = [threading.Thread(target=run) for _ in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    cache.close()   # espera las actualizaciones en segundo plano
+    with slowest.get_lock():
+        slowest.value = max(slowest.value, worst[0])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+    symbols = [f"SYM{i:02d}" for i in range(args.symbols)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "market_cache.db")
+        log_path = os.path.join(tmp, "fetches.log")
+
+        # 1. Latencia por caso
+        cache = MarketCache(path)
+        fetch = logged_fetch(args.latency)
+        _, cold = timed_ms(lambda: [cache.get(s, "fundamentals", fetch, TTL) for s in symbols])
+        _, warm = timed_ms(lambda: [cache.get(s, "fundamentals", fetch, TTL) for s in symbols])
+        cache.invalidate()
+        _, stale = timed_ms(lambda: [cache.get(s, "fundamentals", fetch, TTL) for s in symbols])
+        cache.wait()
+        n = len(symbols)
+        print(f"sin entrada {cold / n:8.2f} ms/símbolo · vigente {warm / n:6.3f} · vencida {stale / n:6.3f} "
+              f"(latencia del proveedor {args.latency * 1000:.0f} ms)")
+        assert all(time.time() - cache.lookup(s, "fundamentals")[1] < TTL for s in symbols), "no se actualizó"
+        cache.close()
+
+        # 2. Varios procesos sobre las mismas entradas vencidas
+        MarketCache(path).invalidate()
+        slowest = multiprocessing.Value("d", 0.0)
+        procs = [
+            multiprocessing.Process(target=_worker,
+                                    args=(path, symbols, args.threads, args.latency, log_path, slowest))
+            for _ in range(args.processes)
+        ]
+        start = time.perf_counter()
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+            assert p.exitcode == 0, f"proceso terminó con código {p.exitcode}"
+        elapsed = time.perf_counter() - start
+
+        with open(log_path) as f:
+            refreshed = f.read().split()
+        reads = args.processes * args.threads * n
+        print(f"{args.processes} procesos × {args.threads} hilos: {reads} lecturas en {elapsed:.2f} s, "
+              f"la más lenta {slowest.value:.2f} ms · {len(refreshed)} descargas para {n} entradas vencidas")
+        assert sorted(refreshed) == sorted(symbols), "alguna entrada se actualizó más de una vez (o ninguna)"
+        assert slowest.value < args.latency * 1000, "una lectura esperó la descarga"
+
+        # 3. Reinicio: instancia nueva sobre el mismo archivo
+        cache = MarketCache(path)
+        assert all(time.time() - cache.lookup(s, "fundamentals")[1] < TTL for s in symbols)
+        cache.close()
+        print("OK: una actualización por entrada entre todos los procesos; entradas persistentes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Carga en frío del dashboard: descargas secuenciales vs. en paralelo
+===================================================================
+Usa `SyntheticProvider` (sin red, con latencia distinta por símbolo y fija
+por semilla) y compara el tiempo de cargar las 20 empresas:
+  - secuencial con la pausa de 0.04 s por símbolo (el `load_all_data` anterior)
+  - `fetch_concurrently` con distintos límites de concurrencia
+
+Verifica además que se recibe un resultado por símbolo y que el progreso
+avanza en el orden en que terminan las descargas.
+
+Ejecutar:
+    python -m benchmarks.bench_market_fetch [--symbols 20] [--latency 0.05 0.4]
+"""
+
+import argparse
+import time
+
+from market_data import fetch_concurrently
+from market_providers import SyntheticProvider
+
+
+def sequential(symbols, fetch) -> list:
+    """Como el `load_all_data` anterior: una descarga tras otra, con pausa de 0.04 s."""
+    rows = []
+    for symbol in symbols:
+        rows.append(fetch(symbol))
+        time.sleep(0.04)
+    return rows
+
+
+def concurrent(symbols, fetch, max_workers: int) -> tuple:
+    """(filas en el orden de `symbols`, símbolos en el orden en que terminaron)."""
+    rows = [None] * len(symbols)
+    finished = []
+    for i, symbol, row in fetch_concurrently(symbols, fetch, max_workers):
+        rows[i] = row
+        finished.append(symbol)
+    return rows, finished
+
+
+def elapsed(fn) -> tuple:
+    """(resultado, segundos)."""
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument("--latency", type=float, nargs=2, default=(0.05, 0.4), metavar=("MIN", "MAX"))
+    args = parser.parse_args()
+
+    symbols = [f"SYM{i:02d}" for i in range(args.symbols)]
+    provider = SyntheticProvider(latency=tuple(args.latency))
+    latency = {symbol: provider.latency_of(symbol) for symbol in symbols}
+    slowest = max(latency.values())
+    print(f"{len(symbols)} símbolos · latencia {args.latency[0]:.2f}–{args.latency[1]:.2f} s · "
+          f"más lenta {slowest:.3f} s · suma {sum(latency.values()):.3f} s")
+
+    expected, seconds = elapsed(lambda: sequential(symbols, provider.price))
+    print(f"{'secuencial + pausa':<20} {seconds:7.3f} s")
+
+    for workers in (1, 4, 8, len(symbols)):
+        (rows, finished), seconds = elapsed(lambda: concurrent(symbols, provider.price, workers))
+        assert rows == expected, "faltan filas o están fuera de lugar"
+        assert sorted(finished) == sorted(symbols)
+        in_order = finished == sorted(symbols, key=latency.get)
+        print(f"{f'paralelo ×{workers}':<20} {seconds:7.3f} s  ({seconds / slowest:4.2f}× la más lenta"
+              f"{', llegan por latencia' if in_order and workers == len(symbols) else ''})")
+
+
+if __name__ == "__main__":
+    main()
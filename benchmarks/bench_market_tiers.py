@@ -0,0 +1,82 @@
+"""
+Actualización de precios vs. recarga completa
+=============================================
+Con `SyntheticProvider` (sin red) y latencias distintas por tipo de
+consulta — precio liviano, fundamentales pesados — mide, sobre una caché
+`MarketCache` temporal, lo que hace `load_all_data` en tres casos:
+  - antes: una consulta completa (precio + fundamentales) por símbolo, en paralelo
+  - recarga completa en dos niveles: precios en bloque + fundamentales en paralelo
+  - solo precios ("🔄 Actualizar precios"): precios en bloque, fundamentales vigentes
+
+Verifica que las filas combinadas de los dos niveles coinciden con la
+consulta completa.
+
+Ejecutar:
+    python -m benchmarks.bench_market_tiers [--symbols 20] [--price-latency 0.05] [--fundamentals-latency 0.2 0.6]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from market_cache import MarketCache
+from market_data import fetch_concurrently
+from market_providers import SyntheticProvider
+
+PRICE_TTL = 60.0
+FUNDAMENTALS_TTL = 6 * 3600.0
+
+
+def load_quotes(cache, provider, symbols) -> dict:
+    """Como el `load_all_data` anterior: `quote` completo por símbolo, sin usar entradas vigentes."""
+    fetch = lambda symbol: cache.get(symbol, "quote", provider.quote, FUNDAMENTALS_TTL, refresh=True)
+    return {symbol: info for _, symbol, info in fetch_concurrently(symbols, fetch)}
+
+
+def load_tiers(cache, provider, symbols, refresh=()) -> dict:
+    """Como `load_all_data`: precios en bloque y fundamentales en paralelo, combinados por símbolo."""
+    prices = cache.get_many(symbols, "price", provider.prices, PRICE_TTL, "price" in refresh)
+    fetch = lambda symbol: cache.get(symbol, "fundamentals", provider.fundamentals, FUNDAMENTALS_TTL,
+                                     "fundamentals" in refresh)
+    return {symbol: {**info, **prices.get(symbol, {})}
+            for _, symbol, info in fetch_concurrently(symbols, fetch)}
+
+
+def elapsed(fn) -> tuple:
+    """(resultado, segundos)."""
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument("--price-latency", type=float, default=0.05)
+    parser.add_argument("--fundamentals-latency", type=float, nargs=2, default=(0.2, 0.6), metavar=("MIN", "MAX"))
+    args = parser.parse_args()
+
+    symbols = [f"SYM{i:02d}" for i in range(args.symbols)]
+    provider = SyntheticProvider(latency={"price": args.price_latency,
+                                          "fundamentals": tuple(args.fundamentals_latency)})
+    print(f"{len(symbols)} símbolos · precio {args.price_latency * 1000:.0f} ms · fundamentales "
+          f"{args.fundamentals_latency[0] * 1000:.0f}–{args.fundamentals_latency[1] * 1000:.0f} ms")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = MarketCache(os.path.join(tmp, "market_cache.db"))
+        quotes, before = elapsed(lambda: load_quotes(cache, provider, symbols))
+        rows, full = elapsed(lambda: load_tiers(cache, provider, symbols, ("price", "fundamentals")))
+        assert rows == quotes, "las filas combinadas no coinciden con la consulta completa"
+        rows, prices_only = elapsed(lambda: load_tiers(cache, provider, symbols, ("price",)))
+        assert rows == quotes
+        cache.close()
+
+    print(f"{'antes (quote por símbolo)':<28} {before:7.3f} s")
+    print(f"{'recarga completa':<28} {full:7.3f} s")
+    print(f"{'solo precios':<28} {prices_only:7.3f} s  ({full / prices_only:.0f}× más rápida que la recarga completa)")
+    assert prices_only < full, "actualizar precios no es más barato que recargar todo"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Motor de reglas declarativo vs. planificación en código
+=======================================================
+1. Verifica que las reglas de `plan_rules.yaml` producen exactamente los
+   mismos planes que `_build_week_plan` (0 o 1 partido) y que
+   `build_fixture_week` (cualquier combinación de partidos).
+2. Mide la compilación de las reglas y el tiempo por plan del motor
+   (memorizado y sin memorizar) frente a las funciones actuales.
+
+Ejecutar:
+    python -m benchmarks.bench_plan_rules [--number 20000]
+"""
+
+import argparse
+import itertools
+import time
+import timeit
+
+from plan_rules import load_rules
+from trainer_core import (
+    DAYS_ES, FATIGUE_LEVELS, OBJECTIVES, _build_week_plan, build_fixture_week, generate_week_plan,
+)
+
+
+def fixtures():
+    """Todas las combinaciones de días de partido (de 0 a 7 partidos)."""
+    for n in range(len(DAYS_ES) + 1):
+        yield from itertools.combinations(DAYS_ES, n)
+
+
+def check_equivalence(rules) -> int:
+    """Compara el motor con el código actual en todo el dominio. Devuelve los planes verificados."""
+    count = 0
+    for match_days, fatigue, objective in itertools.product(fixtures(), FATIGUE_LEVELS, OBJECTIVES):
+        plan = rules.plan(match_days, fatigue, objective)
+        if len(match_days) <= 1:
+            expected = _build_week_plan(bool(match_days), match_days[0] if match_days else None,
+                                        fatigue, objective)
+            assert [dict(session) for session in plan] == expected, (match_days, fatigue, objective)
+        assert plan == build_fixture_week(match_days, fatigue, objective), (match_days, fatigue, objective)
+        count += 1
+    return count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    rules = load_rules()
+    print(f"reglas cargadas y compiladas en {(time.perf_counter() - start) * 1e3:.1f} ms")
+    print(f"{check_equivalence(rules)} planes idénticos al código actual")
+
+    single = [((), f, o) for f in FATIGUE_LEVELS for o in OBJECTIVES] + [
+        ((d,), f, o) for d in DAYS_ES for f in FATIGUE_LEVELS for o in OBJECTIVES]
+    candidates = [
+        ("reglas (memorizado)", lambda days, f, o: rules.plan(days, f, o)),
+        ("reglas (sin memo)", lambda days, f, o: rules._build("default", f, o, days)),
+        ("generate_week_plan", lambda days, f, o: generate_week_plan(bool(days), days[0] if days else None, f, o)),
+        ("_build_week_plan", lambda days, f, o: _build_week_plan(bool(days), days[0] if days else None, f, o)),
+    ]
+    for name, fn in candidates:
+        cycle = itertools.cycle(single)
+        seconds = timeit.timeit(lambda: fn(*next(cycle)), number=args.number)
+        print(f"{name:<20} {seconds / args.number * 1e6:8.2f} µs/plan")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Tabla precalculada de planes vs. construcción directa
+=====================================================
+1. Verifica que `generate_week_plan` (búsqueda en tabla) devuelve exactamente
+   lo mismo que `_build_week_plan` para todas las combinaciones del dominio,
+   y que los planes devueltos son de solo lectura.
+2. Compara el tiempo por llamada de ambos caminos.
+
+Ejecutar:
+    python -m benchmarks.bench_plan_table [--number 20000]
+"""
+
+import argparse
+import itertools
+import timeit
+
+from trainer_core import (
+    DAYS_ES, FATIGUE_LEVELS, OBJECTIVES, _build_week_plan, generate_week_plan,
+)
+
+
+def domain():
+    """Todas las entradas posibles: sin partido + cada día de partido, × fatiga × objetivo."""
+    match_options = [(False, None)] + [(True, day) for day in DAYS_ES]
+    for (match, match_day), fatigue, objective in itertools.product(
+            match_options, FATIGUE_LEVELS, OBJECTIVES):
+        yield match, match_day, fatigue, objective
+
+
+def check_equivalence() -> int:
+    """Compara tabla y referencia en todo el dominio. Devuelve la cantidad de planes verificados."""
+    count = 0
+    for args in domain():
+        plan = generate_week_plan(*args)
+        assert [dict(session) for session in plan] == _build_week_plan(*args), args
+        try:
+            plan[0]["intensity"] = 99
+        except TypeError:
+            pass
+        else:
+            raise AssertionError(f"plan modificable para {args}")
+        count += 1
+    # Sin partido, el día elegido no cambia el plan
+    assert generate_week_plan(False, "Friday", 2, "Mantener") is generate_week_plan(False, None, 2, "Mantener")
+    return count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{check_equivalence()} planes idénticos a la implementación de referencia")
+    inputs = list(domain())
+    for name, fn in [("tabla", generate_week_plan), ("referencia", _build_week_plan)]:
+        cycle = itertools.cycle(inputs)
+        seconds = timeit.timeit(lambda: fn(*next(cycle)), number=args.number)
+        print(f"{name:<11} {seconds / args.number * 1e6:8.2f} µs/plan")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Historial de precios: descarga en bloque, actualización incremental y lectura
+=============================================================================
+Con `SyntheticProvider` (sin red, una latencia fija por consulta) y un
+archivo `PriceHistory` temporal:
+  1. Descarga inicial de un año para todo el universo: una consulta por
+     símbolo vs. consultas en bloque de `BATCH_SIZE` símbolos.
+  2. Actualización días después: solo las barras nuevas de cada símbolo, en
+     una consulta por lote; una segunda actualización no consulta nada.
+  3. Lectura: abrir el archivo (memory-map) y armar el DataFrame respaldado
+     por Arrow, y la tabla ancha de cierres.
+
+Verifica que lo guardado coincide con una descarga completa nueva.
+
+Ejecutar:
+    python -m benchmarks.bench_price_history [--symbols 100] [--latency 0.2] [--days 5]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+from market_providers import SyntheticProvider
+from price_history import BATCH_SIZE, PriceHistory
+
+END = date(2026, 9, 30)
+
+
+class CountingProvider(SyntheticProvider):
+    """`SyntheticProvider` que cuenta las consultas de historial (cada lote cuenta una)."""
+
+    requests = 0
+
+    def history(self, symbol, start=None, end=None):
+        self.requests += 1
+        return super().history(symbol, start, end)
+
+    def histories(self, symbols, start=None, end=None):
+        self.requests += 1
+        return super().histories(symbols, start, end)
+
+
+class PerSymbolProvider(CountingProvider):
+    """Sin consulta en bloque: una descarga por símbolo, como con `Ticker.history`."""
+
+    def histories(self, symbols, start=None, end=None):
+        return self._each(lambda symbol: self.history(symbol, start, end), symbols)
+
+
+def timed(fn) -> tuple:
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def business_days_after(day: date, n: int) -> date:
+    while n:
+        day += timedelta(days=1)
+        n -= day.weekday() < 5
+    return day
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--symbols", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--days", type=int, default=5, help="días hábiles entre la descarga inicial y la actualización")
+    args = parser.parse_args()
+    symbols = [f"SYM{i:03d}" for i in range(args.symbols)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # 1. Descarga inicial
+        per_symbol = PerSymbolProvider(latency=args.latency)
+        _, slow = timed(lambda: PriceHistory(os.path.join(tmp, "per_symbol.arrow")).update(per_symbol, symbols, END))
+        provider = CountingProvider(latency=args.latency)
+        history = PriceHistory(os.path.join(tmp, "price_history.arrow"))
+        added, fast = timed(lambda: history.update(provider, symbols, END))
+        print(f"descarga inicial, {len(symbols)} símbolos · {sum(added.values())} barras")
+        print(f"  {'por símbolo':<22} {slow:7.2f} s  {per_symbol.requests:4d} consultas")
+        print(f"  {f'en bloque (×{BATCH_SIZE})':<22} {fast:7.2f} s  {provider.requests:4d} consultas")
+
+        # 2. Actualización incremental
+        later = business_days_after(END, args.days)
+        provider.requests = 0
+        added, seconds = timed(lambda: history.update(provider, symbols, later))
+        assert set(added.values()) == {args.days}, "se descargaron barras que ya estaban guardadas"
+        requests = provider.requests
+        again = history.update(provider, symbols, later)
+        assert not again and provider.requests == requests, "la segunda actualización volvió a consultar"
+        print(f"actualización +{args.days} días hábiles: {sum(added.values())} barras nuevas en {seconds:.2f} s, "
+              f"{requests} consultas; repetirla: 0 consultas")
+
+        fresh = SyntheticProvider().history(symbols[0], END - timedelta(days=365), later)
+        stored = history.frame([symbols[0]])
+        assert stored["close"].tolist() == fresh["close"], "el historial guardado no coincide con una descarga nueva"
+
+        # 3. Lectura
+        reader = PriceHistory(history.path)
+        table, open_s = timed(reader.table)
+        frame, frame_s = timed(reader.frame)
+        closes, closes_s = timed(reader.closes)
+        print(f"lectura de {table.num_rows} barras: abrir {open_s * 1000:.2f} ms · frame {frame_s * 1000:.2f} ms · "
+              f"cierres ancho {closes_s * 1000:.2f} ms {closes.shape}")
+        print(f"en disco {os.path.getsize(history.path) / 1024:.0f} KiB · dtype {frame['close'].dtype}")
+
+
+if __name__ == "__main__":
+    main()
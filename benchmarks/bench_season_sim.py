@@ -0,0 +1,72 @@
+"""
+Throughput del simulador de temporada
+=====================================
+Mide semanas-jugador simuladas por segundo con `season_sim.simulate_season`
+(NumPy) y con un bucle equivalente que pide el plan a las reglas
+compartidas (`default_rules().plan`) y llama a `calculate_load` por jugador
+y semana. Al final imprime el reporte de
+advertencias de sobrecarga por objetivo.
+
+Ejecutar:
+    python -m benchmarks.bench_season_sim [--athletes 10000] [--weeks 40]
+"""
+
+import argparse
+import random
+import time
+
+import season_sim
+from plan_rules import default_rules
+from trainer_core import DAYS_ES, calculate_load
+
+
+def loop_season(athletes: int, weeks: int, objective: str, seed: int = 0) -> int:
+    """Referencia sin vectorizar: un plan (dict) por jugador y semana. Devuelve advertencias."""
+    rng = random.Random(seed)
+    rules = default_rules()
+    warnings = 0
+    for _ in range(athletes):
+        prev_load, latent, played = None, 2.5, False
+        for _ in range(weeks):
+            latent = 0.6 * latent + 0.4 * 2.5 + 0.5 * played + rng.gauss(0, 0.8)
+            fatigue = min(5, max(1, round(latent)))
+            played = rng.random() < 0.8
+            match_day = rng.choice(DAYS_ES) if played else None
+            plan = rules.plan((match_day,) if played else (), fatigue, objective)
+            minutes = min(300, (rng.randint(0, 90) if played else 0)
+                          + round(sum(s["intensity"] for s in plan) * 10 * rng.uniform(0.7, 1.1)))
+            load = calculate_load(minutes, fatigue)
+            if prev_load and (load - prev_load) / prev_load * 100 > 20:
+                warnings += 1
+            prev_load = load
+    return warnings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--athletes", type=int, default=10000)
+    parser.add_argument("--weeks", type=int, default=40)
+    args = parser.parse_args()
+    total = args.athletes * args.weeks
+
+    season_sim.plan_intensity_table()   # la tabla se construye una vez, fuera de la medición
+    start = time.perf_counter()
+    season_sim.simulate_season("Mantener", args.athletes, args.weeks, seed=0)
+    vectorized = time.perf_counter() - start
+
+    sample = max(1, args.athletes // 20)
+    start = time.perf_counter()
+    loop_season(sample, args.weeks, "Mantener")
+    looped = (time.perf_counter() - start) * args.athletes / sample
+
+    print(f"NumPy  {total / vectorized:>14,.0f} semanas-jugador/s")
+    print(f"bucle  {total / looped:>14,.0f} semanas-jugador/s (estimado con {sample} jugadores)")
+    print()
+    for objective, stats in season_sim.overload_report(athletes=args.athletes, weeks=args.weeks).items():
+        print(f"{objective:<12} advertencias/semana {stats['warning_rate']:6.1%} · "
+              f"por temporada {stats['warnings_per_season']:5.2f} · "
+              f"jugadores con alguna {stats['athletes_warned']:6.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""
+Suite de benchmarks del núcleo, con línea de base
+=================================================
+Mide el tiempo por llamada (mínimo y mediana de varias rondas, con la cantidad
+de iteraciones calibrada como `timeit.autorange`) de:
+  - `generate_week_plan` y `PlanRules.plan` recorriendo todas las combinaciones
+  - `calculate_load`
+  - `intensity_bar_html`, `card_class` y `day_cards_html` (sin memoizar)
+  - lectura y escritura del historial (SQLite y JSON Lines) con historiales
+    sintéticos de 10, 10k y 1M entradas: últimas entradas, agregar una
+    entrada, leer el historial completo
+
+Compara contra `benchmarks/baseline.json` y marca las regresiones que superan
+la tolerancia (`--check` termina con error si hay alguna). `--save` guarda
+los resultados como nueva línea de base; `--memory` agrega el pico de memoria
+(tracemalloc) de una llamada de cada caso.
+
+Ejecutar:
+    python -m benchmarks.bench_suite [--sizes 10 10000 1000000] [-k history]
+                                     [--memory] [--save] [--check] [--tolerance 0.3]
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import timeit
+import tracemalloc
+from datetime import date, timedelta
+
+import history_db
+from benchmarks.bench_plan_table import domain
+from history_records import HistoryEntry, entry_inputs
+from history_store import append_entries, append_entry, iter_history, read_tail
+from plan_rules import load_rules
+from trainer_core import (
+    DAYS_ES, FATIGUE_LEVELS, OBJECTIVES, calculate_load, card_class, generate_week_plan, intensity_bar_html,
+)
+from trainer_render import _day_cards_html
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_SIZES = (10, 10_000, 1_000_000)
+ROUNDS = 5
+_CHUNK = 50_000         # entradas por transacción al generar historiales grandes
+ATHLETE = "bench"
+
+
+# ─────────────────────────────────────────────
+# MEDICIÓN
+# ─────────────────────────────────────────────
+
+def measure(fn, rounds: int = ROUNDS) -> dict:
+    """Tiempo por llamada en µs: mínimo y mediana de `rounds` rondas de N iteraciones (≥ 0.2 s)."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    per_call = [t / number * 1e6 for t in timer.repeat(rounds, number)]
+    return {"min_us": min(per_call), "median_us": statistics.median(per_call), "iterations": number}
+
+
+def peak_kib(fn) -> float:
+    """Pico de memoria (KiB) asignada durante una llamada."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+# ─────────────────────────────────────────────
+# CASOS
+# ─────────────────────────────────────────────
+
+def core_cases():
+    """Plan semanal, carga y HTML de tarjetas: (nombre, función sin argumentos)."""
+    inputs = itertools.cycle(list(domain()))
+    yield "generate_week_plan", lambda: generate_week_plan(*next(inputs))
+
+    rules = load_rules()
+    rule_inputs = itertools.cycle([
+        ((day,) if match else (), fatigue, objective) for match, day, fatigue, objective in domain()
+    ])
+    yield "plan_rules.plan", lambda: rules.plan(*next(rule_inputs))
+
+    loads = itertools.cycle([(minutes, fatigue) for minutes in range(0, 301, 5) for fatigue in FATIGUE_LEVELS])
+    yield "calculate_load", lambda: calculate_load(*next(loads))
+
+    levels = itertools.cycle(range(1, 6))
+    yield "intensity_bar_html", lambda: intensity_bar_html(next(levels))
+
+    types = itertools.cycle(sorted({s["type"] for args in domain() for s in generate_week_plan(*args)}))
+    yield "card_class", lambda: card_class(next(types))
+
+    plans = itertools.cycle([
+        tuple((s["day"], s["type"], s["detail"], s["intensity"]) for s in generate_week_plan(*args))
+        for args in domain()
+    ])
+    yield "day_cards_html[sin caché]", lambda: _day_cards_html.__wrapped__(next(plans))
+
+
+def synthetic_entries(n: int, seed: int = 0):
+    """Entradas diarias sintéticas como las guarda la app, generadas de a una."""
+    rng = random.Random(seed)
+    start = date(2000, 1, 1)
+    for i in range(n):
+        match = rng.random() < 0.8
+        fatigue = rng.randint(1, 5)
+        minutes = rng.randrange(0, 300, 5)
+        yield HistoryEntry((start + timedelta(days=i)).isoformat(), calculate_load(minutes, fatigue), entry_inputs(
+            match=match,
+            match_day=rng.choice(DAYS_ES) if match else None,
+            fatigue=fatigue,
+            minutes_played=minutes,
+            objective=rng.choice(OBJECTIVES),
+        ))
+
+
+def _next_entries(n: int):
+    """Entradas nuevas posteriores al historial sintético de `n` (para medir escrituras)."""
+    start = date(2000, 1, 1) + timedelta(days=n)
+    inputs = entry_inputs(match=False, fatigue=3, minutes_played=60, objective=OBJECTIVES[0])
+    day = itertools.count()
+    return lambda: HistoryEntry((start + timedelta(days=next(day))).isoformat(), 180, inputs)
+
+
+def history_case_names(n: int) -> list:
+    """Nombres de los casos de historial para `n` entradas, en el orden en que corren."""
+    return [f"{case}[{store},{n}]" for store in ("db", "jsonl")
+            for case in ("load_history", "load_history_full", "save_history")]
+
+
+def history_cases(n: int, workdir: str):
+    """Lectura y escritura del historial SQLite y JSON Lines con `n` entradas previas."""
+    conn = history_db.connect(os.path.join(workdir, f"history-{n}.db"))
+    entries = synthetic_entries(n)
+    while True:
+        chunk = list(itertools.islice(entries, _CHUNK))
+        if not chunk:
+            break
+        history_db.insert_entries(conn, ATHLETE, chunk)
+
+    path = os.path.join(workdir, f"history-{n}.jsonl")
+    entries = synthetic_entries(n)
+    while True:
+        chunk = list(itertools.islice(entries, _CHUNK))
+        if not chunk:
+            break
+        append_entries(path, chunk)
+
+    db_entry, jsonl_entry = _next_entries(n), _next_entries(n)
+    yield from zip(history_case_names(n), [
+        lambda: history_db.latest_entries(conn, ATHLETE, 5),
+        lambda: history_db.history_columns(conn, ATHLETE),
+        lambda: history_db.insert_entry(conn, ATHLETE, db_entry()),
+        lambda: read_tail(path, 5),
+        lambda: sum(1 for _ in iter_history(path)),
+        lambda: append_entry(path, jsonl_entry()),
+    ])
+
+
+# ─────────────────────────────────────────────
+# LÍNEA DE BASE
+# ─────────────────────────────────────────────
+
+def load_baseline(path: str = BASELINE_FILE) -> dict:
+    """Resultados de la línea de base guardada ({} si no hay)."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)["results"]
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(results: dict, path: str = BASELINE_FILE) -> None:
+    """Guarda los resultados (y el entorno en que se midieron) como línea de base."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "python": platform.python_version(),
+            "machine": f"{platform.system()} {platform.machine()}",
+            "measured": date.today().isoformat(),
+            "results": {name: {k: round(v, 4) if isinstance(v, float) else v for k, v in r.items()}
+                        for name, r in results.items()},
+        }, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("-k", dest="pattern", help="solo los casos cuyo nombre contiene este texto")
+    parser.add_argument("--memory", action="store_true", help="pico de memoria por llamada (tracemalloc)")
+    parser.add_argument("--save", action="store_true", help="guardar como nueva línea de base")
+    parser.add_argument("--check", action="store_true", help="terminar con error si hay regresiones")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="regresión: mediana > base × (1 + tolerancia)")
+    args = parser.parse_args()
+
+    baseline = load_baseline()
+    results = {}
+    regressions = []
+    print(f"{'caso':<34} {'mediana µs':>14} {'mín µs':>14} {'iter':>8} {'vs base':>8}"
+          + (f" {'pico KiB':>9}" if args.memory else ""))
+
+    with tempfile.TemporaryDirectory() as workdir:
+        # Los historiales grandes solo se generan si algún caso de ese tamaño va a correr
+        groups = [core_cases()] + [
+            history_cases(n, workdir) for n in args.sizes
+            if not args.pattern or any(args.pattern in name for name in history_case_names(n))
+        ]
+        for name, fn in itertools.chain.from_iterable(groups):
+            if args.pattern and args.pattern not in name:
+                continue
+            result = measure(fn)
+            if args.memory:
+                result["peak_kib"] = peak_kib(fn)
+            results[name] = result
+
+            ratio = ""
+            if name in baseline:
+                change = result["median_us"] / baseline[name]["median_us"]
+                ratio = f"{change:7.2f}×"
+                if change > 1 + args.tolerance:
+                    regressions.append(name)
+                    ratio += " !"
+            print(f"{name:<34} {result['median_us']:14.2f} {result['min_us']:14.2f} {result['iterations']:8d} "
+                  f"{ratio:>8}" + (f" {result['peak_kib']:9.1f}" if args.memory else ""))
+
+    if args.save:
+        save_baseline({**baseline, **results} if args.pattern else results)
+        print(f"línea de base guardada en {BASELINE_FILE}")
+    if regressions:
+        print(f"{len(regressions)} regresiones (> {args.tolerance:.0%} sobre la base): {', '.join(regressions)}")
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+"""
+Configuración de pytest: este archivo en la raíz hace que pytest agregue el
+directorio del repositorio a `sys.path`, así los tests (`tests/`) importan
+los módulos planos (`history_db`, `workload`, ...) como lo hace la app.
+"""
@@ -0,0 +1,70 @@
+"""
+Utilidades de archivos compartidas
+==================================
+Lock advisory entre procesos e hilos (`file_lock`) y escritura atómica
+(`atomic_file`, `write_atomic`): el contenido se escribe en un temporal del
+mismo directorio y reemplaza al archivo con `os.replace`, así los lectores
+ven la versión anterior o la nueva, nunca una a medias.
+
+Las usan el historial de entrenamiento (`history_store`) y el historial de
+precios (`price_history`). Solo biblioteca estándar.
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+@contextmanager
+def file_lock(path: str):
+    """
+    Lock advisory exclusivo asociado a `path` (archivo `<path>.lock`).
+    Excluye tanto a otros procesos como a otros hilos del mismo proceso.
+    """
+    with open(path + ".lock", "a+b") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+        else:
+            lock.seek(0)
+            msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+            else:
+                lock.seek(0)
+                msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def atomic_file(path: str):
+    """
+    Archivo binario temporal en el directorio de `path`. Al salir sin error se
+    hace fsync y se renombra sobre `path`; si hay una excepción se borra.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)),
+                                    prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_atomic(path: str, chunks) -> None:
+    """Escribe `chunks` (bytes) en `path` de forma atómica (ver `atomic_file`)."""
+    with atomic_file(path) as f:
+        for chunk in chunks:
+            f.write(chunk)
@@ -0,0 +1,240 @@
+"""
+Smart Football Trainer — modelo fitness-fatiga (Banister)
+=========================================================
+Modelo de impulso-respuesta: cada carga suma a dos componentes que decaen
+exponencialmente a distinto ritmo,
+
+    fitness(t) = fitness(t-1) · e^(-1/τ_fitness) + carga(t)
+    fatiga(t)  = fatiga(t-1)  · e^(-1/τ_fatiga)  + carga(t)
+    disposición(t) = p0 + k_fitness · fitness(t) - k_fatiga · fatiga(t)
+
+El estado de un jugador (`new_fitness_state`) se actualiza en O(1) por
+entrada (`update_fitness`), también cuando hay días sin carga entre medio.
+La carga de una entrada es la de toda la semana, así que cada semana cuenta
+una sola vez, con la misma regla que `workload`: una nueva entrada de la
+misma semana reemplaza a la anterior en lugar de sumarse.
+`forecast_week` proyecta la disposición sobre los 7 días de un plan semanal
+repartiendo la carga según la `intensity` de cada sesión, y `fit_squad`
+ajusta los parámetros de cada jugador de una plantilla completa de forma
+vectorizada con NumPy.
+"""
+
+import math
+from datetime import date, timedelta
+
+from history_records import HistoryColumns, day_number, week_number
+
+DEFAULT_PARAMS = {
+    "tau_fitness": 42.0,   # días
+    "tau_fatigue": 7.0,    # días
+    "k_fitness": 1.0,
+    "k_fatigue": 2.0,
+    "p0": 0.0,
+}
+
+TAU_FITNESS_GRID = (28.0, 35.0, 42.0, 50.0, 60.0)
+TAU_FATIGUE_GRID = (4.0, 7.0, 10.0, 14.0)
+MIN_OBSERVATIONS = 4    # observaciones mínimas para ajustar un jugador
+
+
+# ─────────────────────────────────────────────
+# ESTADO INCREMENTAL
+# ─────────────────────────────────────────────
+
+def new_fitness_state() -> dict:
+    """Estado vacío (serializable a JSON) de un jugador sin historial."""
+    # `prev`: (last_day, fitness, fatigue) antes de la última entrada, para reemplazarla
+    return {"last_day": None, "fitness": 0.0, "fatigue": 0.0, "prev": None}
+
+
+def _decay(state: dict, day: int, params: dict) -> tuple:
+    """Valores de fitness y fatiga decaídos desde el último día hasta `day`."""
+    if state["last_day"] is None:
+        return 0.0, 0.0
+    gap = max(0, day - state["last_day"])
+    return (
+        state["fitness"] * math.exp(-gap / params["tau_fitness"]),
+        state["fatigue"] * math.exp(-gap / params["tau_fatigue"]),
+    )
+
+
+def update_fitness(state: dict, day, load, params: dict = DEFAULT_PARAMS) -> dict:
+    """
+    Registra la carga de una entrada en O(1) y devuelve el estado. Si la
+    semana ya tenía entrada, la reemplaza: se vuelve al estado anterior a
+    esa entrada y la carga nueva se aplica en su propio día. Las fechas deben
+    llegar en orden no decreciente (ValueError si no).
+    """
+    day = day_number(day)
+    if state["last_day"] is not None and day < state["last_day"]:
+        raise ValueError("las entradas deben agregarse en orden cronológico")
+    if state["last_day"] is not None and week_number(day) == week_number(state["last_day"]):
+        if state.get("prev") is None:
+            raise ValueError("el estado no permite reemplazar la entrada de la semana")
+        state.update(zip(("last_day", "fitness", "fatigue"), state["prev"]))
+    state["prev"] = [state["last_day"], state["fitness"], state["fatigue"]]
+    return _add_impulse(state, day, load, params)
+
+
+def _add_impulse(state: dict, day: int, load, params: dict) -> dict:
+    """Suma una carga al estado en el día `day` (varias el mismo día se acumulan)."""
+    fitness, fatigue = _decay(state, day, params)
+    state.update(last_day=day, fitness=fitness + load, fatigue=fatigue + load)
+    return state
+
+
+def readiness(state: dict, as_of=None, params: dict = DEFAULT_PARAMS) -> dict:
+    """Fitness, fatiga y disposición del estado a la fecha `as_of` (por defecto el último día)."""
+    day = state["last_day"] if as_of is None else day_number(as_of)
+    fitness, fatigue = _decay(state, day, params) if day is not None else (0.0, 0.0)
+    return {
+        "fitness": fitness,
+        "fatigue": fatigue,
+        "readiness": params["p0"] + params["k_fitness"] * fitness - params["k_fatigue"] * fatigue,
+    }
+
+
+def replay_fitness(entries, params: dict = DEFAULT_PARAMS) -> dict:
+    """
+    Estado final aplicando `update_fitness` a todo el historial.
+    Acepta una lista de entradas o un `HistoryColumns`.
+    """
+    state = new_fitness_state()
+    if isinstance(entries, HistoryColumns):
+        for day, load in zip(entries.days, entries.loads):
+            update_fitness(state, day, load, params)
+        return state
+    for entry in sorted(entries, key=lambda e: e["date"]):
+        update_fitness(state, entry["date"], entry["load"], params)
+    return state
+
+
+# ─────────────────────────────────────────────
+# PRONÓSTICO DEL PLAN SEMANAL
+# ─────────────────────────────────────────────
+
+def plan_impulses(week_plan, weekly_load: float) -> list:
+    """Reparte la carga semanal entre los días del plan en proporción a su `intensity`."""
+    total = sum(session["intensity"] for session in week_plan)
+    if total <= 0:
+        return [0.0] * len(week_plan)
+    return [weekly_load * session["intensity"] / total for session in week_plan]
+
+
+def forecast_week(state: dict, week_plan, weekly_load: float, start: date,
+                  params: dict = DEFAULT_PARAMS) -> list:
+    """
+    Proyecta fitness, fatiga y disposición para cada día del plan (sin modificar `state`).
+
+    `start` es la fecha del primer día del plan. Devuelve una lista de dicts:
+        [{ 'day', 'date', 'load', 'fitness', 'fatigue', 'readiness' }, ...]
+    """
+    projected = dict(state)
+    forecast = []
+    for offset, (session, load) in enumerate(zip(week_plan, plan_impulses(week_plan, weekly_load))):
+        day = start + timedelta(days=offset)
+        _add_impulse(projected, day.toordinal(), load, params)
+        forecast.append({"day": session["day"], "date": day.isoformat(), "load": load,
+                         **readiness(projected, params=params)})
+    return forecast
+
+
+# ─────────────────────────────────────────────
+# AJUSTE DE PARÁMETROS POR JUGADOR (VECTORIZADO)
+# ─────────────────────────────────────────────
+
+def fit_squad(histories: dict, tau_fitness_grid=TAU_FITNESS_GRID,
+              tau_fatigue_grid=TAU_FATIGUE_GRID) -> dict:
+    """
+    Ajusta los parámetros de Banister de cada jugador de una plantilla.
+
+    `histories` mapea athlete_id → lista de entradas del historial o
+    `HistoryColumns` (más rápido: no recorre entrada por entrada). Como en
+    `update_fitness`, de cada semana cuenta solo la última entrada. Como medida
+    observada de disposición se usa la fatiga declarada (6 - fatiga, de 1 a 5),
+    comparada con el modelo justo antes de la carga de ese día.
+
+    Para cada par (τ_fitness, τ_fatiga) de la grilla se recorren los días una
+    sola vez con matrices (τ × jugadores) y se acumulan las ecuaciones normales
+    de la regresión disposición ~ p0 + k_fitness·fitness - k_fatiga·fatiga;
+    luego se resuelven todas juntas y se elige por jugador el par con menor
+    error. Devuelve athlete_id → parámetros + 'rmse' y 'n_obs'. Los jugadores
+    con menos de `MIN_OBSERVATIONS` observaciones reciben `DEFAULT_PARAMS`.
+    """
+    import numpy as np
+
+    athletes = list(histories)
+    if not athletes:
+        return {}
+    columns = [
+        h.to_numpy() if isinstance(h, HistoryColumns) else HistoryColumns.from_entries(h).to_numpy()
+        for h in (histories[a] for a in athletes)
+    ]
+    first = min((int(d[0]) for d, _, _ in columns if len(d)), default=0)
+    last = max((int(d[-1]) for d, _, _ in columns if len(d)), default=0)
+    n_days = last - first + 1
+    n_athletes = len(athletes)
+
+    loads = np.zeros((n_days, n_athletes))
+    observed = np.full((n_days, n_athletes), np.nan)
+    for col, (d, load, fatigue) in enumerate(columns):
+        # Última entrada de cada semana (los días vienen en orden)
+        weeks = (d - 1) // 7
+        last_of_week = np.r_[weeks[1:] != weeks[:-1], True] if len(d) else np.zeros(0, dtype=bool)
+        d, load, fatigue = d[last_of_week], load[last_of_week], fatigue[last_of_week]
+        loads[d - first, col] = load
+        known = ~np.isnan(fatigue)
+        observed[d[known] - first, col] = 6 - fatigue[known]
+
+    tau_g = np.asarray(tau_fitness_grid, dtype=float)[:, None, None]   # (G, 1, 1)
+    tau_h = np.asarray(tau_fatigue_grid, dtype=float)[None, :, None]   # (1, H, 1)
+    decay_g = np.exp(-1 / tau_g)
+    decay_h = np.exp(-1 / tau_h)
+    shape = (len(tau_fitness_grid), len(tau_fatigue_grid), n_athletes)
+    g = np.zeros(shape)
+    h = np.zeros(shape)
+
+    # Ecuaciones normales de y ~ b0 + b1·g + b2·h, acumuladas por (τ_g, τ_h, jugador)
+    xtx = np.zeros(shape + (3, 3))
+    xty = np.zeros(shape + (3,))
+    yty = np.zeros(n_athletes)
+    n_obs = np.zeros(n_athletes)
+    obs_days = ~np.isnan(observed).all(axis=1)
+
+    for t in range(n_days):
+        g *= decay_g
+        h *= decay_h
+        if obs_days[t]:
+            mask = ~np.isnan(observed[t])
+            y = np.where(mask, observed[t], 0.0)
+            x = np.stack([np.broadcast_to(mask * 1.0, shape), g * mask, h * mask], axis=-1)
+            xtx += x[..., :, None] * x[..., None, :]
+            xty += x * y[..., None]
+            yty += y * y
+            n_obs += mask
+        g += loads[t]
+        h += loads[t]
+
+    # Regularización mínima para que los sistemas casi singulares no fallen
+    beta = np.linalg.solve(xtx + 1e-9 * np.eye(3), xty[..., None])[..., 0]
+    sse = yty - 2 * (beta * xty).sum(-1) + np.einsum("...i,...ij,...j->...", beta, xtx, beta)
+    flat = sse.reshape(-1, n_athletes)
+    best = flat.argmin(axis=0)
+    best_g, best_h = np.unravel_index(best, shape[:2])
+
+    params = {}
+    for col, a in enumerate(athletes):
+        if n_obs[col] < MIN_OBSERVATIONS:
+            params[a] = {**DEFAULT_PARAMS, "rmse": None, "n_obs": int(n_obs[col])}
+            continue
+        b0, b1, b2 = beta[best_g[col], best_h[col], col]
+        params[a] = {
+            "tau_fitness": float(tau_fitness_grid[best_g[col]]),
+            "tau_fatigue": float(tau_fatigue_grid[best_h[col]]),
+            "k_fitness": float(b1),
+            "k_fatigue": float(-b2),
+            "p0": float(b0),
+            "rmse": float(math.sqrt(max(flat[best[col], col], 0.0) / n_obs[col])),
+            "n_obs": int(n_obs[col]),
+        }
+    return params
@@ -0,0 +1,513 @@
+"""
+Historial de entrenamiento — backend SQLite multi-jugador
+=========================================================
+Un único archivo SQLite (modo WAL) compartido por todas las sesiones del
+servidor. Cada registro pertenece a un jugador (`athlete_id`), de modo que
+los historiales quedan aislados y las consultas usan índices en lugar de
+recorrer el historial completo. Cada jugador tiene a lo sumo una entrada por
+día: una entrada nueva del mismo día reemplaza a la anterior (volver a
+generar el plan no duplica la carga).
+
+Junto a cada historial se guarda el estado acumulado de carga aguda:crónica
+(`workload_state`), del modelo fitness-fatiga (`fitness_state`), la carga
+por semana (la de su última entrada, como en `workload`) y por mes
+(`load_rollup`, para el gráfico de todo el historial) y el resumen de la última semana de cada jugador (`squad_summary`,
+para el panel de la plantilla), actualizados en la misma transacción que
+cada inserción.
+
+Varios procesos pueden escribir a la vez: SQLite serializa las transacciones
+y cada conexión espera (`BUSY_TIMEOUT`) en lugar de fallar si la base está
+ocupada.
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import date, timedelta
+
+from fitness_model import replay_fitness, update_fitness
+from history_records import HistoryColumns, HistoryEntry, entry_inputs
+from workload import ACWR_DANGER, state_from_history, update_workload, workload_ratios
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    athlete_id  TEXT    NOT NULL,
+    date        TEXT    NOT NULL,
+    load        INTEGER NOT NULL,
+    inputs      TEXT    NOT NULL
+);
+-- Cubre "últimas entradas" (ORDER BY date DESC, id DESC) y "rango de fechas"
+CREATE INDEX IF NOT EXISTS history_athlete_date ON history (athlete_id, date, id);
+
+CREATE TABLE IF NOT EXISTS workload_state (
+    athlete_id  TEXT PRIMARY KEY,
+    state       TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS fitness_state (
+    athlete_id  TEXT PRIMARY KEY,
+    state       TEXT NOT NULL
+);
+
+-- Carga por período: 'week' (inicio = lunes; la última entrada de la semana,
+-- como en `workload`) y 'month' (inicio = día 1; suma de las semanas cuyo
+-- lunes cae en el mes)
+CREATE TABLE IF NOT EXISTS load_rollup (
+    athlete_id  TEXT    NOT NULL,
+    period      TEXT    NOT NULL,
+    start       TEXT    NOT NULL,
+    load        INTEGER NOT NULL,
+    entries     INTEGER NOT NULL,
+    PRIMARY KEY (athlete_id, period, start)
+);
+
+-- Última semana con carga de cada jugador y la anterior, con el ACWR al último día
+CREATE TABLE IF NOT EXISTS squad_summary (
+    athlete_id      TEXT    PRIMARY KEY,
+    week            TEXT    NOT NULL,
+    load            INTEGER NOT NULL,
+    prev_week       TEXT,
+    prev_load       INTEGER,
+    acwr            REAL,
+    chronic_ready   INTEGER NOT NULL,
+    last_date       TEXT    NOT NULL
+);
+"""
+
+# Estados derivados del historial: tabla → (actualización O(1), reconstrucción completa)
+_STATE_TABLES = {
+    "workload_state": (update_workload, state_from_history),
+    "fitness_state": (update_fitness, replay_fitness),
+}
+
+BUSY_TIMEOUT = 30.0   # segundos de espera si otro proceso tiene la base bloqueada
+
+_INSERT = "INSERT INTO history (athlete_id, date, load, inputs) VALUES (?, ?, ?, ?)"
+# Entradas del jugador en un día (fechas ISO, con o sin hora): [día, día siguiente)
+_SAME_DAY = "athlete_id = ? AND date >= ? AND date < ?"
+
+# Versión de los datos derivados (estados, `load_rollup`, `squad_summary`): si
+# la base tiene una menor, se recalculan al conectar (`_migrate_derived`)
+_DERIVED_VERSION = 4
+
+# Inicio del período de una fecha ISO, en SQL para que escritura y backfill coincidan
+_PERIOD_START = {
+    "week": "date(substr({0}, 1, 10), 'weekday 0', '-6 days')",
+    "month": "date(substr({0}, 1, 10), 'start of month')",
+}
+_WEEK_START = _PERIOD_START["week"]
+_ROLLUP_UPSERT = (
+    "INSERT INTO load_rollup (athlete_id, period, start, load, entries) VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT (athlete_id, period, start) DO UPDATE SET load = excluded.load, entries = excluded.entries"
+)
+_ROLLUP_BACKFILL = [
+    # Semana: la última entrada (por fecha e id) y la cantidad de entradas
+    f"INSERT INTO load_rollup (athlete_id, period, start, load, entries) "
+    f"SELECT athlete_id, 'week', start, load, entries FROM ("
+    f"SELECT athlete_id, {_WEEK_START.format('date')} AS start, load, "
+    f"ROW_NUMBER() OVER (PARTITION BY athlete_id, {_WEEK_START.format('date')} ORDER BY date DESC, id DESC) AS n, "
+    f"COUNT(*) OVER (PARTITION BY athlete_id, {_WEEK_START.format('date')}) AS entries "
+    f"FROM history) WHERE n = 1",
+    # Mes: la suma de las semanas cuyo lunes cae en él (después de las semanas)
+    "INSERT INTO load_rollup (athlete_id, period, start, load, entries) "
+    "SELECT athlete_id, 'month', date(start, 'start of month'), SUM(load), SUM(entries) "
+    "FROM load_rollup WHERE period = 'week' GROUP BY 1, 3",
+]
+
+# La conexión se comparte entre los hilos de Streamlit: se serializa su uso
+_LOCK = threading.Lock()
+
+
+# ─────────────────────────────────────────────
+# CONEXIÓN
+# ─────────────────────────────────────────────
+
+def connect(path: str) -> sqlite3.Connection:
+    """Abre (o crea) la base de historial en modo WAL y aplica el esquema."""
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+    _migrate_derived(conn)
+    _backfill_aggregates(conn)
+    return conn
+
+
+def _migrate_derived(conn: sqlite3.Connection) -> None:
+    """
+    Base con datos derivados de una versión anterior (`PRAGMA user_version` <
+    `_DERIVED_VERSION`): deja solo la última entrada de cada jugador y día,
+    recalcula los estados y borra `load_rollup` y `squad_summary` para que
+    `_backfill_aggregates` los vuelva a calcular.
+    """
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= _DERIVED_VERSION:
+        return
+    with _LOCK:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("PRAGMA user_version").fetchone()[0] >= _DERIVED_VERSION:
+                conn.rollback()     # otro proceso ya migró
+                return
+            conn.execute(
+                "DELETE FROM history WHERE id IN (SELECT id FROM ("
+                "SELECT id, ROW_NUMBER() OVER (PARTITION BY athlete_id, substr(date, 1, 10) "
+                "ORDER BY date DESC, id DESC) AS n FROM history) WHERE n > 1)"
+            )
+            for table in ("load_rollup", "squad_summary", *_STATE_TABLES):
+                conn.execute(f"DELETE FROM {table}")
+            for (athlete_id,) in conn.execute("SELECT DISTINCT athlete_id FROM history").fetchall():
+                columns = _history_columns(conn, athlete_id)
+                for table, (_, rebuild) in _STATE_TABLES.items():
+                    _store_state(conn, table, athlete_id, rebuild(columns))
+            conn.execute(f"PRAGMA user_version = {_DERIVED_VERSION}")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+
+def _backfill_aggregates(conn: sqlite3.Connection) -> None:
+    """Calcula `load_rollup` y `squad_summary` de una base creada antes de que existieran."""
+    with _LOCK:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("SELECT 1 FROM history LIMIT 1").fetchone() is not None:
+                if conn.execute("SELECT 1 FROM load_rollup LIMIT 1").fetchone() is None:
+                    for sql in _ROLLUP_BACKFILL:
+                        conn.execute(sql)
+                if conn.execute("SELECT 1 FROM squad_summary LIMIT 1").fetchone() is None:
+                    for (athlete_id,) in conn.execute("SELECT DISTINCT athlete_id FROM history").fetchall():
+                        _update_summary(conn, athlete_id, _load_state(conn, "workload_state", athlete_id))
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+
+def _row_to_entry(row: tuple) -> HistoryEntry:
+    """Convierte una fila (date, load, inputs) en un registro del historial."""
+    return HistoryEntry(row[0], row[1], entry_inputs(**json.loads(row[2])))
+
+
+def _entry_to_row(athlete_id: str, entry) -> tuple:
+    """Convierte una entrada del historial (dict o `HistoryEntry`) en los parámetros del INSERT."""
+    return (
+        athlete_id,
+        entry["date"],
+        entry["load"],
+        json.dumps(entry.get("inputs", {}), ensure_ascii=False, separators=(",", ":"), default=dict),
+    )
+
+
+# ─────────────────────────────────────────────
+# ESCRITURA
+# ─────────────────────────────────────────────
+
+def insert_entry(conn: sqlite3.Connection, athlete_id: str, entry: dict) -> None:
+    """Agrega una entrada al historial del jugador."""
+    insert_entries(conn, athlete_id, [entry])
+
+
+def insert_entries(conn: sqlite3.Connection, athlete_id: str, entries) -> int:
+    """Agrega varias entradas del jugador en una sola transacción. Devuelve cuántas se insertaron."""
+    return insert_batch(conn, ((athlete_id, entry) for entry in entries))
+
+
+def insert_batch(conn: sqlite3.Connection, items) -> int:
+    """
+    Agrega en una sola transacción pares (athlete_id, entrada) de distintos jugadores
+    y actualiza su estado de carga. Una entrada reemplaza a la que el jugador ya
+    tuviera ese día (y, dentro del lote, la última del día a las anteriores).
+    Devuelve cuántas entradas se insertaron.
+    """
+    items = _last_per_day(items)
+    rows = [_entry_to_row(athlete_id, entry) for athlete_id, entry in items]
+    with _LOCK, conn:
+        _remove_same_day(conn, rows)
+        conn.executemany(_INSERT, rows)
+        _update_rollups(conn, rows)
+        _update_squad_summary(conn, _update_athlete_states(conn, items))
+    return len(rows)
+
+
+def _last_per_day(items) -> list:
+    """Pares (athlete_id, entrada) con solo la última entrada de cada jugador y día, en orden."""
+    last = {}
+    for athlete_id, entry in items:
+        key = (athlete_id, entry["date"][:10])
+        last.pop(key, None)     # reinsertar al final conserva el orden de llegada
+        last[key] = (athlete_id, entry)
+    return list(last.values())
+
+
+def _remove_same_day(conn: sqlite3.Connection, rows: list) -> None:
+    """Borra las entradas que las filas nuevas reemplazan (`_update_rollups` recalcula su semana)."""
+    for athlete_id, day, _, _ in rows:
+        bounds = (athlete_id, day[:10], (date.fromisoformat(day[:10]) + timedelta(days=1)).isoformat())
+        conn.execute(f"DELETE FROM history WHERE {_SAME_DAY}", bounds)
+
+
+def same_day_entries(conn: sqlite3.Connection, items) -> list:
+    """
+    Entradas ya guardadas que `insert_batch(conn, items)` reemplazaría: pares
+    (athlete_id, `HistoryEntry`) del mismo jugador y día que alguna de `items`.
+    """
+    found = []
+    with _LOCK:
+        for athlete_id, day in {(athlete_id, entry["date"][:10]) for athlete_id, entry in items}:
+            bounds = (athlete_id, day, (date.fromisoformat(day) + timedelta(days=1)).isoformat())
+            rows = conn.execute(
+                f"SELECT date, load, inputs FROM history WHERE {_SAME_DAY} ORDER BY date, id", bounds
+            ).fetchall()
+            found.extend((athlete_id, _row_to_entry(row)) for row in rows)
+    return sorted(found, key=lambda item: (item[1]["date"], item[0]))
+
+
+def import_if_empty(conn: sqlite3.Connection, athlete_id: str, entries) -> int:
+    """
+    Importa entradas solo si la base está vacía, de forma atómica: si varios
+    procesos arrancan a la vez, únicamente el primero importa.
+    """
+    with _LOCK:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("SELECT 1 FROM history LIMIT 1").fetchone() is not None:
+                conn.rollback()
+                return 0
+            items = _last_per_day((athlete_id, entry) for entry in entries)
+            rows = [_entry_to_row(a, entry) for a, entry in items]
+            conn.executemany(_INSERT, rows)
+            _update_rollups(conn, rows)
+            _update_squad_summary(conn, _update_athlete_states(conn, items))
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+    return len(items)
+
+
+def _update_rollups(conn: sqlite3.Connection, rows: list) -> None:
+    """
+    Actualiza `load_rollup` con las filas nuevas (athlete_id, date, load, inputs):
+    recalcula sus semanas, cuya carga es la de la última entrada (por índice,
+    solo las entradas de esa semana), y después los meses de esas semanas a
+    partir de sus filas semanales.
+    """
+    days = {(athlete_id, date.fromisoformat(day[:10])) for athlete_id, day, _, _ in rows}
+    weeks = {(athlete_id, day - timedelta(days=day.weekday())) for athlete_id, day in days}
+    for athlete_id, monday in weeks:
+        bounds = (athlete_id, monday.isoformat(), (monday + timedelta(days=7)).isoformat())
+        last = conn.execute(
+            "SELECT load, (SELECT COUNT(*) FROM history WHERE athlete_id = ?1 AND date >= ?2 AND date < ?3) "
+            "FROM history WHERE athlete_id = ?1 AND date >= ?2 AND date < ?3 ORDER BY date DESC, id DESC LIMIT 1",
+            bounds,
+        ).fetchone()
+        conn.execute(_ROLLUP_UPSERT, (athlete_id, "week", monday.isoformat(), *last))
+    for athlete_id, month in {(athlete_id, monday.replace(day=1)) for athlete_id, monday in weeks}:
+        bounds = (athlete_id, month.isoformat(), (month + timedelta(days=31)).replace(day=1).isoformat())
+        total = conn.execute(
+            "SELECT SUM(load), SUM(entries) FROM load_rollup "
+            "WHERE athlete_id = ? AND period = 'week' AND start >= ? AND start < ?",
+            bounds,
+        ).fetchone()
+        conn.execute(_ROLLUP_UPSERT, (athlete_id, "month", month.isoformat(), *total))
+
+
+def _update_athlete_states(conn: sqlite3.Connection, items: list) -> dict:
+    """
+    Aplica las entradas nuevas a los estados derivados de cada jugador en O(1) por
+    entrada. Si el jugador no tiene estado o llega una fecha anterior a la última,
+    el estado se reconstruye una vez desde su historial completo.
+    Devuelve athlete_id → { tabla: estado nuevo }.
+    """
+    by_athlete = {}
+    for athlete_id, entry in items:
+        by_athlete.setdefault(athlete_id, []).append(entry)
+
+    updated = {}
+    for athlete_id, entries in by_athlete.items():
+        states = updated[athlete_id] = {}
+        for table, (update, rebuild) in _STATE_TABLES.items():
+            row = conn.execute(
+                f"SELECT state FROM {table} WHERE athlete_id = ?", (athlete_id,)
+            ).fetchone()
+            state = None
+            if row is not None:
+                state = json.loads(row[0])
+                try:
+                    for entry in entries:
+                        update(state, entry["date"], entry["load"])
+                except ValueError:
+                    state = None
+            if state is None:
+                state = rebuild(_history_columns(conn, athlete_id))
+            _store_state(conn, table, athlete_id, state)
+            states[table] = state
+    return updated
+
+
+def _store_state(conn: sqlite3.Connection, table: str, athlete_id: str, state: dict) -> None:
+    conn.execute(
+        f"INSERT INTO {table} (athlete_id, state) VALUES (?, ?) "
+        "ON CONFLICT (athlete_id) DO UPDATE SET state = excluded.state",
+        (athlete_id, json.dumps(state)),
+    )
+
+
+def _update_squad_summary(conn: sqlite3.Connection, states: dict) -> None:
+    """Actualiza el resumen de los jugadores con entradas nuevas (ver `_update_summary`)."""
+    for athlete_id, athlete_states in states.items():
+        _update_summary(conn, athlete_id, athlete_states["workload_state"])
+
+
+def _update_summary(conn: sqlite3.Connection, athlete_id: str, workload_state: dict) -> None:
+    """
+    Resumen del jugador a partir de sus dos últimas semanas en `load_rollup`
+    (búsqueda por clave primaria; la carga de cada semana es la de su última
+    entrada, la misma regla que `workload`), de su estado de carga aguda:crónica y de
+    la fecha de su última entrada (por índice).
+    """
+    weeks = conn.execute(
+        "SELECT start, load FROM load_rollup WHERE athlete_id = ? AND period = 'week' "
+        "ORDER BY start DESC LIMIT 2",
+        (athlete_id,),
+    ).fetchall()
+    if not weeks:
+        return
+    (week, load), (prev_week, prev_load) = weeks[0], weeks[1] if len(weeks) > 1 else (None, None)
+    ratios = workload_ratios(workload_state)
+    (last_date,) = conn.execute(
+        "SELECT substr(MAX(date), 1, 10) FROM history WHERE athlete_id = ?", (athlete_id,)
+    ).fetchone()
+    conn.execute(
+        "INSERT INTO squad_summary (athlete_id, week, load, prev_week, prev_load, acwr, chronic_ready, last_date) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (athlete_id) DO UPDATE SET "
+        "week = excluded.week, load = excluded.load, prev_week = excluded.prev_week, "
+        "prev_load = excluded.prev_load, acwr = excluded.acwr, chronic_ready = excluded.chronic_ready, "
+        "last_date = excluded.last_date",
+        (athlete_id, week, load, prev_week, prev_load, ratios["ewma_acwr"], ratios["chronic_ready"], last_date),
+    )
+
+
+def _history_columns(conn: sqlite3.Connection, athlete_id: str) -> HistoryColumns:
+    """
+    Historial completo del jugador por columnas, en orden. El día ordinal y la
+    fatiga se calculan en SQL, sin decodificar el JSON de cada fila en Python.
+    """
+    rows = conn.execute(
+        "SELECT CAST(julianday(substr(date, 1, 10)) - 1721424.5 AS INTEGER), load, "
+        "json_extract(inputs, '$.fatigue') "
+        "FROM history WHERE athlete_id = ? ORDER BY date, id",
+        (athlete_id,),
+    )
+    return HistoryColumns.from_rows(rows)
+
+
+def _load_state(conn: sqlite3.Connection, table: str, athlete_id: str) -> dict:
+    """Estado derivado del jugador; si falta (historial previo a la tabla), se calcula."""
+    row = conn.execute(
+        f"SELECT state FROM {table} WHERE athlete_id = ?", (athlete_id,)
+    ).fetchone()
+    if row is None:
+        return _STATE_TABLES[table][1](_history_columns(conn, athlete_id))
+    return json.loads(row[0])
+
+
+def _get_state(conn: sqlite3.Connection, table: str, athlete_id: str) -> dict:
+    """`_load_state` con la conexión bloqueada."""
+    with _LOCK:
+        return _load_state(conn, table, athlete_id)
+
+
+# ─────────────────────────────────────────────
+# CONSULTAS
+# ─────────────────────────────────────────────
+
+def latest_entries(conn: sqlite3.Connection, athlete_id: str, n: int) -> list:
+    """Últimas `n` entradas del jugador como `HistoryEntry` (la más reciente al final)."""
+    with _LOCK:
+        rows = conn.execute(
+            "SELECT date, load, inputs FROM history WHERE athlete_id = ? "
+            "ORDER BY date DESC, id DESC LIMIT ?",
+            (athlete_id, n),
+        ).fetchall()
+    return [_row_to_entry(row) for row in reversed(rows)]
+
+
+def latest_entry_before(conn: sqlite3.Connection, athlete_id: str, day: str):
+    """Última entrada del jugador (`HistoryEntry`) con fecha anterior a `day` (ISO), o None."""
+    with _LOCK:
+        row = conn.execute(
+            "SELECT date, load, inputs FROM history WHERE athlete_id = ? AND date < ? "
+            "ORDER BY date DESC, id DESC LIMIT 1",
+            (athlete_id, day),
+        ).fetchone()
+    return None if row is None else _row_to_entry(row)
+
+
+def entries_between(conn: sqlite3.Connection, athlete_id: str, start: str, end: str) -> list:
+    """Entradas del jugador (`HistoryEntry`) con fecha ISO entre `start` y `end` (ambas incluidas)."""
+    with _LOCK:
+        rows = conn.execute(
+            "SELECT date, load, inputs FROM history "
+            "WHERE athlete_id = ? AND date BETWEEN ? AND ? ORDER BY date, id",
+            (athlete_id, start, end),
+        ).fetchall()
+    return [_row_to_entry(row) for row in rows]
+
+
+def history_columns(conn: sqlite3.Connection, athlete_id: str) -> HistoryColumns:
+    """Historial completo del jugador como `HistoryColumns` (fechas, cargas, fatiga)."""
+    with _LOCK:
+        return _history_columns(conn, athlete_id)
+
+
+def load_rollup(conn: sqlite3.Connection, athlete_id: str, period: str = "week") -> list:
+    """Carga del jugador por período ('week' o 'month'): filas (inicio ISO, carga) en orden."""
+    if period not in _PERIOD_START:
+        raise ValueError(f"período desconocido: {period!r}")
+    with _LOCK:
+        return conn.execute(
+            "SELECT start, load FROM load_rollup WHERE athlete_id = ? AND period = ? ORDER BY start",
+            (athlete_id, period),
+        ).fetchall()
+
+
+def squad_summary(conn: sqlite3.Connection) -> list:
+    """
+    Resumen de carga de todos los jugadores, leído de `squad_summary` (sin recorrer
+    historiales). Devuelve dicts con athlete_id, week, load, prev_load,
+    variation_pct, acwr, chronic_ready, overload y last_date.
+
+    `overload` sigue la regla de la app: con 4 semanas de historial, ACWR > 1.5;
+    antes, variación semanal > 20%.
+    """
+    with _LOCK:
+        rows = conn.execute(
+            "SELECT athlete_id, week, load, prev_load, acwr, chronic_ready, last_date "
+            "FROM squad_summary ORDER BY athlete_id"
+        ).fetchall()
+    summary = []
+    for athlete_id, week, load, prev_load, acwr, chronic_ready, last_date in rows:
+        variation_pct = (load - prev_load) / prev_load * 100 if prev_load else None
+        if chronic_ready and acwr is not None:
+            overload = acwr > ACWR_DANGER
+        else:
+            overload = variation_pct is not None and variation_pct > 20
+        summary.append({
+            "athlete_id": athlete_id, "week": week, "load": load, "prev_load": prev_load,
+            "variation_pct": variation_pct, "acwr": acwr, "chronic_ready": bool(chronic_ready),
+            "overload": overload, "last_date": last_date,
+        })
+    return summary
+
+
+def get_workload_state(conn: sqlite3.Connection, athlete_id: str) -> dict:
+    """Estado de carga aguda:crónica del jugador (vacío si no tiene historial)."""
+    return _get_state(conn, "workload_state", athlete_id)
+
+
+def get_fitness_state(conn: sqlite3.Connection, athlete_id: str) -> dict:
+    """Estado del modelo fitness-fatiga del jugador (vacío si no tiene historial)."""
+    return _get_state(conn, "fitness_state", athlete_id)
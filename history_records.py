@@ -0,0 +1,184 @@
+"""
+Historial de entrenamiento — registros compactos
+================================================
+Representaciones livianas de las entradas del historial para jugadores con
+años de datos:
+
+  - `EntryInputs` / `HistoryEntry`: registros inmutables (`records.Record`)
+    que se leen como los dicts de siempre (`entry["load"]`,
+    `entry["inputs"].get("objective")`). Los inputs se internan: todas las
+    semanas con los mismos datos comparten un único objeto.
+  - `HistoryColumns`: almacén por columnas (fechas, cargas, fatiga) sobre
+    `array`, en orden cronológico, para recorrer o vectorizar el historial
+    sin construir un dict por entrada.
+
+Solo usa la biblioteca estándar; `to_numpy` importa NumPy al usarse.
+"""
+
+import math
+import sys
+from array import array
+from datetime import date
+from functools import lru_cache
+
+from records import Record
+
+_INPUT_FIELDS = ("match", "match_day", "fatigue", "minutes_played", "objective")
+_ENTRY_FIELDS = ("date", "load", "inputs")
+
+
+def day_number(day) -> int:
+    """Número ordinal de un día (acepta ordinal, `date` o string ISO)."""
+    if isinstance(day, int):
+        return day
+    if isinstance(day, str):
+        day = date.fromisoformat(day[:10])
+    return day.toordinal()
+
+
+def week_number(day) -> int:
+    """Número de la semana (de lunes a domingo) de un día; consecutivo entre semanas."""
+    return (day_number(day) - 1) // 7      # el ordinal 1 (1/1/0001) es lunes
+
+
+# ─────────────────────────────────────────────
+# REGISTROS
+# ─────────────────────────────────────────────
+
+class EntryInputs(Record):
+    """
+    Datos ingresados por el jugador para una entrada. Los campos en None se
+    tratan como ausentes (`inputs.get("objective", "—")` sigue funcionando);
+    las claves desconocidas se conservan en `extra`.
+    """
+    __slots__ = _fields = _INPUT_FIELDS + ("extra",)
+
+    def __init__(self, match: bool = None, match_day: str = None, fatigue: int = None,
+                 minutes_played: int = None, objective: str = None, extra: tuple = ()):
+        super().__init__(match, match_day, fatigue, minutes_played, objective, extra)
+
+    def __getitem__(self, key: str):
+        value = getattr(self, key, None) if key in _INPUT_FIELDS else dict(self.extra).get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self):
+        for key in _INPUT_FIELDS:
+            if getattr(self, key) is not None:
+                yield key
+        for key, _ in self.extra:
+            yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+_NO_INPUTS = EntryInputs()
+
+
+def _intern(value):
+    """Interna los strings para que los valores repetidos no se dupliquen."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+@lru_cache(maxsize=4096)
+def _interned_inputs(match, match_day, fatigue, minutes_played, objective, extra) -> EntryInputs:
+    return EntryInputs(match, _intern(match_day), fatigue, minutes_played, _intern(objective), extra)
+
+
+def entry_inputs(**fields) -> EntryInputs:
+    """`EntryInputs` internado a partir de sus campos (las claves desconocidas van a `extra`)."""
+    extra = tuple(sorted((k, v) for k, v in fields.items() if k not in _INPUT_FIELDS))
+    values = tuple(fields.get(key) for key in _INPUT_FIELDS)
+    try:
+        return _interned_inputs(*values, extra)
+    except TypeError:   # valores no hasheables en `extra`: no se internan
+        return EntryInputs(*values, extra)
+
+
+class HistoryEntry(Record):
+    """Entrada del historial { 'date', 'load', 'inputs' } como registro compacto."""
+    __slots__ = _fields = _ENTRY_FIELDS
+
+    def __init__(self, date: str, load: int, inputs: EntryInputs = _NO_INPUTS):
+        super().__init__(date, load, inputs)
+
+    @classmethod
+    def from_dict(cls, entry) -> "HistoryEntry":
+        """Registro a partir de una entrada en formato dict."""
+        if isinstance(entry, cls):
+            return entry
+        return cls(entry["date"], entry["load"], entry_inputs(**entry.get("inputs", {})))
+
+    def to_dict(self) -> dict:
+        """Entrada en formato dict, lista para serializar como JSON."""
+        return {"date": self.date, "load": self.load, "inputs": dict(self.inputs)}
+
+
+# ─────────────────────────────────────────────
+# ALMACÉN POR COLUMNAS
+# ─────────────────────────────────────────────
+
+class HistoryColumns:
+    """
+    Historial de un jugador por columnas, en orden cronológico:
+      - days:    ordinal del día (`date.toordinal()`), int64
+      - loads:   carga, int64
+      - fatigue: fatiga declarada, float64 (NaN si no se conoce)
+
+    Cada entrada ocupa 24 bytes, frente a varios cientos como dict.
+    """
+
+    __slots__ = ("days", "loads", "fatigue")
+
+    def __init__(self):
+        self.days = array("q")
+        self.loads = array("q")
+        self.fatigue = array("d")
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def append(self, day, load: int, fatigue=None) -> None:
+        """Agrega un día al final. Las fechas deben llegar en orden no decreciente (ValueError si no)."""
+        day = day_number(day)
+        if self.days and day < self.days[-1]:
+            raise ValueError("las entradas deben agregarse en orden cronológico")
+        self.days.append(day)
+        self.loads.append(load)
+        self.fatigue.append(math.nan if fatigue is None else fatigue)
+
+    @classmethod
+    def from_rows(cls, rows) -> "HistoryColumns":
+        """Columnas a partir de filas (día, carga, fatiga) ya ordenadas por fecha."""
+        columns = cls()
+        for day, load, fatigue in rows:
+            columns.append(day, load, fatigue)
+        return columns
+
+    @classmethod
+    def from_entries(cls, entries) -> "HistoryColumns":
+        """Columnas a partir de entradas { 'date', 'load', 'inputs' } (se ordenan por fecha)."""
+        return cls.from_rows(
+            (entry["date"], entry["load"], entry.get("inputs", {}).get("fatigue"))
+            for entry in sorted(entries, key=lambda e: e["date"])
+        )
+
+    def rows(self):
+        """Recorre (día ordinal, carga, fatiga o None) en orden cronológico."""
+        for day, load, fatigue in zip(self.days, self.loads, self.fatigue):
+            yield day, load, None if math.isnan(fatigue) else fatigue
+
+    def to_numpy(self) -> tuple:
+        """(days, loads, fatigue) como arrays NumPy de solo lectura, sin copiar los datos."""
+        import numpy as np
+
+        arrays = (
+            np.frombuffer(self.days, dtype=np.int64),
+            np.frombuffer(self.loads, dtype=np.int64),
+            np.frombuffer(self.fatigue, dtype=np.float64),
+        )
+        for values in arrays:
+            values.setflags(write=False)
+        return arrays
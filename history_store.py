@@ -0,0 +1,334 @@
+"""
+Historial de entrenamiento — almacenamiento append-only
+=======================================================
+Cada registro semanal se guarda como una línea JSON (formato JSON Lines).
+Agregar una entrada es O(1): no se relee ni se reescribe el archivo completo,
+sin importar cuántas semanas de historial existan.
+
+Junto al historial se mantiene un índice (`<historial>.idx`) con el offset en
+bytes de cada registro, de modo que leer las últimas N entradas no requiere
+decodificar todo el archivo.
+
+Las escrituras toman un lock advisory (`<historial>.lock`), así varias sesiones
+o procesos pueden agregar entradas a la vez sin pisarse. Los archivos que se
+reescriben enteros (índice, migración) se generan en un temporal y se
+reemplazan con `os.replace`, de modo que nunca quedan a medias (ver
+`file_utils`).
+"""
+
+import json
+import os
+import queue
+import struct
+import threading
+from concurrent.futures import Future
+
+from file_utils import file_lock, write_atomic
+
+_OFFSET = struct.Struct("<Q")      # un offset de 8 bytes por registro en el índice
+_BLOCK_SIZE = 64 * 1024            # bloque de lectura hacia atrás sin índice
+
+
+# ─────────────────────────────────────────────
+# ESCRITURA
+# ─────────────────────────────────────────────
+
+def _encode_entry(entry) -> bytes:
+    """Serializa una entrada (dict o `HistoryEntry`) como una línea JSON compacta terminada en salto de línea."""
+    return (json.dumps(entry, ensure_ascii=False, separators=(",", ":"), default=dict) + "\n").encode("utf-8")
+
+
+def append_entry(path: str, entry: dict) -> None:
+    """
+    Agrega una entrada al final del historial y registra su offset en el índice.
+    Se hace fsync para que el registro sobreviva a un corte del proceso.
+    """
+    append_entries(path, [entry])
+
+
+def append_entries(path: str, entries: list) -> int:
+    """
+    Agrega varias entradas con un único lock y un único fsync.
+    Devuelve la cantidad de entradas escritas.
+    """
+    if not entries:
+        return 0
+    offsets = bytearray()
+    with file_lock(path), open(path, "ab") as f:
+        offset = os.fstat(f.fileno()).st_size
+        if not _index_is_current(path, offset):
+            offset = _repair_tail(f, path, offset)
+            rebuild_index(path)
+        for entry in entries:
+            line = _encode_entry(entry)
+            f.write(line)
+            offsets += _OFFSET.pack(offset)
+            offset += len(line)
+        f.flush()
+        os.fsync(f.fileno())
+        with open(index_path(path), "ab") as idx:
+            idx.write(offsets)
+    return len(entries)
+
+
+def _repair_tail(f, path: str, size: int) -> int:
+    """Cierra con salto de línea un último registro incompleto. Devuelve el nuevo tamaño."""
+    if size == 0:
+        return 0
+    with open(path, "rb") as r:
+        r.seek(size - 1)
+        if r.read(1) == b"\n":
+            return size
+    f.write(b"\n")
+    f.flush()
+    return size + 1
+
+
+# ─────────────────────────────────────────────
+# ESCRITURA CONCURRENTE (COLA CON AGRUPAMIENTO)
+# ─────────────────────────────────────────────
+
+class HistoryWriter:
+    """
+    Cola de escritura atendida por un único hilo escritor.
+
+    `submit` devuelve enseguida un Future, así la interfaz no espera al disco.
+    Las entradas que llegan mientras se escribe un lote se agrupan en el
+    siguiente, de modo que N clics simultáneos cuestan una sola transacción
+    (o un solo fsync) en lugar de N. `write_batch` recibe la lista de items.
+    """
+
+    _STOP = object()
+
+    def __init__(self, write_batch, max_batch: int = 256):
+        self._write_batch = write_batch
+        self._max_batch = max_batch
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="history-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, item) -> Future:
+        """Encola un item para escribir. El Future se resuelve cuando quedó guardado."""
+        future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def flush(self) -> None:
+        """Bloquea hasta que todo lo encolado hasta ahora esté escrito."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Escribe lo pendiente y detiene el hilo escritor."""
+        self._queue.put((self._STOP, None))
+        self._thread.join()
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            batch = [self._queue.get()]
+            while len(batch) < self._max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = any(item is self._STOP for item, _ in batch)
+            pending = [(item, future) for item, future in batch if item is not self._STOP]
+            try:
+                if pending:
+                    self._write_batch([item for item, _ in pending])
+            except Exception as exc:
+                for _, future in pending:
+                    future.set_exception(exc)
+            else:
+                for _, future in pending:
+                    future.set_result(None)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+
+# ─────────────────────────────────────────────
+# LECTURA
+# ─────────────────────────────────────────────
+
+def iter_history(path: str):
+    """
+    Recorre el historial entrada por entrada, sin cargarlo entero en memoria.
+    Las líneas corruptas (p. ej. una escritura interrumpida) se ignoran.
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, "rb") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def read_tail(path: str, n: int) -> list:
+    """
+    Devuelve las últimas `n` entradas (de la más antigua a la más reciente).
+
+    Con un índice vigente se salta directamente al offset del registro N desde
+    el final; si no, se lee el archivo por bloques desde el final. En ambos
+    casos solo se decodifican las entradas pedidas.
+    """
+    if n <= 0 or not os.path.exists(path):
+        return []
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        if _index_is_current(path, size):
+            count = count_entries(path)
+            if count == 0:
+                return []
+            # Si hay registros corruptos se retrocede un poco más hasta juntar `n`
+            k = n
+            while True:
+                start = _read_offset(index_path(path), max(0, count - k))
+                f.seek(start)
+                entries = _decode_lines(f.read(size - start).splitlines())
+                if len(entries) >= n or k >= count:
+                    return entries[-n:]
+                k += n - len(entries)
+
+        entries = []
+        for line in _iter_lines_reversed(f, size):
+            decoded = _decode_lines([line])
+            if decoded:
+                entries.append(decoded[0])
+                if len(entries) == n:
+                    break
+        return entries[::-1]
+
+
+def count_entries(path: str) -> int:
+    """Cantidad de registros según el índice (0 si no hay índice)."""
+    try:
+        return os.path.getsize(index_path(path)) // _OFFSET.size
+    except OSError:
+        return 0
+
+
+def _decode_lines(lines: list) -> list:
+    """Decodifica líneas JSON, ignorando vacías o corruptas."""
+    entries = []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            entries.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return entries
+
+
+def _iter_lines_reversed(f, size: int):
+    """Recorre las líneas de un archivo binario desde el final, por bloques."""
+    pos = size
+    remainder = b""
+    while pos > 0:
+        step = min(_BLOCK_SIZE, pos)
+        pos -= step
+        f.seek(pos)
+        chunk = f.read(step) + remainder
+        lines = chunk.split(b"\n")
+        # La primera línea del bloque puede estar incompleta: se completa en la próxima vuelta
+        remainder = lines.pop(0)
+        for line in reversed(lines):
+            yield line
+    if remainder:
+        yield remainder
+
+
+# ─────────────────────────────────────────────
+# ÍNDICE DE OFFSETS
+# ─────────────────────────────────────────────
+
+def index_path(path: str) -> str:
+    """Ruta del índice de offsets asociado a un historial."""
+    return path + ".idx"
+
+
+def _read_offset(idx_path: str, position: int) -> int:
+    """Lee el offset del registro número `position` del índice."""
+    with open(idx_path, "rb") as idx:
+        idx.seek(position * _OFFSET.size)
+        return _OFFSET.unpack(idx.read(_OFFSET.size))[0]
+
+
+def _index_is_current(path: str, size: int) -> bool:
+    """
+    Verifica en O(1) que el índice describe el archivo de `size` bytes:
+    el último offset debe apuntar al inicio de la última línea completa.
+    """
+    try:
+        idx_size = os.path.getsize(index_path(path))
+    except OSError:
+        return size == 0
+    if idx_size % _OFFSET.size:
+        return False
+    if idx_size == 0:
+        return size == 0
+    last = _read_offset(index_path(path), idx_size // _OFFSET.size - 1)
+    if last >= size:
+        return False
+    with open(path, "rb") as f:
+        start = max(0, last - 1)
+        f.seek(start)
+        tail = f.read(size - start)
+    if last > 0:
+        if tail[:1] != b"\n":
+            return False
+        tail = tail[1:]
+    return tail.endswith(b"\n") and tail.count(b"\n") == 1
+
+
+def rebuild_index(path: str) -> int:
+    """Reconstruye el índice recorriendo el historial una vez. Devuelve la cantidad de registros."""
+    offsets = bytearray()
+    count = 0
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            offset = 0
+            for line in f:
+                offsets += _OFFSET.pack(offset)
+                count += 1
+                offset += len(line)
+    write_atomic(index_path(path), [offsets])
+    return count
+
+
+# ─────────────────────────────────────────────
+# MIGRACIÓN DESDE EL FORMATO ANTERIOR
+# ─────────────────────────────────────────────
+
+def migrate_legacy_history(legacy_path: str, path: str) -> int:
+    """
+    Convierte una única vez el historial antiguo (un array JSON) a JSON Lines.
+
+    Solo actúa si existe el archivo antiguo y todavía no existe el nuevo.
+    El archivo antiguo no se modifica. Devuelve la cantidad de entradas migradas.
+    """
+    if os.path.exists(path) or not os.path.exists(legacy_path):
+        return 0
+    with file_lock(path):
+        # Otro proceso pudo haber migrado mientras se esperaba el lock
+        if os.path.exists(path):
+            return 0
+        try:
+            with open(legacy_path, "r", encoding="utf-8") as f:
+                history = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return 0
+        if not isinstance(history, list):
+            return 0
+
+        # Escribir en un temporal y renombrar: nunca queda un historial a medias
+        write_atomic(path, (_encode_entry(entry) for entry in history))
+        rebuild_index(path)
+    return len(history)
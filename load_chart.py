@@ -0,0 +1,104 @@
+"""
+Smart Football Trainer — datos del gráfico de carga
+===================================================
+Prepara la serie de carga de todo el historial de un jugador para graficarla:
+
+  - parte de los acumulados semanales o mensuales que `history_db` mantiene
+    al escribir (`load_rollup`), así que no recorre las entradas
+  - completa con 0 los períodos sin entradas
+  - calcula la banda ACWR: carga entre 0.8 y 1.3 veces el promedio de los
+    `CHRONIC_PERIODS` períodos anteriores (ACWR desacoplado)
+  - reduce la serie a lo sumo a `MAX_POINTS` puntos con LTTB
+    (largest-triangle-three-buckets), que conserva los picos y valles
+
+Así el navegador recibe unos cientos de puntos aunque haya años de historial.
+"""
+
+from workload import ACWR_SWEET_SPOT
+
+MAX_POINTS = 300
+CHRONIC_PERIODS = 4     # semanas (o meses) que forman la carga crónica
+
+
+def lttb(x, y, threshold: int):
+    """
+    Índices de los puntos elegidos por LTTB para reducir (x, y) a `threshold` puntos.
+    Conserva siempre el primero y el último. Si ya hay pocos puntos, devuelve todos.
+    """
+    import numpy as np
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # Baldes intermedios [edges[i], edges[i + 1]); el primer y el último punto van solos
+    every = (n - 2) / (threshold - 2)
+    edges = np.minimum(np.floor(np.arange(threshold) * every).astype(int) + 1, n)
+    selected = np.empty(threshold, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        # Promedio del balde siguiente (el último punto, para el último balde) como tercer vértice
+        avg_x = x[end:edges[i + 2]].mean()
+        avg_y = y[end:edges[i + 2]].mean()
+        # Área del triángulo (a, punto candidato, promedio siguiente)
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        selected[i + 1] = a
+    return selected
+
+
+def _period_index(starts, period: str):
+    """Número de período consecutivo de cada inicio de semana/mes (para rellenar huecos)."""
+    import numpy as np
+
+    dates = np.asarray(starts, dtype="datetime64[D]")
+    if period == "week":
+        return (dates - dates[0]).astype(int) // 7
+    months = dates.astype("datetime64[M]").astype(int)
+    return months - months[0]
+
+
+def load_series(rows, period: str = "week", max_points: int = MAX_POINTS):
+    """
+    Serie de carga lista para graficar a partir de filas (inicio ISO, carga)
+    ordenadas por fecha, como las devuelve `history_db.load_rollup`.
+
+    Devuelve un DataFrame con las columnas start, load, band_low y band_high
+    (NaN hasta tener `CHRONIC_PERIODS` períodos previos), de a lo sumo
+    `max_points` filas.
+    """
+    import numpy as np
+    import pandas as pd
+
+    rows = list(rows)
+    if not rows:
+        return pd.DataFrame(columns=["start", "load", "band_low", "band_high"])
+
+    starts, loads = zip(*rows)
+    index = _period_index(starts, period)
+    load = np.zeros(index[-1] + 1)
+    np.add.at(load, index, loads)
+    first = np.datetime64(starts[0][:10], "D")
+    if period == "week":
+        start = first + 7 * np.arange(len(load))
+    else:
+        start = (first.astype("datetime64[M]") + np.arange(len(load))).astype("datetime64[D]")
+
+    # Promedio de los períodos anteriores (sin incluir el actual)
+    cumsum = np.concatenate(([0.0], np.cumsum(load)))
+    chronic = np.full(len(load), np.nan)
+    chronic[CHRONIC_PERIODS:] = (cumsum[CHRONIC_PERIODS:-1] - cumsum[:-CHRONIC_PERIODS - 1]) / CHRONIC_PERIODS
+
+    keep = lttb(np.arange(len(load)), load, max_points)
+    low, high = ACWR_SWEET_SPOT
+    return pd.DataFrame({
+        "start": pd.to_datetime(start[keep]),
+        "load": load[keep],
+        "band_low": low * chronic[keep],
+        "band_high": high * chronic[keep],
+    })
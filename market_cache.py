@@ -0,0 +1,245 @@
+"""
+Top 20 Investables — caché persistente de datos de mercado
+==========================================================
+Caché en SQLite (modo WAL) de las respuestas de los proveedores de datos,
+por símbolo y grupo de campos (p. ej. 'fundamentals'), con la hora de
+descarga de cada entrada. Sobrevive a reinicios y deploys, y todos los
+procesos del servidor que abren el mismo archivo comparten las entradas.
+
+Política stale-while-revalidate:
+
+  - entrada vigente (más nueva que `ttl`): se devuelve sin descargar
+  - entrada vencida: se devuelve igual, al instante, y se encola una
+    actualización en segundo plano
+  - sin entrada, o vencida hace más de `max_stale`: se descarga en el
+    momento (si la descarga falla se usa la vencida, si existe)
+
+Antes de actualizar una entrada, el proceso la reserva en la base por
+`REFRESH_LEASE` segundos con un UPDATE condicional: entre todos los procesos
+y sesiones, solo uno la actualiza a la vez y los demás siguen sirviendo la
+copia vencida. Si la actualización falla, la reserva vence sola y se
+reintenta más tarde.
+
+`get_many` aplica la misma política a varios símbolos con una sola consulta
+en bloque para los faltantes y otra, en segundo plano, para los vencidos.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS market_cache (
+    symbol          TEXT NOT NULL,
+    field_group     TEXT NOT NULL,
+    payload         TEXT NOT NULL,
+    fetched_at      REAL NOT NULL,
+    invalidated     INTEGER NOT NULL DEFAULT 0,
+    refreshing_until REAL,
+    PRIMARY KEY (symbol, field_group)
+);
+"""
+
+BUSY_TIMEOUT = 30.0         # segundos de espera si otro proceso tiene la base bloqueada
+REFRESH_LEASE = 60.0        # segundos que un proceso reserva una entrada para actualizarla
+MAX_STALE = 24 * 3600       # más vencida que esto, se descarga en el momento
+REFRESH_WORKERS = 4         # actualizaciones en segundo plano simultáneas por proceso
+
+_UPSERT = (
+    "INSERT INTO market_cache (symbol, field_group, payload, fetched_at, refreshing_until) "
+    "VALUES (?, ?, ?, ?, NULL) "
+    "ON CONFLICT (symbol, field_group) DO UPDATE SET "
+    "payload = excluded.payload, fetched_at = excluded.fetched_at, invalidated = 0, refreshing_until = NULL"
+)
+_CLAIM = (
+    "UPDATE market_cache SET refreshing_until = ? "
+    "WHERE symbol = ? AND field_group = ? AND (fetched_at <= ? OR invalidated) "
+    "AND (refreshing_until IS NULL OR refreshing_until < ?)"
+)
+
+
+class MarketCache:
+    """
+    Caché persistente stale-while-revalidate.
+    `get(symbol, group, fetch, ttl)` devuelve el payload (dict) de la entrada.
+    """
+
+    def __init__(self, path: str, max_stale: float = MAX_STALE, workers: int = REFRESH_WORKERS):
+        self.path = path
+        self.max_stale = max_stale
+        self._conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        # La conexión se comparte entre las sesiones y los hilos de actualización
+        self._lock = threading.Lock()
+        self._refresher = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="market-refresh")
+        self._pending = {}   # (symbol, group) → actualización en curso en este proceso
+
+    # ── LECTURA ─────────────────────────────────────────────────
+
+    def get(self, symbol: str, group: str, fetch, ttl: float, refresh: bool = False) -> dict:
+        """
+        Payload de (symbol, group). `fetch(symbol)` descarga un payload nuevo
+        (dict serializable en JSON) y lanza una excepción si no puede.
+        Con `refresh=True` se descarga en el momento aunque la entrada esté vigente.
+        Sin entrada y con la descarga fallida, la excepción se propaga.
+        """
+        cached = self._row(symbol, group)
+        if cached is not None and not refresh:
+            payload, fetched_at, invalidated = cached
+            age = time.time() - fetched_at
+            if age < ttl and not invalidated:
+                return payload
+            if age < ttl + self.max_stale:
+                self._schedule_refresh(symbol, group, fetch, ttl)
+                return payload
+
+        try:
+            return self._fetch_and_store(symbol, group, fetch)
+        except Exception:
+            if cached is None:
+                raise
+            return cached[0]   # stale-if-error
+
+    def get_many(self, symbols, group: str, fetch_many, ttl: float, refresh: bool = False) -> dict:
+        """
+        Versión en bloque de `get`: {symbol: payload}. `fetch_many(symbols)`
+        descarga varios símbolos en una sola consulta y devuelve un dict (los
+        que fallan no aparecen). Las entradas faltantes se descargan juntas en
+        el momento y las vencidas, juntas en segundo plano. Un símbolo sin
+        entrada y sin respuesta no aparece en el resultado.
+        """
+        results, missing, stale = {}, [], []
+        fallback = {}
+        now = time.time()
+        for symbol in symbols:
+            cached = self._row(symbol, group)
+            if cached is None:
+                missing.append(symbol)
+                continue
+            payload, fetched_at, invalidated = cached
+            age = now - fetched_at
+            if refresh or age >= ttl + self.max_stale:
+                missing.append(symbol)
+                fallback[symbol] = payload   # stale-if-error
+            else:
+                results[symbol] = payload
+                if age >= ttl or invalidated:
+                    stale.append(symbol)
+
+        if missing:
+            try:
+                fetched = fetch_many(missing)
+            except Exception:
+                fetched = {}
+            self.put_many(group, fetched)
+            results.update(fallback)
+            results.update(fetched)
+
+        claimed = [symbol for symbol in stale if self._claim(symbol, group, ttl)]
+        if claimed:
+            key = (tuple(claimed), group)
+            with self._lock:
+                self._pending[key] = self._refresher.submit(self._refresh_many, key, fetch_many)
+        return results
+
+    def lookup(self, symbol: str, group: str):
+        """(payload, hora de descarga) de la entrada, o None si no existe."""
+        row = self._row(symbol, group)
+        return None if row is None else row[:2]
+
+    def _row(self, symbol: str, group: str):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, fetched_at, invalidated FROM market_cache WHERE symbol = ? AND field_group = ?",
+                (symbol, group),
+            ).fetchone()
+        return None if row is None else (json.loads(row[0]), row[1], bool(row[2]))
+
+    # ── ESCRITURA ───────────────────────────────────────────────
+
+    def put(self, symbol: str, group: str, payload: dict, fetched_at: float = None) -> None:
+        """Guarda un payload (y libera la reserva de actualización de la entrada)."""
+        with self._lock, self._conn:
+            self._conn.execute(_UPSERT, (symbol, group, json.dumps(payload), fetched_at or time.time()))
+
+    def put_many(self, group: str, payloads: dict, fetched_at: float = None) -> None:
+        """Guarda {symbol: payload} de un grupo en una sola transacción."""
+        fetched_at = fetched_at or time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(_UPSERT, [
+                (symbol, group, json.dumps(payload), fetched_at) for symbol, payload in payloads.items()
+            ])
+
+    def invalidate(self, symbol: str = None, group: str = None) -> int:
+        """
+        Marca como vencidas (sin borrarlas) las entradas del símbolo y/o grupo, o
+        todas: se siguen sirviendo mientras se actualizan en segundo plano.
+        """
+        where, params = [], []
+        for column, value in (("symbol", symbol), ("field_group", group)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                params.append(value)
+        sql = "UPDATE market_cache SET invalidated = 1"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        with self._lock, self._conn:
+            return self._conn.execute(sql, params).rowcount
+
+    def _fetch_and_store(self, symbol: str, group: str, fetch) -> dict:
+        payload = fetch(symbol)
+        self.put(symbol, group, payload)
+        return payload
+
+    # ── ACTUALIZACIÓN EN SEGUNDO PLANO ──────────────────────────
+
+    def _claim(self, symbol: str, group: str, ttl: float) -> bool:
+        """Reserva la entrada vencida para este proceso. False si ya está vigente o reservada."""
+        now = time.time()
+        with self._lock, self._conn:
+            return self._conn.execute(_CLAIM, (now + REFRESH_LEASE, symbol, group, now - ttl, now)).rowcount == 1
+
+    def _schedule_refresh(self, symbol: str, group: str, fetch, ttl: float) -> None:
+        key = (symbol, group)
+        with self._lock:
+            if key in self._pending:
+                return
+        if not self._claim(symbol, group, ttl):
+            return
+        with self._lock:
+            self._pending[key] = self._refresher.submit(self._refresh, key, fetch)
+
+    def _refresh(self, key: tuple, fetch) -> None:
+        try:
+            self._fetch_and_store(*key, fetch)
+        except Exception:
+            pass   # se sigue sirviendo la entrada vencida; la reserva vence y se reintenta
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def _refresh_many(self, key: tuple, fetch_many) -> None:
+        symbols, group = key
+        try:
+            self.put_many(group, fetch_many(list(symbols)))
+        except Exception:
+            pass   # las reservas de los que no se actualizaron vencen solas
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def wait(self) -> None:
+        """Espera a que terminen las actualizaciones en segundo plano encoladas hasta ahora."""
+        with self._lock:
+            futures = list(self._pending.values())
+        wait(futures)
+
+    def close(self) -> None:
+        """Termina las actualizaciones pendientes y cierra la base."""
+        self._refresher.shutdown(wait=True)
+        with self._lock:
+            self._conn.close()
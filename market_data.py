@@ -0,0 +1,43 @@
+"""
+Top 20 Investables — descarga de datos de mercado
+=================================================
+Descarga los datos de varias acciones en paralelo, con un límite de
+solicitudes simultáneas, y entrega cada resultado apenas llega (en el orden
+en que terminan, no en el de la lista). Así la carga en frío tarda
+aproximadamente lo que la solicitud más lenta, en lugar de la suma de todas,
+y la barra de progreso avanza con cada respuesta.
+
+    for i, symbol, row in fetch_concurrently(symbols, fetch_stock_data):
+        ...
+"""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+FETCH_CONCURRENCY = 20      # solicitudes simultáneas por defecto (todo el universo a la vez)
+
+
+def fetch_concurrently(symbols, fetch, max_workers: int = FETCH_CONCURRENCY, initializer=None):
+    """
+    Ejecuta `fetch(symbol)` para cada símbolo con a lo sumo `max_workers` a la vez.
+
+    Genera (índice en `symbols`, symbol, resultado) a medida que terminan.
+    `initializer` se ejecuta al crear cada hilo (p. ej. para asociarle el
+    contexto de Streamlit). Si una descarga lanza una excepción, se cancelan
+    las pendientes y la excepción se propaga.
+    """
+    symbols = list(symbols)
+    if max_workers < 1:
+        raise ValueError(f"max_workers debe ser >= 1 (recibido {max_workers})")
+    if not symbols:
+        return
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(symbols)), initializer=initializer,
+                            thread_name_prefix="market-fetch") as pool:
+        futures = {pool.submit(fetch, symbol): i for i, symbol in enumerate(symbols)}
+        try:
+            for future in as_completed(futures):
+                i = futures[future]
+                yield i, symbols[i], future.result()
+        finally:
+            for future in futures:
+                future.cancel()
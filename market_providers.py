@@ -0,0 +1,506 @@
+"""
+Top 20 Investables — proveedores de datos de mercado
+====================================================
+Interfaz común para obtener precio, fundamentales e historial de precios,
+de a un símbolo o en bloque, y tres implementaciones:
+
+  - `YFinanceProvider`: Yahoo Finance (yfinance), la fuente real
+  - `RecordReplayProvider`: envuelve a otro proveedor y guarda cada
+    respuesta como fixture JSON ('record'), o responde solo desde los
+    fixtures guardados ('replay'), sin red. El historial se guarda en un
+    fixture por símbolo que acumula todas las barras grabadas y se recorta
+    al rango pedido al reproducirlo
+  - `SyntheticProvider`: datos sintéticos deterministas por semilla, con
+    latencia y tasa de errores configurables
+
+Los payloads son dicts serializables en JSON con los nombres de campo de
+yfinance:
+
+    price          { currentPrice, regularMarketPrice, previousClose }
+    fundamentals   { targetMeanPrice, trailingPE, pegRatio, returnOnEquity, dividendYield }
+    history        { date: [ISO], open: [...], high, low, close, volume }
+
+Un proveedor que no puede responder lanza `ProviderError` (o la excepción
+de la fuente). En las versiones en bloque, los símbolos que fallan no
+aparecen en el resultado.
+
+El precio es la consulta liviana (se actualiza seguido, conviene pedirlo en
+bloque con `prices`); los fundamentales son la pesada y cambian poco.
+
+    provider = make_provider("synthetic")            # o "yfinance", "replay", "record"
+    provider.price("AAPL")
+"""
+
+import abc
+import hashlib
+import json
+import math
+import os
+import random
+import threading
+import time
+from datetime import date, timedelta
+
+from file_utils import write_atomic
+
+PRICE_FIELDS = ("currentPrice", "regularMarketPrice", "previousClose")
+FUNDAMENTAL_FIELDS = ("targetMeanPrice", "trailingPE", "pegRatio", "returnOnEquity", "dividendYield")
+HISTORY_COLUMNS = ("open", "high", "low", "close", "volume")
+HISTORY_DAYS = 365          # historial por defecto: el último año
+PRICE_PERIOD = "5d"         # ventana de cierres diarios de la que salen precio y cierre anterior
+_SYNTHETIC_EPOCH = date(2024, 1, 1).toordinal()   # nivel base de los precios sintéticos
+
+PROVIDERS = ("yfinance", "synthetic", "record", "replay")
+DEFAULT_FIXTURES_DIR = "fixtures/market"
+
+
+class ProviderError(Exception):
+    """El proveedor no pudo responder para un símbolo."""
+
+
+def _history_range(start, end) -> tuple:
+    """(start, end) como fechas; por defecto los últimos `HISTORY_DAYS` días hasta hoy (incluido)."""
+    end = date.fromisoformat(end) if isinstance(end, str) else end or date.today()
+    start = date.fromisoformat(start) if isinstance(start, str) else start or end - timedelta(days=HISTORY_DAYS)
+    if start > end:
+        raise ValueError(f"start ({start}) posterior a end ({end})")
+    return start, end
+
+
+def _slice_history(history: dict, start: date, end: date) -> dict:
+    """Barras del payload de historial con fecha entre `start` y `end` (ambos incluidos)."""
+    first, last = start.isoformat(), end.isoformat()
+    keep = [i for i, day in enumerate(history["date"]) if first <= day <= last]
+    return {"date": [history["date"][i] for i in keep],
+            **{column: [history[column][i] for i in keep] for column in HISTORY_COLUMNS}}
+
+
+def _merge_histories(old: dict, new: dict) -> dict:
+    """Unión de dos payloads de historial por fecha; en las fechas repetidas gana `new`."""
+    bars = {}
+    for history in (old, new):
+        for i, day in enumerate(history["date"]):
+            bars[day] = [history[column][i] for column in HISTORY_COLUMNS]
+    days = sorted(bars)
+    return {"date": days, **{column: [bars[day][j] for day in days] for j, column in enumerate(HISTORY_COLUMNS)}}
+
+
+# ─────────────────────────────────────────────
+# INTERFAZ
+# ─────────────────────────────────────────────
+
+class MarketDataProvider(abc.ABC):
+    """
+    Interfaz de los proveedores. Las subclases implementan `price`,
+    `fundamentals` y `history`; las versiones en bloque recorren los símbolos
+    de a uno salvo que la fuente tenga una consulta múltiple.
+    """
+
+    name = "base"
+
+    @abc.abstractmethod
+    def price(self, symbol: str) -> dict:
+        """Precio actual y cierre anterior (campos de `PRICE_FIELDS`)."""
+
+    @abc.abstractmethod
+    def fundamentals(self, symbol: str) -> dict:
+        """Fundamentales (campos de `FUNDAMENTAL_FIELDS`)."""
+
+    @abc.abstractmethod
+    def history(self, symbol: str, start=None, end=None) -> dict:
+        """Barras diarias OHLCV entre `start` y `end` (fechas o ISO, ambos incluidos)."""
+
+    def quote(self, symbol: str) -> dict:
+        """Precio y fundamentales juntos."""
+        return {**self.price(symbol), **self.fundamentals(symbol)}
+
+    # ── EN BLOQUE ───────────────────────────────────────────────
+
+    def prices(self, symbols) -> dict:
+        return self._each(self.price, symbols)
+
+    def fundamentals_many(self, symbols) -> dict:
+        return self._each(self.fundamentals, symbols)
+
+    def histories(self, symbols, start=None, end=None) -> dict:
+        return self._each(lambda symbol: self.history(symbol, start, end), symbols)
+
+    @staticmethod
+    def _each(fetch, symbols) -> dict:
+        results = {}
+        for symbol in symbols:
+            try:
+                results[symbol] = fetch(symbol)
+            except Exception:
+                continue
+        return results
+
+
+# ─────────────────────────────────────────────
+# YAHOO FINANCE
+# ─────────────────────────────────────────────
+
+class YFinanceProvider(MarketDataProvider):
+    """Datos reales de Yahoo Finance (requiere `yfinance` y acceso a la red)."""
+
+    name = "yfinance"
+
+    def _info(self, symbol: str) -> dict:
+        """`Ticker.info` completo: decenas de campos, la consulta más pesada de yfinance."""
+        import yfinance as yf
+
+        info = yf.Ticker(symbol).info
+        if not info:
+            raise ProviderError(f"yfinance no devolvió datos para {symbol}")
+        return info
+
+    def price(self, symbol: str) -> dict:
+        prices = self.prices([symbol])
+        if symbol not in prices:
+            raise ProviderError(f"yfinance no devolvió precio para {symbol}")
+        return prices[symbol]
+
+    def prices(self, symbols) -> dict:
+        """
+        Últimos cierres diarios de todos los símbolos en una sola descarga
+        (`yf.download`), sin pasar por `Ticker.info`: el último es el precio
+        actual (durante la sesión, el de la barra en curso) y el anterior, el
+        cierre previo.
+        """
+        import yfinance as yf
+
+        symbols = list(symbols)
+        frame = yf.download(symbols, period=PRICE_PERIOD, interval="1d", group_by="ticker",
+                            auto_adjust=False, progress=False, threads=True)
+        results = {}
+        for symbol in symbols:
+            if frame is None or symbol not in frame.columns.get_level_values(0):
+                continue
+            closes = frame[symbol]["Close"].dropna()
+            if closes.empty:
+                continue
+            last = float(closes.iloc[-1])
+            results[symbol] = {"currentPrice": last, "regularMarketPrice": last,
+                               "previousClose": float(closes.iloc[-2]) if len(closes) > 1 else None}
+        return results
+
+    def fundamentals(self, symbol: str) -> dict:
+        info = self._info(symbol)
+        return {field: info.get(field) for field in FUNDAMENTAL_FIELDS}
+
+    def quote(self, symbol: str) -> dict:
+        info = self._info(symbol)   # una sola consulta para ambos grupos
+        return {**self._price_fields(symbol, info), **{field: info.get(field) for field in FUNDAMENTAL_FIELDS}}
+
+    @staticmethod
+    def _price_fields(symbol: str, info: dict) -> dict:
+        data = {field: info.get(field) for field in PRICE_FIELDS}
+        if not any(data.values()):
+            raise ProviderError(f"yfinance no devolvió precio para {symbol}")
+        return data
+
+    def history(self, symbol: str, start=None, end=None) -> dict:
+        return self.histories([symbol], start, end)[symbol]
+
+    def histories(self, symbols, start=None, end=None) -> dict:
+        """Una sola descarga para todos los símbolos (`yf.download`)."""
+        import yfinance as yf
+
+        symbols = list(symbols)
+        start, end = _history_range(start, end)
+        frame = yf.download(symbols, start=start.isoformat(), end=(end + timedelta(days=1)).isoformat(),
+                            group_by="ticker", auto_adjust=True, progress=False, threads=True)
+        results = {}
+        for symbol in symbols:
+            if frame is None or symbol not in frame.columns.get_level_values(0):
+                continue
+            bars = frame[symbol].dropna(how="all")
+            if not bars.empty:
+                results[symbol] = _frame_to_history(bars)
+        if len(symbols) == 1 and not results:
+            raise ProviderError(f"yfinance no devolvió historial para {symbols[0]}")
+        return results
+
+
+def _frame_to_history(frame) -> dict:
+    """DataFrame OHLCV de yfinance (índice de fechas) → payload de historial."""
+    columns = {column.lower(): column for column in frame.columns}
+    history = {"date": [ts.date().isoformat() for ts in frame.index]}
+    for column in HISTORY_COLUMNS:
+        values = frame[columns[column]].tolist()
+        history[column] = [None if v != v else (int(v) if column == "volume" else float(v)) for v in values]
+    return history
+
+
+# ─────────────────────────────────────────────
+# GRABACIÓN Y REPRODUCCIÓN
+# ─────────────────────────────────────────────
+
+class RecordReplayProvider(MarketDataProvider):
+    """
+    En modo 'record' reenvía cada consulta a `inner` y guarda la respuesta
+    (o el error) como fixture JSON en `fixtures_dir`; en modo 'replay'
+    responde solo desde los fixtures, sin red, y lanza `ProviderError` si
+    falta alguno. Un error grabado se reproduce como `ProviderError`.
+
+    El historial tiene un solo fixture por símbolo: cada grabación agrega sus
+    barras a las ya guardadas (un error no borra las barras grabadas) y la
+    reproducción devuelve las que caen en el rango pedido, así que los
+    fixtures siguen sirviendo cuando cambia la fecha de hoy.
+    """
+
+    name = "replay"
+
+    def __init__(self, fixtures_dir: str = DEFAULT_FIXTURES_DIR, inner: MarketDataProvider = None,
+                 mode: str = "replay"):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"modo desconocido: {mode!r} (record o replay)")
+        if mode == "record" and inner is None:
+            raise ValueError("el modo 'record' necesita un proveedor `inner`")
+        self.fixtures_dir = fixtures_dir
+        self.inner = inner
+        self.mode = mode
+        self.name = mode
+        self._lock = threading.Lock()    # grabaciones de historial: leer, unir y guardar
+
+    def fixture_path(self, kind: str, symbol: str) -> str:
+        """Ruta del fixture de una consulta: <dir>/<kind>/<symbol>.json."""
+        return os.path.join(self.fixtures_dir, kind, f"{symbol}.json")
+
+    def _replay(self, kind: str, symbol: str) -> dict:
+        """Payload grabado; `ProviderError` si no hay fixture o si se grabó un error."""
+        path = self.fixture_path(kind, symbol)
+        try:
+            with open(path, encoding="utf-8") as f:
+                recorded = json.load(f)
+        except FileNotFoundError:
+            raise ProviderError(f"sin fixture para {kind} {symbol}: {path}") from None
+        if "error" in recorded:
+            raise ProviderError(recorded["error"])
+        return recorded["payload"]
+
+    def _call(self, kind: str, symbol: str, fetch) -> dict:
+        if self.mode == "replay":
+            return self._replay(kind, symbol)
+
+        path = self.fixture_path(kind, symbol)
+        try:
+            payload = fetch()
+        except Exception as exc:
+            self._save(path, {"error": f"{type(exc).__name__}: {exc}"})
+            raise
+        self._save(path, {"payload": payload})
+        return payload
+
+    @staticmethod
+    def _save(path: str, recorded: dict) -> None:
+        """Escribe el fixture de forma atómica (`file_utils.write_atomic`)."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_atomic(path, [json.dumps(recorded, ensure_ascii=False, indent=1).encode("utf-8")])
+
+    def price(self, symbol: str) -> dict:
+        return self._call("price", symbol, lambda: self.inner.price(symbol))
+
+    def prices(self, symbols) -> dict:
+        symbols = list(symbols)
+        if self.mode == "replay":
+            return super().prices(symbols)
+        return self._record_many("price", symbols, self.inner.prices(symbols))
+
+    def fundamentals(self, symbol: str) -> dict:
+        return self._call("fundamentals", symbol, lambda: self.inner.fundamentals(symbol))
+
+    def quote(self, symbol: str) -> dict:
+        return self._call("quote", symbol, lambda: self.inner.quote(symbol))
+
+    def history(self, symbol: str, start=None, end=None) -> dict:
+        start, end = _history_range(start, end)
+        if self.mode == "replay":
+            return _slice_history(self._replay("history", symbol), start, end)
+        try:
+            payload = self.inner.history(symbol, start, end)
+        except Exception as exc:
+            self._record_history(symbol, error=f"{type(exc).__name__}: {exc}")
+            raise
+        self._record_history(symbol, payload)
+        return payload
+
+    def histories(self, symbols, start=None, end=None) -> dict:
+        symbols = list(symbols)
+        start, end = _history_range(start, end)
+        if self.mode == "replay":
+            return super().histories(symbols, start, end)
+        return self._record_many("history", symbols, self.inner.histories(symbols, start, end))
+
+    def _record_many(self, kind: str, symbols: list, results: dict) -> dict:
+        """Graba la respuesta de una consulta en bloque real como fixtures por símbolo."""
+        for symbol in symbols:
+            error = None if symbol in results else f"ProviderError: sin {kind} para {symbol}"
+            if kind == "history":
+                self._record_history(symbol, results.get(symbol), error)
+            elif error:
+                self._save(self.fixture_path(kind, symbol), {"error": error})
+            else:
+                self._save(self.fixture_path(kind, symbol), {"payload": results[symbol]})
+        return results
+
+    def _record_history(self, symbol: str, payload: dict = None, error: str = None) -> None:
+        """Agrega las barras al fixture de historial del símbolo; el error solo se graba si no tenía barras."""
+        path = self.fixture_path("history", symbol)
+        with self._lock:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    recorded = json.load(f).get("payload")
+            except FileNotFoundError:
+                recorded = None
+            if payload is not None:
+                self._save(path, {"payload": _merge_histories(recorded, payload) if recorded else payload})
+            elif recorded is None:
+                self._save(path, {"error": error})
+
+
+# ─────────────────────────────────────────────
+# DATOS SINTÉTICOS
+# ─────────────────────────────────────────────
+
+class SyntheticProvider(MarketDataProvider):
+    """
+    Datos sintéticos deterministas: los valores dependen solo de la semilla y
+    el símbolo. `latency` (segundos, o rango (mín, máx) fijo por símbolo) se
+    espera en cada consulta; puede ser también un dict por tipo de consulta,
+    p. ej. {"price": 0.02, "fundamentals": (0.2, 0.6)} (los tipos que no
+    figuran no esperan). `prices` e `histories` simulan una consulta en
+    bloque: esperan una sola vez, la latencia del símbolo más lento. `error_rate` es la
+    probabilidad de que una consulta falle con `ProviderError` (la secuencia
+    de fallos de cada símbolo también depende solo de la semilla).
+    """
+
+    name = "synthetic"
+
+    def __init__(self, latency=0.0, error_rate: float = 0.0, seed: int = 0):
+        if not 0.0 <= error_rate <= 1.0:
+            raise ValueError(f"error_rate debe estar entre 0 y 1 (recibido {error_rate})")
+        self.latency = latency
+        self.error_rate = error_rate
+        self.seed = seed
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def _rng(self, *key) -> random.Random:
+        digest = hashlib.blake2b(repr((self.seed,) + key).encode(), digest_size=8).digest()
+        return random.Random(int.from_bytes(digest, "big"))
+
+    def latency_of(self, symbol: str, kind: str = None) -> float:
+        """Latencia (s) de cada consulta `kind` del símbolo."""
+        latency = self.latency.get(kind, 0.0) if isinstance(self.latency, dict) else self.latency
+        if isinstance(latency, (tuple, list)):
+            return self._rng("latency", symbol).uniform(*latency)
+        return latency
+
+    def _request(self, kind: str, symbol: str) -> None:
+        """Simula la consulta: espera la latencia y falla según `error_rate`."""
+        delay = self.latency_of(symbol, kind)
+        if delay:
+            time.sleep(delay)
+        self._check_error(kind, symbol)
+
+    def _check_error(self, kind: str, symbol: str) -> None:
+        with self._lock:
+            n = self._calls[kind, symbol] = self._calls.get((kind, symbol), 0) + 1
+        if self.error_rate and self._rng("error", kind, symbol, n).random() < self.error_rate:
+            raise ProviderError(f"error simulado en {kind} {symbol} (consulta {n})")
+
+    def calls(self) -> int:
+        """Consultas recibidas hasta ahora."""
+        with self._lock:
+            return sum(self._calls.values())
+
+    def _base_price(self, symbol: str) -> float:
+        return round(self._rng("price", symbol).uniform(20, 1000), 2)
+
+    def price(self, symbol: str) -> dict:
+        self._request("price", symbol)
+        return self._price_payload(symbol)
+
+    def prices(self, symbols) -> dict:
+        return self._bulk("price", symbols, self._price_payload)
+
+    def _bulk(self, kind: str, symbols, payload) -> dict:
+        """Una sola espera para todos los símbolos; los que fallan no aparecen."""
+        symbols = list(symbols)
+        delay = max((self.latency_of(symbol, kind) for symbol in symbols), default=0.0)
+        if delay:
+            time.sleep(delay)
+        results = {}
+        for symbol in symbols:
+            try:
+                self._check_error(kind, symbol)
+            except ProviderError:
+                continue
+            results[symbol] = payload(symbol)
+        return results
+
+    def _price_payload(self, symbol: str) -> dict:
+        base = self._base_price(symbol)
+        return {"currentPrice": base, "regularMarketPrice": base,
+                "previousClose": round(base * self._rng("prev", symbol).uniform(0.97, 1.03), 2)}
+
+    def fundamentals(self, symbol: str) -> dict:
+        self._request("fundamentals", symbol)
+        rng = self._rng("fundamentals", symbol)
+        return {
+            "targetMeanPrice": round(self._base_price(symbol) * rng.uniform(0.85, 1.4), 2),
+            "trailingPE": round(rng.uniform(8, 80), 2),
+            "pegRatio": round(rng.uniform(0.5, 4), 2),
+            "returnOnEquity": round(rng.uniform(0.02, 1.2), 4),
+            "dividendYield": round(rng.choice([0.0, rng.uniform(0.002, 0.04)]), 4),
+        }
+
+    def history(self, symbol: str, start=None, end=None) -> dict:
+        """Barras de días hábiles alrededor de una tendencia; cada fecha tiene siempre la misma barra."""
+        self._request("history", symbol)
+        return self._history_payload(symbol, *_history_range(start, end))
+
+    def histories(self, symbols, start=None, end=None) -> dict:
+        start, end = _history_range(start, end)
+        return self._bulk("history", symbols, lambda symbol: self._history_payload(symbol, start, end))
+
+    def _history_payload(self, symbol: str, start: date, end: date) -> dict:
+        history = {"date": [], **{column: [] for column in HISTORY_COLUMNS}}
+        day = start
+        while day <= end:
+            if day.weekday() < 5:
+                rng = self._rng("bar", symbol, day.toordinal())
+                # Nivel de la fecha: tendencia suave + ciclo anual, independiente del rango pedido
+                years = (day.toordinal() - _SYNTHETIC_EPOCH) / 365.0
+                close = self._base_price(symbol) * math.exp(0.08 * years + 0.1 * math.sin(2 * math.pi * years))
+                close *= rng.uniform(0.98, 1.02)
+                open_ = close * rng.uniform(0.985, 1.015)
+                history["date"].append(day.isoformat())
+                history["open"].append(round(open_, 2))
+                history["high"].append(round(max(open_, close) * rng.uniform(1.0, 1.02), 2))
+                history["low"].append(round(min(open_, close) * rng.uniform(0.98, 1.0), 2))
+                history["close"].append(round(close, 2))
+                history["volume"].append(rng.randint(1_000_000, 50_000_000))
+            day += timedelta(days=1)
+        return history
+
+
+# ─────────────────────────────────────────────
+# FÁBRICA
+# ─────────────────────────────────────────────
+
+def make_provider(kind: str = "yfinance", fixtures_dir: str = DEFAULT_FIXTURES_DIR, **options) -> MarketDataProvider:
+    """
+    Proveedor por nombre: 'yfinance', 'synthetic' (acepta latency, error_rate,
+    seed), 'record' (yfinance grabando fixtures) o 'replay' (solo fixtures).
+    """
+    if kind == "yfinance":
+        return YFinanceProvider()
+    if kind == "synthetic":
+        return SyntheticProvider(**options)
+    if kind == "record":
+        return RecordReplayProvider(fixtures_dir, YFinanceProvider(), mode="record")
+    if kind == "replay":
+        return RecordReplayProvider(fixtures_dir, mode="replay")
+    raise ValueError(f"proveedor desconocido: {kind!r} (opciones: {', '.join(PROVIDERS)})")
@@ -0,0 +1,131 @@
+"""
+Smart Football Trainer — planificador de mesociclo
+==================================================
+Encadena de 4 a 16 semanas de plan. Cada semana admite varios partidos y
+su carga prevista (minutos × fatiga) se limita a un aumento máximo del 20%
+respecto de la semana anterior: la misma regla que dispara la advertencia
+de sobrecarga en la app. En una semana limitada, las sesiones con carga
+reducen volumen e intensidad en proporción a carga permitida / carga prevista.
+
+Cuando cambian los datos de una semana solo se vuelve a planificar esa
+semana y las siguientes cuya carga final cambia como consecuencia; en cuanto
+una semana queda igual que antes, la propagación se detiene.
+
+Los planes salen de las reglas compartidas (`plan_rules.default_rules`), así
+que cada semana expone sus días con el mismo formato que en la app
+({ 'day', 'type', 'detail', 'intensity' }) y el renderizado de tarjetas
+sirve sin cambios.
+"""
+
+from functools import lru_cache
+
+from plan_rules import default_rules
+from trainer_core import calculate_load, make_session
+
+MIN_WEEKS = 4
+MAX_WEEKS = 16
+MAX_WEEKLY_INCREASE = 0.20
+CAP_NOTE = " [Vol. -{pct}%: progresión semanal máx. +20%]"
+
+_WEEK_FIELDS = ("matches", "fatigue", "objective", "minutes")
+
+
+def week_inputs(matches=(), fatigue: int = 2, objective: str = "Mantener", minutes: int = 60) -> dict:
+    """Datos de una semana del mesociclo: días de partido, fatiga, objetivo y minutos previstos."""
+    return {"matches": tuple(matches), "fatigue": fatigue, "objective": objective, "minutes": minutes}
+
+
+@lru_cache(maxsize=1024)
+def _capped_plan(matches: tuple, fatigue: int, objective: str, scale: float) -> tuple:
+    """
+    Plan de la semana con las sesiones con carga escaladas por `scale` (carga
+    permitida / carga prevista): como en el ajuste por fatiga alta, la nota
+    indica el recorte de volumen y la intensidad baja en la misma proporción
+    (mínimo 1). Los partidos no se recortan, y las sesiones cuya intensidad
+    no cambia quedan sin nota.
+    """
+    note = CAP_NOTE.format(pct=round((1 - scale) * 100))
+    plan = []
+    for session in default_rules().plan(matches, fatigue, objective):
+        intensity = max(1, round(session["intensity"] * scale))
+        if session["day"] not in matches and session["intensity"] > 1 and intensity != session["intensity"]:
+            session = make_session(**{**session, "intensity": intensity, "detail": session["detail"] + note})
+        plan.append(session)
+    return tuple(plan)
+
+
+class MesocyclePlanner:
+    """
+    Plan de varias semanas con re-planificación incremental.
+
+    `weeks` es una lista de dicts con las claves de `week_inputs`.
+    `previous_load` es la carga de la semana anterior al bloque (si se conoce),
+    para aplicar el límite de progresión ya a la primera semana.
+    """
+
+    def __init__(self, weeks: list, previous_load: int = None):
+        if not MIN_WEEKS <= len(weeks) <= MAX_WEEKS:
+            raise ValueError(f"el mesociclo debe tener entre {MIN_WEEKS} y {MAX_WEEKS} semanas")
+        self._inputs = [week_inputs(**week) for week in weeks]
+        self._previous_load = previous_load
+        self._weeks = [None] * len(weeks)
+        self._replan_from(0)
+
+    @property
+    def weeks(self) -> list:
+        """Semanas planificadas: { 'week', 'inputs', 'target_load', 'load', 'capped', 'plan' }."""
+        return list(self._weeks)
+
+    def iter_days(self):
+        """Recorre (número de semana, sesión) de todo el bloque, en orden."""
+        for week in self._weeks:
+            for session in week["plan"]:
+                yield week["week"], session
+
+    def update_week(self, index: int, **changes) -> list:
+        """
+        Cambia los datos de una semana y re-planifica solo lo afectado.
+        Devuelve los índices de las semanas que se volvieron a planificar.
+        """
+        if not 0 <= index < len(self._inputs):
+            raise ValueError(f"semana fuera de rango: {index} (el mesociclo tiene {len(self._inputs)})")
+        unknown = set(changes) - set(_WEEK_FIELDS)
+        if unknown:
+            raise ValueError(f"campos desconocidos: {sorted(unknown)}")
+        self._inputs[index] = week_inputs(**{**self._inputs[index], **changes})
+        return self._replan_from(index)
+
+    def _replan_from(self, start: int) -> list:
+        """Planifica desde `start` hasta que una semana siguiente no cambie."""
+        prev_load = self._weeks[start - 1]["load"] if start > 0 else self._previous_load
+        replanned = []
+        for i in range(start, len(self._inputs)):
+            week = self._plan_week(i, prev_load)
+            old = self._weeks[i]
+            if i > start and old is not None and (old["load"], old["capped"]) == (week["load"], week["capped"]):
+                break
+            self._weeks[i] = week
+            replanned.append(i)
+            prev_load = week["load"]
+        return replanned
+
+    def _plan_week(self, i: int, prev_load) -> dict:
+        """Plan y carga de la semana `i` dada la carga final de la semana anterior."""
+        inputs = self._inputs[i]
+        target = calculate_load(inputs["minutes"], inputs["fatigue"])
+        load, capped = target, False
+        if prev_load:
+            limit = int(prev_load * (1 + MAX_WEEKLY_INCREASE))
+            if target > limit:
+                load, capped = limit, True
+
+        key = (inputs["matches"], inputs["fatigue"], inputs["objective"])
+        plan = _capped_plan(*key, round(load / target, 2)) if capped else default_rules().plan(*key)
+        return {
+            "week": i + 1,
+            "inputs": dict(inputs),
+            "target_load": target,
+            "load": load,
+            "capped": capped,
+            "plan": plan,
+        }
@@ -0,0 +1,200 @@
+"""
+Smart Football Trainer — exportación de planes (iCalendar / CSV / zip)
+=====================================================================
+Exporta planes semanales para un jugador o para toda una plantilla:
+
+  - `.ics`: un evento de día completo por cada día que no es de descanso,
+    con el tipo como título y el detalle e intensidad como descripción
+  - `.csv`: una fila por jugador y día (athlete_id, date, day, type,
+    detail, intensity)
+  - `.zip`: un archivo por jugador
+
+Todo se escribe de forma incremental en la ruta o el archivo abierto que se
+indique (también un `io.StringIO`/`BytesIO` como buffer de descarga): los
+planes se consumen de un iterable de pares (athlete_id, plan) y nunca se
+arma el documento completo en memoria.
+
+Ejecutar:
+    python -m plan_export plantilla.csv planes.ics|planes.csv|planes.zip [--start 2024-09-02]
+"""
+
+import argparse
+import csv
+import hashlib
+import io
+import re
+import zipfile
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+
+from trainer_core import week_start
+
+EXPORT_COLUMNS = ["athlete_id", "date", "day", "type", "detail", "intensity"]
+
+_PRODID = "-//Smart Football Trainer//Plan semanal//ES"
+_UNSAFE_FILENAME = re.compile(r"[^\w.-]+")
+
+
+# ─────────────────────────────────────────────
+# ICALENDAR
+# ─────────────────────────────────────────────
+
+def _escape(text: str) -> str:
+    """Escapa un texto para un valor iCalendar (RFC 5545 §3.3.11)."""
+    return (text.replace("\\", "\\\\").replace(";", "\\;")
+            .replace(",", "\\,").replace("\n", "\\n"))
+
+
+def _fold(line: str) -> str:
+    """Corta una línea en tramos de 75 octetos como pide RFC 5545, terminada en CRLF."""
+    raw = line.encode("utf-8")
+    if len(raw) <= 75:
+        return line + "\r\n"
+    parts, start, limit = [], 0, 75
+    while start < len(raw):
+        end = min(start + limit, len(raw))
+        while end < len(raw) and (raw[end] & 0xC0) == 0x80:   # no cortar un carácter UTF-8
+            end -= 1
+        parts.append(raw[start:end].decode("utf-8"))
+        start, limit = end, 74   # las continuaciones empiezan con un espacio
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _event_lines(session, day: date) -> str:
+    """Líneas de fecha, título y descripción de un evento, ya plegadas."""
+    return "".join(_fold(line) for line in (
+        f"DTSTART;VALUE=DATE:{day:%Y%m%d}",
+        f"DTEND;VALUE=DATE:{day + timedelta(days=1):%Y%m%d}",
+        f"SUMMARY:{_escape(session['type'])}",
+        f"DESCRIPTION:{_escape(session['detail'])}\\nIntensidad: {session['intensity']}/5",
+    ))
+
+
+_cached_event_lines = lru_cache(maxsize=4096)(_event_lines)
+
+
+def iter_ics_events(athlete_id: str, plan, start: date, stamp: str):
+    """Eventos VEVENT (texto plegado, uno por día que no es de descanso) de un plan."""
+    athlete = _escape(athlete_id)
+    # Hash del id tal cual: limpiarlo (como en `player_filename`) haría chocar "a b" con "a_b"
+    uid = hashlib.blake2b(athlete_id.encode("utf-8"), digest_size=8).hexdigest()
+    head = _fold(f"CATEGORIES:{athlete}") + _fold(f"DTSTAMP:{stamp}")
+    for offset, session in enumerate(plan):
+        if session["intensity"] <= 0:
+            continue
+        day = start + timedelta(days=offset)
+        try:
+            body = _cached_event_lines(session, day)   # las sesiones de la tabla se repiten
+        except TypeError:   # sesiones como dict (no hasheables)
+            body = _event_lines(session, day)
+        yield (f"BEGIN:VEVENT\r\n{_fold(f'UID:{uid}-{day:%Y%m%d}@smart-football-trainer')}"
+               f"{head}{body}END:VEVENT\r\n")
+
+
+def write_ics(plans, out, start: date = None) -> int:
+    """
+    Escribe un calendario con los planes de `plans` (pares athlete_id, plan)
+    en `out` (ruta o archivo de texto abierto). Devuelve la cantidad de eventos.
+    """
+    if isinstance(out, str):
+        with open(out, "w", encoding="utf-8", newline="") as f:
+            return write_ics(plans, f, start)
+
+    start = start or week_start(date.today())
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    out.write(_fold("BEGIN:VCALENDAR") + _fold("VERSION:2.0") + _fold(f"PRODID:{_PRODID}")
+              + _fold("CALSCALE:GREGORIAN"))
+    events = 0
+    for athlete_id, plan in plans:
+        for event in iter_ics_events(athlete_id, plan, start, stamp):
+            out.write(event)
+            events += 1
+    out.write(_fold("END:VCALENDAR"))
+    return events
+
+
+# ─────────────────────────────────────────────
+# CSV
+# ─────────────────────────────────────────────
+
+def iter_csv_rows(plans, start: date):
+    """Filas de `EXPORT_COLUMNS`, una por jugador y día."""
+    dates = [(start + timedelta(days=offset)).isoformat() for offset in range(7)]
+    for athlete_id, plan in plans:
+        for day, session in zip(dates, plan):
+            yield athlete_id, day, session["day"], session["type"], session["detail"], session["intensity"]
+
+
+def write_csv(plans, out, start: date = None) -> int:
+    """Escribe los planes como CSV en `out` (ruta o archivo de texto abierto). Devuelve las filas."""
+    if isinstance(out, str):
+        with open(out, "w", encoding="utf-8", newline="") as f:
+            return write_csv(plans, f, start)
+
+    writer = csv.writer(out)
+    writer.writerow(EXPORT_COLUMNS)
+    rows = 0
+    for row in iter_csv_rows(plans, start or week_start(date.today())):
+        writer.writerow(row)
+        rows += 1
+    return rows
+
+
+# ─────────────────────────────────────────────
+# ZIP POR JUGADOR
+# ─────────────────────────────────────────────
+
+def player_filename(athlete_id: str, extension: str) -> str:
+    """Nombre de archivo seguro para el jugador."""
+    return f"{_UNSAFE_FILENAME.sub('_', athlete_id).strip('_') or 'jugador'}.{extension}"
+
+
+def write_zip(plans, out, start: date = None, formats=("ics",)) -> int:
+    """
+    Escribe un zip con un archivo por jugador y formato ('ics', 'csv') en `out`
+    (ruta o archivo binario abierto). Cada miembro se comprime a medida que se
+    escribe. Devuelve la cantidad de jugadores.
+    """
+    writers = {"ics": write_ics, "csv": write_csv}
+    unknown = set(formats) - set(writers)
+    if unknown:
+        raise ValueError(f"formatos desconocidos: {sorted(unknown)}")
+
+    start = start or week_start(date.today())
+    players = 0
+    used = set()
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as bundle:
+        for athlete_id, plan in plans:
+            for extension in formats:
+                name = player_filename(athlete_id, extension)
+                while name in used:   # dos nombres que se normalizan igual
+                    name = f"_{name}"
+                used.add(name)
+                with bundle.open(name, "w") as member, \
+                        io.TextIOWrapper(member, encoding="utf-8", newline="") as text:
+                    writers[extension]([(athlete_id, plan)], text, start)
+            players += 1
+    return players
+
+
+def main(argv=None) -> None:
+    from trainer_batch import plan_squad, read_squad_csv
+
+    parser = argparse.ArgumentParser(description="Exporta los planes de una plantilla a .ics, .csv o .zip.")
+    parser.add_argument("squad", help="CSV de plantilla (ver trainer_batch)")
+    parser.add_argument("out", help="archivo de salida: .ics, .csv o .zip (un .ics por jugador)")
+    parser.add_argument("--start", type=date.fromisoformat, help="lunes de la semana (por defecto, el próximo)")
+    args = parser.parse_args(argv)
+
+    plans = ((athlete_id, plan) for athlete_id, _, plan in plan_squad(read_squad_csv(args.squad)))
+    if args.out.endswith(".zip"):
+        count = f"{write_zip(plans, args.out, args.start)} jugadores"
+    elif args.out.endswith(".csv"):
+        count = f"{write_csv(plans, args.out, args.start)} filas"
+    else:
+        count = f"{write_ics(plans, args.out, args.start)} eventos"
+    print(f"{count} → {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Smart Football Trainer — motor de reglas del plan semanal
+=========================================================
+Construye el plan semanal a partir de una tabla declarativa de reglas
+(`plan_rules.yaml`, o un JSON con la misma estructura) en lugar de ramas
+escritas en código. Ver el archivo de reglas para el formato.
+
+Las reglas se validan y compilan una sola vez (`PlanRules`): por cada
+perfil, fatiga y objetivo se resuelven de antemano las plantillas ya
+ajustadas por fatiga, la semana sin partido completa y la lista de
+(offset, prioridad, sesión) alrededor de cada partido. Armar un plan es
+entonces ubicar esas sesiones en los 7 días, y los planes ya armados se
+memorizan. Las sesiones son las mismas `Session` internadas de
+`trainer_core`, así que el resultado es intercambiable con
+`generate_week_plan` y `build_fixture_week` (las ramas de referencia).
+
+`default_rules()` es la instancia compartida con las reglas de
+`plan_rules.yaml`: la usan la app, los lotes, el exportador, el simulador de
+temporada y el mesociclo, así que editar las reglas cambia todos los planes.
+"""
+
+import json
+import os
+from functools import lru_cache
+
+from trainer_core import DAYS_ES, FATIGUE_LEVELS, OBJECTIVES, make_session
+
+DEFAULT_RULES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "plan_rules.yaml")
+DEFAULT_PROFILE = "default"
+
+_SECTIONS = ("match_week", "no_match_week", "fatigue")
+
+
+def load_rules(path: str = DEFAULT_RULES_FILE) -> "PlanRules":
+    """Carga y compila un archivo de reglas YAML o JSON (según la extensión)."""
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".json"):
+            spec = json.load(f)
+        else:
+            import yaml
+            spec = yaml.safe_load(f)
+    return PlanRules(spec)
+
+
+@lru_cache(maxsize=None)
+def default_rules() -> "PlanRules":
+    """Reglas de `DEFAULT_RULES_FILE`, compiladas una vez por proceso."""
+    return load_rules()
+
+
+class PlanRules:
+    """
+    Reglas del plan compiladas a una tabla de despacho.
+    `plan(match_days, fatigue, objective, profile)` devuelve la tupla de 7 sesiones.
+    """
+
+    def __init__(self, spec: dict):
+        sessions = spec.get("sessions") or {}
+        profiles = spec.get("profiles") or {}
+        if DEFAULT_PROFILE not in profiles:
+            raise ValueError(f"las reglas deben definir el perfil '{DEFAULT_PROFILE}'")
+
+        self._weeks = {}
+        self._plans = {}
+        for name in profiles:
+            rules = _resolve_profile(profiles, name)
+            templates = {**sessions, **(rules.get("sessions") or {})}
+            objectives = _objectives(rules)
+            for fatigue in FATIGUE_LEVELS:
+                for objective in objectives:
+                    self._weeks[name, fatigue, objective] = _compile_week(
+                        rules, templates, fatigue, objective, where=f"perfil '{name}'")
+        self.profiles = tuple(profiles)
+
+    def plan(self, match_days, fatigue: int, objective: str, profile: str = DEFAULT_PROFILE) -> tuple:
+        """Plan de la semana para cualquier cantidad de partidos (días en inglés, como `DAYS_ES`)."""
+        key = (profile, fatigue, objective, tuple(match_days))
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = self._plans[key] = self._build(*key)
+        return plan
+
+    def _build(self, profile: str, fatigue: int, objective: str, match_days: tuple) -> tuple:
+        """Ubica las sesiones compiladas en los 7 días de la semana."""
+        unknown = set(match_days) - set(DAYS_ES)
+        if unknown:
+            raise ValueError(f"días de partido desconocidos: {sorted(unknown, key=str)}")
+        days = [i for i, day in enumerate(DAYS_ES) if day in match_days]
+        try:
+            no_match, fill, around = self._weeks[profile, fatigue, objective]
+        except KeyError:
+            raise ValueError(
+                f"sin reglas para perfil={profile!r}, fatiga={fatigue!r}, objetivo={objective!r}"
+            ) from None
+        if not days:
+            return no_match
+
+        slots = [fill] * 7
+        rank = [0] * 7
+        for match in days:
+            for offset, priority, template in around:
+                day = (match + offset) % 7
+                if priority > rank[day]:
+                    rank[day] = priority
+                    slots[day] = template
+        return tuple(make_session(DAYS_ES[i], *slots[i]) for i in range(7))
+
+
+# ─────────────────────────────────────────────
+# COMPILACIÓN
+# ─────────────────────────────────────────────
+
+def _resolve_profile(profiles: dict, name: str, seen: tuple = ()) -> dict:
+    """Reglas de un perfil con las secciones heredadas de `extends` ya aplicadas."""
+    if name in seen:
+        raise ValueError(f"herencia circular de perfiles: {' → '.join(seen + (name,))}")
+    if name not in profiles:
+        raise ValueError(f"perfil desconocido: {name!r}")
+    rules = profiles[name] or {}
+    parent = rules.get("extends")
+    if parent is None:
+        missing = [section for section in _SECTIONS if section not in rules]
+        if missing:
+            raise ValueError(f"al perfil '{name}' le faltan las secciones {missing}")
+        return rules
+    return {**_resolve_profile(profiles, parent, seen + (name,)), **rules}
+
+
+def _objectives(rules: dict) -> list:
+    """Objetivos de la app más los que las reglas mencionan explícitamente."""
+    named = set(rules["no_match_week"])
+    for rule in rules["match_week"].get("around_match", []):
+        if isinstance(rule.get("session"), dict):
+            named.update(rule["session"])
+    return list(OBJECTIVES) + sorted(named - set(OBJECTIVES) - {"default"})
+
+
+def _pick(value, objective: str, where: str):
+    """Valor directo, o el del objetivo en un mapa { objetivo: valor, default: valor }."""
+    if not isinstance(value, dict):
+        return value
+    if objective in value:
+        return value[objective]
+    if "default" in value:
+        return value["default"]
+    raise ValueError(f"{where}: no hay valor para el objetivo {objective!r} ni 'default'")
+
+
+def _template(templates: dict, ref: str, rules: dict, fatigue: int, where: str) -> tuple:
+    """(type, detail, intensity) de una sesión, con los ajustes de fatiga aplicados."""
+    if ref not in templates:
+        raise ValueError(f"{where}: sesión desconocida {ref!r}")
+    session = templates[ref]
+    try:
+        s_type, detail, intensity = session["type"], session["detail"], int(session["intensity"])
+    except (KeyError, TypeError, ValueError) as exc:
+        raise ValueError(f"sesión {ref!r} inválida: {exc}") from None
+    for adjustment in rules["fatigue"]:
+        if fatigue >= adjustment["min_fatigue"] and intensity > adjustment.get("above_intensity", 0):
+            intensity = max(adjustment.get("min_intensity", 0), intensity + adjustment.get("intensity_delta", 0))
+            detail += adjustment.get("detail_suffix", "")
+    return s_type, detail, intensity
+
+
+def _compile_week(rules: dict, templates: dict, fatigue: int, objective: str, where: str) -> tuple:
+    """(semana sin partido, sesión de relleno, reglas alrededor del partido) ya resueltas."""
+    week = rules["match_week"]
+    no_match_refs = _pick(rules["no_match_week"], objective, f"{where}, no_match_week")
+    if len(no_match_refs) != 7:
+        raise ValueError(f"{where}: no_match_week debe tener 7 días (lunes a domingo)")
+    no_match = tuple(
+        make_session(day, *_template(templates, ref, rules, fatigue, f"{where}, no_match_week"))
+        for day, ref in zip(DAYS_ES, no_match_refs)
+    )
+    fill = _template(templates, week.get("fill", "rest"), rules, fatigue, f"{where}, match_week.fill")
+
+    around = []
+    for rule in week.get("around_match", []):
+        ref = _pick(rule["session"], objective, f"{where}, around_match")
+        template = _template(templates, ref, rules, fatigue, f"{where}, around_match")
+        priority = int(rule["priority"])
+        if priority < 1:
+            raise ValueError(f"{where}: la prioridad de around_match debe ser >= 1")
+        around.append((int(rule["offset"]), priority, template))
+    return no_match, fill, tuple(around)
@@ -0,0 +1,175 @@
+"""
+Top 20 Investables — historial de precios
+=========================================
+Barras diarias OHLCV de todo el universo en un único archivo Arrow IPC
+(Feather v2, sin comprimir), en columnas y ordenado por símbolo y fecha:
+
+    symbol · date · open · high · low · close · volume
+
+El archivo se abre con memory-map: leerlo no copia los datos al heap y
+varios procesos comparten las mismas páginas. `frame()` entrega un
+DataFrame respaldado por Arrow (`pd.ArrowDtype`) para las capas de análisis.
+
+`update(provider, symbols)` descarga solo las barras posteriores a la última
+fecha guardada de cada símbolo (el historial completo, `HISTORY_DAYS` días,
+para los que no tienen ninguna), agrupando los símbolos que parten de la
+misma fecha en consultas en bloque de hasta `BATCH_SIZE`. Se guardan solo
+días cerrados: la barra de la sesión en curso cambia hasta el cierre y el
+precio del día ya lo da el nivel de precios de la caché.
+
+La actualización toma un lock advisory (`<archivo>.lock`) y reescribe el
+archivo en un temporal que reemplaza al anterior con `os.replace`; los
+lectores que ya lo tenían mapeado siguen viendo la versión previa.
+
+Requiere `pyarrow`.
+"""
+
+import os
+import threading
+from datetime import date, timedelta
+
+from file_utils import atomic_file, file_lock
+from market_providers import HISTORY_COLUMNS, HISTORY_DAYS
+
+BATCH_SIZE = 50             # símbolos por consulta en bloque
+DEFAULT_PATH = "price_history.arrow"
+
+
+def _schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        ("symbol", pa.string()),
+        ("date", pa.date32()),
+        ("open", pa.float64()),
+        ("high", pa.float64()),
+        ("low", pa.float64()),
+        ("close", pa.float64()),
+        ("volume", pa.int64()),
+    ])
+
+
+def _bars_table(symbol: str, bars: dict, after: date = None):
+    """Payload de historial de un símbolo → tabla Arrow, solo con las fechas posteriores a `after`."""
+    import pyarrow as pa
+
+    keep = [i for i, day in enumerate(bars["date"]) if after is None or date.fromisoformat(day) > after]
+    columns = {
+        "symbol": [symbol] * len(keep),
+        "date": [date.fromisoformat(bars["date"][i]) for i in keep],
+        **{column: [bars[column][i] for i in keep] for column in HISTORY_COLUMNS},
+    }
+    return pa.table(columns, schema=_schema())
+
+
+def _has_business_day(start: date, end: date) -> bool:
+    day = start
+    while day <= end:
+        if day.weekday() < 5:
+            return True
+        day += timedelta(days=1)
+    return False
+
+
+class PriceHistory:
+    """Historial de precios en `path`; la tabla mapeada se recarga cuando el archivo cambia."""
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._table = None
+
+    # ── LECTURA ─────────────────────────────────────────────────
+
+    def table(self):
+        """Tabla Arrow (memory-mapped) con todas las barras; vacía si todavía no hay archivo."""
+        import pyarrow as pa
+
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return _schema().empty_table()
+        stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+        with self._lock:
+            if stamp != self._stamp:
+                with pa.memory_map(self.path, "r") as source:
+                    self._table = pa.ipc.open_file(source).read_all()
+                self._stamp = stamp
+            return self._table
+
+    def frame(self, symbols=None, start=None):
+        """
+        Barras de `symbols` (todos si es None) desde `start` como DataFrame
+        respaldado por Arrow, en formato largo (una fila por símbolo y fecha).
+        """
+        import pandas as pd
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        table = self.table()
+        if symbols is not None:
+            table = table.filter(pc.is_in(table["symbol"], value_set=pa.array(list(symbols), pa.string())))
+        if start is not None:
+            start = date.fromisoformat(start) if isinstance(start, str) else start
+            table = table.filter(pc.greater_equal(table["date"], start))
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+    def closes(self, symbols=None, start=None):
+        """Cierres en formato ancho: índice de fechas, una columna por símbolo."""
+        frame = self.frame(symbols, start)
+        return frame.pivot(index="date", columns="symbol", values="close")
+
+    def last_dates(self) -> dict:
+        """{symbol: fecha de la última barra guardada}."""
+        table = self.table()
+        if table.num_rows == 0:
+            return {}
+        grouped = table.group_by("symbol").aggregate([("date", "max")])
+        return dict(zip(grouped["symbol"].to_pylist(), grouped["date_max"].to_pylist()))
+
+    # ── ACTUALIZACIÓN ───────────────────────────────────────────
+
+    def update(self, provider, symbols, end=None, days: int = HISTORY_DAYS, batch_size: int = BATCH_SIZE) -> dict:
+        """
+        Descarga de `provider` las barras que faltan hasta `end` (por defecto,
+        ayer) y las agrega al archivo. Devuelve {symbol: barras nuevas}; los
+        símbolos sin barras nuevas, o cuya consulta falla, no aparecen.
+        """
+        import pyarrow as pa
+
+        if batch_size < 1:
+            raise ValueError(f"batch_size debe ser >= 1 (recibido {batch_size})")
+        end = date.fromisoformat(end) if isinstance(end, str) else end or date.today() - timedelta(days=1)
+
+        with file_lock(self.path):
+            last = self.last_dates()
+            by_start = {}
+            for symbol in dict.fromkeys(symbols):
+                start = last[symbol] + timedelta(days=1) if symbol in last else end - timedelta(days=days)
+                if _has_business_day(start, end):
+                    by_start.setdefault(start, []).append(symbol)
+
+            new, added = [], {}
+            for start, group in sorted(by_start.items()):
+                for i in range(0, len(group), batch_size):
+                    try:
+                        results = provider.histories(group[i:i + batch_size], start, end)
+                    except Exception:
+                        continue   # se reintenta en la próxima actualización
+                    for symbol, bars in results.items():
+                        bars = _bars_table(symbol, bars, after=last.get(symbol))
+                        if bars.num_rows:
+                            new.append(bars)
+                            added[symbol] = bars.num_rows
+
+            if new:
+                table = pa.concat_tables([self.table(), *new])
+                self._write(table.sort_by([("symbol", "ascending"), ("date", "ascending")]))
+        return added
+
+    def _write(self, table) -> None:
+        import pyarrow as pa
+
+        with atomic_file(self.path) as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
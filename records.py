@@ -0,0 +1,64 @@
+"""
+Registros inmutables compactos
+==============================
+Base común de los registros livianos del proyecto (`trainer_core.Session`,
+`history_records.EntryInputs`, `history_records.HistoryEntry`): valores con
+`__slots__`, sin `__dict__`, que se leen como atributo (`record.load`) o
+como mapping (`record["load"]`, `dict(record)`), igual que los dicts que
+reemplazan.
+
+Solo usa la biblioteca estándar.
+"""
+
+from collections.abc import Mapping
+
+
+class Record(Mapping):
+    """
+    Base de los registros inmutables con `__slots__`: cada subclase declara sus
+    campos en `_fields` (y los mismos nombres en `__slots__`). Como mapping,
+    sus claves son los campos en ese orden.
+    """
+    # Clase a mano en lugar de dataclass: `dataclasses` arrastra inspect, enum
+    # y re, y multiplica el tiempo de importación de los módulos que la usan.
+    __slots__ = ()
+    _fields = ()
+
+    def __init__(self, *values):
+        for field, value in zip(self._fields, values):
+            object.__setattr__(self, field, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} es inmutable: no se puede asignar {name!r}")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} es inmutable: no se puede borrar {name!r}")
+
+    def _values(self) -> tuple:
+        return tuple(getattr(self, field) for field in self._fields)
+
+    def __getitem__(self, key: str):
+        if key not in self._fields:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._values() == other._values()
+
+    def __hash__(self) -> int:
+        return hash(self._values())
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{f}={v!r}" for f, v in zip(self._fields, self._values()))
+        return f"{type(self).__name__}({fields})"
+
+    def __reduce__(self):
+        return (self.__class__, self._values())
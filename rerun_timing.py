@@ -0,0 +1,196 @@
+"""
+Smart Football Trainer — tiempos por etapa de cada rerun
+========================================================
+Mide cuánto tarda cada etapa de una ejecución de la app (CSS, widgets,
+lectura y escritura del historial, plan, tarjetas...) con timers de
+contexto muy livianos:
+
+    timing = TimingLog()
+    timing.begin("app")               # al empezar el script
+    with timing.stage("plan"):
+        ...
+    timing.end()                      # al terminar el script
+
+    @timing.timed("planner")          # fragmentos: rerun propio o etapa
+    def planner(): ...
+
+Cada rerun terminado queda en un buffer circular (`records`, `summary`) y se
+emite como una línea JSON por el logger `smart_football_trainer.timing`
+(opcionalmente a un archivo). Con `profile_dir` cada rerun además vuelca un
+perfil de cProfile (`.prof`, para `snakeviz` o `pstats`).
+
+Las etapas anidadas se registran con su ruta ("planner/plan"), y el tiempo de
+una etapa incluye el de sus etapas internas. El rerun activo es por hilo, como
+los de Streamlit: cada sesión ejecuta su script en su propio hilo.
+"""
+
+import cProfile
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from functools import wraps
+
+RING_SIZE = 200         # reruns recientes que se conservan en memoria
+
+logger = logging.getLogger("smart_football_trainer.timing")
+
+
+class Rerun:
+    """Tiempos (ms) de las etapas de un rerun en curso."""
+
+    __slots__ = ("name", "started", "stages", "_path", "_profile")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started = time.perf_counter()
+        self.stages = {}
+        self._path = []
+        self._profile = None
+
+    @contextmanager
+    def stage(self, name: str):
+        """Suma el tiempo del bloque a la etapa `name` (anidada bajo la etapa actual)."""
+        self._path.append(name)
+        key = "/".join(self._path)
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.stages[key] = self.stages.get(key, 0.0) + (time.perf_counter() - start) * 1000
+            self._path.pop()
+
+
+class TimingLog:
+    """
+    Buffer circular de los últimos `size` reruns, con log JSON y perfiles
+    de cProfile opcionales. Compartido por todas las sesiones del servidor.
+    """
+
+    def __init__(self, size: int = RING_SIZE, log_path: str = None, profile_dir: str = None):
+        self._records = deque(maxlen=size)
+        self._local = threading.local()
+        self.profile_dir = profile_dir
+        if profile_dir:
+            os.makedirs(profile_dir, exist_ok=True)
+        if log_path and not any(getattr(h, "baseFilename", None) == os.path.abspath(log_path)
+                                for h in logger.handlers):
+            handler = logging.FileHandler(log_path, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))   # JSON Lines
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+
+    # ── REGISTRO ────────────────────────────────────────────────
+
+    def begin(self, name: str) -> Rerun:
+        """Empieza un rerun en este hilo (descarta uno anterior que no llegó a `end`)."""
+        stale = getattr(self._local, "rerun", None)
+        if stale is not None and stale._profile is not None:
+            stale._profile.disable()
+        rerun = self._local.rerun = Rerun(name)
+        if self.profile_dir:
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:   # otro perfilador activo en el proceso
+                pass
+            else:
+                rerun._profile = profile
+        return rerun
+
+    def end(self) -> dict:
+        """Cierra el rerun de este hilo, lo guarda en el buffer y lo emite en el log."""
+        rerun = getattr(self._local, "rerun", None)
+        if rerun is None:
+            return None
+        self._local.rerun = None
+        total = (time.perf_counter() - rerun.started) * 1000
+        now = datetime.now(timezone.utc)
+        record = {
+            "ts": now.isoformat(timespec="milliseconds"),
+            "rerun": rerun.name,
+            "total_ms": round(total, 3),
+            "stages": {name: round(ms, 3) for name, ms in rerun.stages.items()},
+        }
+        if rerun._profile is not None:
+            rerun._profile.disable()
+            path = os.path.join(self.profile_dir, f"{now:%Y%m%dT%H%M%S_%f}-{rerun.name}.prof")
+            rerun._profile.dump_stats(path)
+            record["profile"] = path
+        self._records.append(record)
+        logger.info(json.dumps(record, ensure_ascii=False))
+        return record
+
+    def stage(self, name: str):
+        """Timer de contexto de una etapa del rerun de este hilo (no hace nada si no hay uno)."""
+        rerun = getattr(self._local, "rerun", None)
+        return rerun.stage(name) if rerun is not None else nullcontext()
+
+    @contextmanager
+    def rerun(self, name: str):
+        """Rerun propio, o etapa si ya hay un rerun en curso (p. ej. un fragmento dentro del script)."""
+        active = getattr(self._local, "rerun", None)
+        if active is not None:
+            with active.stage(name):
+                yield active
+            return
+        rerun = self.begin(name)
+        try:
+            yield rerun
+        finally:
+            self.end()
+
+    def timed(self, name: str):
+        """Decorador: ejecuta la función dentro de `rerun(name)`."""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.rerun(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    # ── CONSULTA ────────────────────────────────────────────────
+
+    def records(self) -> list:
+        """Reruns del buffer, el más reciente al final."""
+        return list(self._records)
+
+    def summary(self, rerun: str = None) -> list:
+        """
+        Por etapa (y total): cantidad, mediana, p95 y máximo en ms sobre los
+        reruns del buffer, opcionalmente solo los de nombre `rerun`.
+        Ordenado por mediana descendente.
+        """
+        samples = {}
+        for record in self.records():
+            if rerun is not None and record["rerun"] != rerun:
+                continue
+            samples.setdefault("total", []).append(record["total_ms"])
+            for name, ms in record["stages"].items():
+                samples.setdefault(name, []).append(ms)
+
+        rows = []
+        for name, values in samples.items():
+            values.sort()
+            rows.append({
+                "stage": name,
+                "n": len(values),
+                "p50_ms": _percentile(values, 0.5),
+                "p95_ms": _percentile(values, 0.95),
+                "max_ms": values[-1],
+            })
+        rows.sort(key=lambda row: row["p50_ms"], reverse=True)
+        return rows
+
+
+def _percentile(values: list, q: float) -> float:
+    """Percentil por interpolación lineal de una lista ya ordenada."""
+    pos = (len(values) - 1) * q
+    low = int(pos)
+    high = min(low + 1, len(values) - 1)
+    return round(values[low] + (values[high] - values[low]) * (pos - low), 3)
@@ -0,0 +1,125 @@
+"""
+Smart Football Trainer — simulador Monte Carlo de temporada
+===========================================================
+Hace pasar miles de jugadores sintéticos por una temporada completa con las
+reglas del plan (`plan_rules.default_rules`) y `calculate_load`, y mide cuántas veces se
+dispara la advertencia de sobrecarga (variación semanal > 20%) según el
+objetivo de entrenamiento.
+
+Por cada jugador y semana se sortean:
+  - partido (probabilidad `match_prob`) y día del partido
+  - fatiga: proceso AR(1) alrededor de `fatigue_mean`, que sube tras jugar
+  - minutos: los del partido + los del plan (intensidad total × minutos por punto)
+
+Todo se calcula con arrays NumPy de (jugadores × semanas). Los planes se
+reducen de antemano a una tabla de intensidad total por (partido/día, fatiga,
+objetivo), así que no se construye ningún dict por jugador.
+"""
+
+from functools import lru_cache
+
+from plan_rules import default_rules
+from trainer_core import DAYS_ES, FATIGUE_LEVELS, OBJECTIVES, calculate_load
+
+OVERLOAD_THRESHOLD_PCT = 20     # misma regla que la advertencia de la app
+MINUTES_PER_INTENSITY = 10      # minutos de entrenamiento por punto de intensidad del plan
+MAX_MINUTES = 300               # tope del input "Minutos jugados" de la app
+
+
+@lru_cache(maxsize=None)
+def plan_intensity_table():
+    """
+    Intensidad total del plan semanal, como array (8, 5, 3):
+    [sin partido, partido lunes … domingo] × fatiga 1–5 × objetivo.
+    """
+    import numpy as np
+
+    rules = default_rules()
+    table = np.zeros((len(DAYS_ES) + 1, len(FATIGUE_LEVELS), len(OBJECTIVES)), dtype=np.int64)
+    for f, fatigue in enumerate(FATIGUE_LEVELS):
+        for o, objective in enumerate(OBJECTIVES):
+            table[0, f, o] = sum(s["intensity"] for s in rules.plan((), fatigue, objective))
+            for d, day in enumerate(DAYS_ES, start=1):
+                table[d, f, o] = sum(s["intensity"] for s in rules.plan((day,), fatigue, objective))
+    table.setflags(write=False)
+    return table
+
+
+def simulate_season(objective: str, athletes: int = 1000, weeks: int = 40, match_prob: float = 0.8,
+                    fatigue_mean: float = 2.5, fatigue_persistence: float = 0.6,
+                    fatigue_noise: float = 0.8, match_fatigue: float = 0.5, seed=None) -> dict:
+    """
+    Simula una temporada para `athletes` jugadores con el mismo objetivo.
+
+    Devuelve arrays (jugadores × semanas): 'match_slot' (0 = sin partido,
+    1–7 = lunes–domingo), 'fatigue', 'minutes', 'load', 'variation_pct'
+    (NaN sin carga previa) y 'overload' (advertencia disparada).
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    shape = (athletes, weeks)
+    o = OBJECTIVES.index(objective)
+
+    # Partidos: sorteo de la semana y del día
+    has_match = rng.random(shape) < match_prob
+    match_slot = np.where(has_match, rng.integers(1, len(DAYS_ES) + 1, size=shape), 0)
+
+    # Fatiga AR(1) que sube tras jugar; la recursión recorre semanas, vectorizada por jugador
+    noise = rng.normal(0.0, fatigue_noise, size=shape)
+    latent = np.empty(shape)
+    latent[:, 0] = fatigue_mean + noise[:, 0]
+    for w in range(1, weeks):
+        latent[:, w] = (fatigue_persistence * latent[:, w - 1]
+                        + (1 - fatigue_persistence) * fatigue_mean
+                        + match_fatigue * has_match[:, w - 1]
+                        + noise[:, w])
+    fatigue = np.clip(np.rint(latent), FATIGUE_LEVELS[0], FATIGUE_LEVELS[-1]).astype(np.int64)
+
+    # Minutos = partido + entrenamiento según la intensidad total del plan
+    intensity = plan_intensity_table()[match_slot, fatigue - FATIGUE_LEVELS[0], o]
+    adherence = rng.uniform(0.7, 1.1, size=(athletes, 1))
+    match_minutes = np.where(has_match, rng.integers(0, 91, size=shape), 0)
+    minutes = np.minimum(match_minutes + np.rint(intensity * MINUTES_PER_INTENSITY * adherence),
+                         MAX_MINUTES).astype(np.int64)
+
+    load = calculate_load(minutes, fatigue)
+    prev = np.zeros_like(load)
+    prev[:, 1:] = load[:, :-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        variation_pct = np.where(prev > 0, (load - prev) / prev * 100, np.nan)
+    overload = variation_pct > OVERLOAD_THRESHOLD_PCT
+
+    return {
+        "match_slot": match_slot,
+        "fatigue": fatigue,
+        "minutes": minutes,
+        "load": load,
+        "variation_pct": variation_pct,
+        "overload": overload,
+    }
+
+
+def overload_report(objectives=OBJECTIVES, athletes: int = 1000, weeks: int = 40, seed: int = 0,
+                    **kwargs) -> dict:
+    """
+    Frecuencia de la advertencia de sobrecarga por objetivo.
+
+    Devuelve objetivo → { 'warning_rate' (por semana-jugador con carga previa),
+    'warnings_per_season' (promedio por jugador), 'athletes_warned' (fracción
+    con al menos una advertencia), 'mean_load' }.
+    """
+    import numpy as np
+
+    report = {}
+    for i, objective in enumerate(objectives):
+        sim = simulate_season(objective, athletes, weeks, seed=seed + i, **kwargs)
+        comparable = ~np.isnan(sim["variation_pct"])
+        warnings = sim["overload"].sum(axis=1)
+        report[objective] = {
+            "warning_rate": float(sim["overload"].sum() / max(comparable.sum(), 1)),
+            "warnings_per_season": float(warnings.mean()),
+            "athletes_warned": float((warnings > 0).mean()),
+            "mean_load": float(sim["load"].mean()),
+        }
+    return report
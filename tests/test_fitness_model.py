@@ -0,0 +1,53 @@
+"""
+Tests del modelo fitness-fatiga (`fitness_model`): una entrada por semana,
+la última reemplaza a las anteriores como en `workload`.
+"""
+
+import pytest
+
+import fitness_model
+from history_records import HistoryColumns
+
+
+def _entry(day: str, load: int, fatigue: int = 3) -> dict:
+    return {"date": day, "load": load, "inputs": {"fatigue": fatigue}}
+
+
+def test_second_entry_of_the_week_replaces_the_first():
+    state = fitness_model.new_fitness_state()
+    fitness_model.update_fitness(state, "2026-03-02", 600)
+    fitness_model.update_fitness(state, "2026-03-09", 600)
+    fitness_model.update_fitness(state, "2026-03-11", 600)     # misma semana que el 9
+
+    expected = fitness_model.new_fitness_state()
+    fitness_model.update_fitness(expected, "2026-03-02", 600)
+    fitness_model.update_fitness(expected, "2026-03-11", 600)
+    assert state["last_day"] == expected["last_day"]
+    assert state["fitness"] == pytest.approx(expected["fitness"])
+    assert state["fatigue"] == pytest.approx(expected["fatigue"])
+
+
+def test_entries_must_be_in_order():
+    state = fitness_model.update_fitness(fitness_model.new_fitness_state(), "2026-03-09", 600)
+    with pytest.raises(ValueError):
+        fitness_model.update_fitness(state, "2026-03-02", 600)
+
+
+def test_replay_matches_columns():
+    entries = [_entry("2026-03-02", 300), _entry("2026-03-04", 500), _entry("2026-03-16", 200)]
+    from_entries = fitness_model.replay_fitness(entries)
+    from_columns = fitness_model.replay_fitness(HistoryColumns.from_entries(entries))
+    assert from_entries == from_columns
+    assert from_entries["fitness"] == pytest.approx(
+        fitness_model.replay_fitness([entries[1], entries[2]])["fitness"]
+    )
+
+
+def test_fit_squad_keeps_last_entry_of_each_week():
+    pytest.importorskip("numpy")
+    weekly = [_entry(f"2026-{1 + i // 4:02d}-{1 + 7 * (i % 4):02d}", 200 + 50 * (i % 5), 1 + i % 5)
+              for i in range(24)]
+    extra = [_entry("2025-12-30", 900, 5)] + weekly      # mismo lunes-domingo que el 1/1/2026
+    fitted = fitness_model.fit_squad({"a": weekly, "b": extra})
+    for key in ("tau_fitness", "tau_fatigue", "k_fitness", "k_fatigue", "p0", "n_obs"):
+        assert fitted["a"][key] == pytest.approx(fitted["b"][key])
@@ -0,0 +1,92 @@
+"""
+Tests del historial SQLite (`history_db`): una entrada por día, carga semanal
+con la regla de `workload` (la última entrada de la semana) y resumen de la
+plantilla.
+"""
+
+import pytest
+
+import history_db
+
+
+def _entry(day: str, load: int, fatigue: int = 5) -> dict:
+    return {"date": day, "load": load, "inputs": {"fatigue": fatigue}}
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = history_db.connect(str(tmp_path / "history.db"))
+    yield conn
+    conn.close()
+
+
+def test_same_day_entry_replaces_previous(conn):
+    history_db.insert_entry(conn, "ana", _entry("2026-03-02T09:00:00", 400))
+    history_db.insert_entry(conn, "ana", _entry("2026-03-02T18:00:00", 600))
+    entries = history_db.latest_entries(conn, "ana", 10)
+    assert [e["load"] for e in entries] == [600]
+    assert history_db.load_rollup(conn, "ana", "week") == [("2026-03-02", 600)]
+
+
+def test_two_entries_in_one_week_use_last(conn):
+    history_db.insert_entries(conn, "ana", [
+        _entry("2026-02-23T10:00:00", 600),
+        _entry("2026-03-02T10:00:00", 600),
+        _entry("2026-03-05T10:00:00", 600),
+    ])
+    assert history_db.load_rollup(conn, "ana", "week") == [("2026-02-23", 600), ("2026-03-02", 600)]
+    (row,) = history_db.squad_summary(conn)
+    assert row["week"] == "2026-03-02"
+    assert row["load"] == 600 and row["prev_load"] == 600
+    assert row["variation_pct"] == 0
+    assert not row["overload"]
+    assert row["acwr"] == pytest.approx(1.0)
+
+
+def test_week_rollup_follows_replaced_last_entry(conn):
+    history_db.insert_entry(conn, "ana", _entry("2026-03-02T10:00:00", 300))
+    history_db.insert_entry(conn, "ana", _entry("2026-03-04T10:00:00", 500))
+    history_db.insert_entry(conn, "ana", _entry("2026-03-04T19:00:00", 200))
+    assert history_db.load_rollup(conn, "ana", "week") == [("2026-03-02", 200)]
+
+
+def test_reconnect_rebuilds_rollups_of_older_databases(tmp_path):
+    path = str(tmp_path / "history.db")
+    conn = history_db.connect(path)
+    history_db.insert_entries(conn, "ana", [_entry("2026-03-02", 600), _entry("2026-03-05", 600)])
+    conn.execute("UPDATE load_rollup SET load = 1200 WHERE period = 'week'")
+    conn.execute("PRAGMA user_version = 0")
+    conn.commit()
+    conn.close()
+
+    conn = history_db.connect(path)
+    assert history_db.load_rollup(conn, "ana", "week") == [("2026-03-02", 600)]
+    assert history_db.load_rollup(conn, "ana", "month") == [("2026-03-01", 600)]
+    assert history_db.squad_summary(conn)[0]["load"] == 600
+    conn.close()
+
+
+def test_month_rollup_sums_week_values(conn):
+    history_db.insert_entries(conn, "ana", [
+        _entry("2026-03-02", 600),
+        _entry("2026-03-04", 600),     # misma semana: reemplaza a la anterior
+        _entry("2026-03-09", 400),
+        _entry("2026-03-30", 300),     # semana que termina en abril: cuenta en marzo
+        _entry("2026-04-01", 200),
+    ])
+    assert history_db.load_rollup(conn, "ana", "week") == [
+        ("2026-03-02", 600), ("2026-03-09", 400), ("2026-03-30", 200),
+    ]
+    assert history_db.load_rollup(conn, "ana", "month") == [("2026-03-01", 1200)]
+    history_db.insert_entry(conn, "ana", _entry("2026-03-10", 100))
+    assert history_db.load_rollup(conn, "ana", "month") == [("2026-03-01", 900)]
+
+
+def test_latest_entry_before_skips_current_week(conn):
+    assert history_db.latest_entry_before(conn, "ana", "2026-03-09") is None
+    history_db.insert_entries(conn, "ana", [_entry("2026-03-04", 500)] + [
+        _entry(f"2026-03-{day:02d}", 100 + day) for day in range(9, 16)
+    ])
+    previous = history_db.latest_entry_before(conn, "ana", "2026-03-09")
+    assert (previous["date"], previous["load"]) == ("2026-03-04", 500)
+    assert history_db.latest_entry_before(conn, "beto", "2026-03-09") is None
@@ -0,0 +1,45 @@
+"""
+Tests del historial JSON Lines (`history_store`): lectura de la cola con y
+sin índice, registros corruptos y escritura en cola.
+"""
+
+import os
+
+import history_store
+
+
+def _entries(n: int, start: int = 0) -> list:
+    return [{"date": f"2026-01-{1 + (start + i) % 28:02d}", "load": start + i, "inputs": {}} for i in range(n)]
+
+
+def test_read_tail_with_and_without_index(tmp_path):
+    path = str(tmp_path / "history.jsonl")
+    history_store.append_entries(path, _entries(50))
+    assert history_store.count_entries(path) == 50
+    assert [e["load"] for e in history_store.read_tail(path, 3)] == [47, 48, 49]
+
+    os.remove(history_store.index_path(path))
+    assert [e["load"] for e in history_store.read_tail(path, 3)] == [47, 48, 49]
+    assert history_store.rebuild_index(path) == 50
+    assert [e["load"] for e in history_store.iter_history(path)] == list(range(50))
+
+
+def test_interrupted_write_is_skipped_and_repaired(tmp_path):
+    path = str(tmp_path / "history.jsonl")
+    history_store.append_entries(path, _entries(5))
+    with open(path, "ab") as f:
+        f.write(b'{"date": "2026-01-06", "lo')       # registro cortado
+    history_store.append_entry(path, _entries(1, start=5)[0])
+
+    loads = [e["load"] for e in history_store.iter_history(path)]
+    assert loads == [0, 1, 2, 3, 4, 5]
+    assert [e["load"] for e in history_store.read_tail(path, 2)] == [4, 5]
+
+
+def test_writer_groups_queued_entries(tmp_path):
+    path = str(tmp_path / "history.jsonl")
+    writer = history_store.HistoryWriter(lambda batch: history_store.append_entries(path, batch))
+    futures = [writer.submit(entry) for entry in _entries(20)]
+    writer.close()
+    assert all(future.done() for future in futures)
+    assert [e["load"] for e in history_store.iter_history(path)] == list(range(20))
@@ -0,0 +1,36 @@
+"""
+Tests del planificador de mesociclo (`mesocycle`): límite de progresión
+semanal y re-planificación.
+"""
+
+import pytest
+
+from mesocycle import CAP_NOTE, MesocyclePlanner, week_inputs
+from plan_rules import default_rules
+
+
+def _planner() -> MesocyclePlanner:
+    weeks = [week_inputs(matches=("Saturday",), minutes=60, fatigue=2)]
+    weeks += [week_inputs(matches=("Saturday",), minutes=90, fatigue=3)] * 3
+    return MesocyclePlanner(weeks)
+
+
+def test_capped_week_keeps_match_and_unchanged_sessions():
+    week = _planner().weeks[1]
+    assert week["capped"]
+    uncapped = default_rules().plan(("Saturday",), 3, "Mantener")
+    note = CAP_NOTE.format(pct=round((1 - round(week["load"] / week["target_load"], 2)) * 100))
+    for session, original in zip(week["plan"], uncapped):
+        if session["day"] == "Saturday" or session["intensity"] == original["intensity"]:
+            assert session == original
+        else:
+            assert session["intensity"] < original["intensity"]
+            assert session["detail"].endswith(note)
+
+
+def test_update_week_rejects_out_of_range_index():
+    planner = _planner()
+    for index in (-1, 4):
+        with pytest.raises(ValueError):
+            planner.update_week(index, minutes=30)
+    assert planner.update_week(3, minutes=30) == [3]
@@ -0,0 +1,25 @@
+"""Tests de la exportación del plan (`plan_export`)."""
+
+from datetime import date
+
+import plan_export
+from plan_rules import default_rules
+from trainer_core import week_start
+
+
+def _uids(athlete_id: str) -> set:
+    plan = default_rules().plan(("Saturday",), 3, "Mantener")
+    events = plan_export.iter_ics_events(athlete_id, plan, date(2026, 3, 2), "20260301T000000Z")
+    return {line for event in events for line in event.split("\r\n") if line.startswith("UID:")}
+
+
+def test_uids_do_not_collide_after_sanitizing():
+    assert _uids("a b") and _uids("a_b")
+    assert not _uids("a b") & _uids("a_b")
+    assert _uids("a b") == _uids("a b")
+
+
+def test_week_start_is_next_monday():
+    assert week_start(date(2026, 3, 2)) == date(2026, 3, 2)
+    assert week_start(date(2026, 3, 3)) == date(2026, 3, 9)
+    assert week_start(date(2026, 3, 8)) == date(2026, 3, 9)
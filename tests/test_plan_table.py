@@ -0,0 +1,48 @@
+"""
+Tests de la tabla de planes (`trainer_core.generate_week_plan`) y de las
+reglas compartidas (`plan_rules`) frente a las implementaciones de
+referencia (`_build_week_plan`, `build_fixture_week`).
+"""
+
+import itertools
+
+import pytest
+
+from plan_rules import default_rules
+from trainer_core import (
+    DAYS_ES, FATIGUE_LEVELS, OBJECTIVES, _build_week_plan, build_fixture_week, generate_week_plan,
+)
+
+MATCH_OPTIONS = [(False, None)] + [(True, day) for day in DAYS_ES]
+FIXTURES = [days for n in range(len(DAYS_ES) + 1) for days in itertools.combinations(DAYS_ES, n)]
+
+
+@pytest.mark.parametrize("match, match_day", MATCH_OPTIONS)
+def test_table_matches_reference(match, match_day):
+    for fatigue, objective in itertools.product(FATIGUE_LEVELS, OBJECTIVES):
+        plan = generate_week_plan(match, match_day, fatigue, objective)
+        assert [dict(session) for session in plan] == _build_week_plan(match, match_day, fatigue, objective)
+
+
+def test_table_plans_are_read_only():
+    plan = generate_week_plan(True, "Saturday", 3, "Velocidad")
+    with pytest.raises(TypeError):
+        plan[0] = None
+    with pytest.raises(AttributeError):
+        plan[0].intensity = 0
+
+
+def test_match_day_is_ignored_without_match():
+    assert generate_week_plan(False, "Friday", 2, "Mantener") is generate_week_plan(False, None, 2, "Mantener")
+
+
+@pytest.mark.parametrize("objective", OBJECTIVES)
+def test_rules_match_reference(objective):
+    rules = default_rules()
+    for match_days, fatigue in itertools.product(FIXTURES, FATIGUE_LEVELS):
+        plan = rules.plan(match_days, fatigue, objective)
+        if len(match_days) <= 1:
+            expected = _build_week_plan(bool(match_days), match_days[0] if match_days else None,
+                                        fatigue, objective)
+            assert [dict(session) for session in plan] == expected, (match_days, fatigue)
+        assert plan == build_fixture_week(match_days, fatigue, objective), (match_days, fatigue)
@@ -0,0 +1,66 @@
+"""
+Tests de la importación de wearables (`wearable_import`): formatos de
+entrada, agregación semanal y entradas reemplazadas.
+"""
+
+import json
+
+import pytest
+
+import history_db
+import wearable_import
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = history_db.connect(str(tmp_path / "history.db"))
+    yield conn
+    conn.close()
+
+
+def _write(tmp_path, name: str, text: str) -> str:
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_formats_give_the_same_weeks(tmp_path):
+    sessions = [
+        {"athlete": "Ana", "date": "2026-03-03", "minutes": 60, "rpe": 6},
+        {"athlete": "Ana", "date": "2026-03-05T18:00:00", "duration": 30, "fatigue": 2},
+        {"athlete": "Ana", "date": "2026-03-10", "training_load": 250},
+    ]
+    csv_text = "athlete,date,minutes,rpe,fatigue,training_load\n" + "\n".join(
+        f"{s['athlete']},{s['date']},{s.get('minutes', s.get('duration', ''))},{s.get('rpe', '')},"
+        f"{s.get('fatigue', '')},{s.get('training_load', '')}" for s in sessions
+    )
+    paths = [
+        _write(tmp_path, "a.json", json.dumps(sessions)),
+        _write(tmp_path, "a.jsonl", "\n".join(json.dumps(s) for s in sessions)),
+        _write(tmp_path, "a.csv", csv_text),
+    ]
+    results = [list(wearable_import.weekly_entries(wearable_import.read_sessions(p))) for p in paths]
+    assert results[0] == results[1] == results[2]
+    (athlete, first), (_, second) = results[0]
+    assert athlete == "ana"
+    assert (first["date"], first["load"], first["inputs"]["sessions"]) == ("2026-03-02", 240, 2)
+    assert (second["date"], second["load"]) == ("2026-03-09", 250)
+
+
+def test_non_object_row_is_reported(tmp_path):
+    path = _write(tmp_path, "bad.json", json.dumps([{"athlete": "ana", "date": "2026-03-02"}, 5]))
+    with pytest.raises(ValueError, match="sesión 2"):
+        list(wearable_import.weekly_entries(wearable_import.read_sessions(path)))
+
+
+def test_import_reports_replaced_app_entry(conn):
+    history_db.insert_entry(conn, "ana", {"date": "2026-03-02", "load": 180, "inputs": {"fatigue": 3}})
+    sessions = [{"athlete": "ana", "date": "2026-03-04", "minutes": 70, "fatigue": 3}]
+
+    report = wearable_import.import_sessions(conn, sessions)
+    assert report["weeks"] == 1
+    assert [(a, e["date"], e["load"]) for a, e in report["replaced"]] == [("ana", "2026-03-02", 180)]
+
+    # Volver a importar reemplaza la semana importada, que no se informa
+    assert wearable_import.import_sessions(conn, sessions)["replaced"] == []
+    assert [e["load"] for e in history_db.latest_entries(conn, "ana", 5)] == [210]
@@ -0,0 +1,71 @@
+"""
+Tests de la carga aguda:crónica (`workload`): una carga por semana, la última
+entrada de la semana reemplaza a las anteriores, y el cálculo incremental
+coincide con el vectorizado.
+"""
+
+from datetime import date, timedelta
+
+import pytest
+
+import workload
+from history_records import HistoryColumns
+
+
+def _entry(day: date, load: int) -> dict:
+    return {"date": day.isoformat(), "load": load, "inputs": {"fatigue": 3}}
+
+
+def _history() -> list:
+    start = date(2026, 1, 5)
+    entries = []
+    for week in range(12):
+        if week == 6:
+            continue        # semana sin carga
+        monday = start + timedelta(weeks=week)
+        entries.append(_entry(monday, 300 + 40 * (week % 4)))
+        if week % 3 == 0:
+            entries.append(_entry(monday + timedelta(days=3), 500 + 10 * week))
+    return entries
+
+
+def test_last_entry_of_the_week_wins():
+    state = workload.new_state()
+    workload.update_workload(state, "2026-03-02", 600)
+    workload.update_workload(state, "2026-03-05", 600)
+    ratios = workload.workload_ratios(state)
+    assert ratios["acute"] == 600
+    assert ratios["ewma_acwr"] == pytest.approx(1.0)
+    assert not ratios["chronic_ready"]
+
+
+def test_chronic_ready_after_four_weeks():
+    state = workload.new_state()
+    for week in range(4):
+        workload.update_workload(state, date(2026, 3, 2) + timedelta(weeks=week), 400)
+    ratios = workload.workload_ratios(state)
+    assert ratios["chronic_ready"]
+    assert ratios["acwr"] == pytest.approx(1.0)
+
+
+def test_entries_must_be_in_order():
+    state = workload.update_workload(workload.new_state(), "2026-03-09", 600)
+    with pytest.raises(ValueError):
+        workload.update_workload(state, "2026-03-02", 600)
+
+
+def test_replay_matches_columns():
+    entries = _history()
+    assert workload.replay_workload(entries) == workload.replay_workload(HistoryColumns.from_entries(entries))
+
+
+def test_backfill_matches_replay():
+    pytest.importorskip("pandas")
+    entries = _history()
+    frame, state = workload.backfill_workload(entries)
+    replayed = workload.replay_workload(entries)
+    assert state["last_week"] == replayed["last_week"]
+    assert state["weekly"] == replayed["weekly"]
+    for key in ("ewma_acute", "ewma_chronic"):
+        assert state[key] == pytest.approx(replayed[key])
+        assert frame[key].iloc[-1] == pytest.approx(replayed[key])
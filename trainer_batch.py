@@ -0,0 +1,181 @@
+"""
+Smart Football Trainer — planificación por lotes
+================================================
+Genera el plan semanal y la carga de toda una plantilla (o una liga entera)
+en una sola pasada, a partir de un CSV o de un DataFrame de pandas.
+
+Columnas de entrada:
+    athlete_id, match, match_day, fatigue, objective, minutes
+
+Salida en formato largo, una fila por jugador y día:
+    athlete_id, load, day, type, detail, intensity
+
+Los planes salen de las reglas compartidas (`plan_rules.default_rules`),
+igual que en la app.
+
+Ejecutar:
+    python -m trainer_batch plantilla.csv planes.csv
+"""
+
+import csv
+import sys
+from functools import lru_cache
+
+from plan_rules import default_rules
+from trainer_core import calculate_load, plan_key
+
+SQUAD_COLUMNS = ["athlete_id", "match", "match_day", "fatigue", "objective", "minutes"]
+PLAN_COLUMNS = ["athlete_id", "load", "day", "type", "detail", "intensity"]
+
+_TRUE_VALUES = {"1", "true", "sí", "si", "yes", "y", "s"}
+_FALSE_VALUES = {"0", "false", "no", "n", ""}
+_WRITE_CHUNK = 10_000   # filas por llamada a writerows
+
+
+# ─────────────────────────────────────────────
+# LECTURA DE LA PLANTILLA
+# ─────────────────────────────────────────────
+
+def _parse_bool(value) -> bool:
+    """Interpreta 'Sí'/'No', 1/0, true/false como booleano."""
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in _TRUE_VALUES:
+        return True
+    if text in _FALSE_VALUES:
+        return False
+    raise ValueError(f"valor de partido no reconocido: {value!r}")
+
+
+def parse_athlete_row(row: dict) -> dict:
+    """Normaliza una fila de la plantilla (tipos y día de partido)."""
+    match = _parse_bool(row["match"])
+    return {
+        "athlete_id": str(row["athlete_id"]),
+        "match": match,
+        "match_day": (row.get("match_day") or None) if match else None,
+        "fatigue": int(row["fatigue"]),
+        "objective": row["objective"],
+        "minutes": int(row["minutes"]),
+    }
+
+
+def read_squad_csv(path: str):
+    """Recorre un CSV de plantilla fila por fila, ya normalizado."""
+    with open(path, newline="", encoding="utf-8") as f:
+        for line_no, row in enumerate(csv.DictReader(f), start=2):
+            try:
+                yield parse_athlete_row(row)
+            except (KeyError, ValueError) as exc:
+                raise ValueError(f"{path}, fila {line_no}: {exc}") from exc
+
+
+# ─────────────────────────────────────────────
+# PLANIFICACIÓN
+# ─────────────────────────────────────────────
+
+def _plan(key: tuple) -> tuple:
+    """Plan de una clave de `plan_key` según las reglas compartidas."""
+    match, match_day, fatigue, objective = key
+    return default_rules().plan((match_day,) if match else (), fatigue, objective)
+
+
+@lru_cache(maxsize=None)
+def _plan_rows(key: tuple) -> tuple:
+    """Filas (day, type, detail, intensity) del plan de una clave, calculadas una vez."""
+    return tuple(
+        (s["day"], s["type"], s["detail"], s["intensity"])
+        for s in _plan(key)
+    )
+
+
+def plan_squad(athletes):
+    """
+    Planifica una plantilla a partir de filas normalizadas (ver `parse_athlete_row`).
+    Genera tuplas (athlete_id, load, plan) en el mismo orden de entrada.
+    """
+    for a in athletes:
+        key = plan_key(a["match"], a["match_day"], a["fatigue"], a["objective"])
+        yield a["athlete_id"], calculate_load(a["minutes"], a["fatigue"]), _plan(key)
+
+
+def iter_plan_rows(athletes):
+    """Filas de salida en formato largo (ver `PLAN_COLUMNS`), una por jugador y día."""
+    for a in athletes:
+        key = plan_key(a["match"], a["match_day"], a["fatigue"], a["objective"])
+        head = (a["athlete_id"], calculate_load(a["minutes"], a["fatigue"]))
+        for tail in _plan_rows(key):
+            yield head + tail
+
+
+def plan_squad_frame(df):
+    """
+    Versión vectorizada para un DataFrame de pandas con las columnas de `SQUAD_COLUMNS`.
+
+    La carga se calcula columna a columna y los planes se obtienen con un
+    único merge contra la tabla de planes (a lo sumo 120 combinaciones
+    distintas), sin recorrer jugadores en Python. Devuelve un DataFrame con
+    las columnas de `PLAN_COLUMNS`.
+    """
+    import pandas as pd
+
+    squad = pd.DataFrame({
+        "athlete_id": df["athlete_id"].astype(str),
+        "match": df["match"].map(_parse_bool),
+        "fatigue": df["fatigue"].astype(int),
+        "objective": df["objective"],
+        "load": calculate_load(df["minutes"].astype(int), df["fatigue"].astype(int)),
+    })
+    squad["match_day"] = df["match_day"].where(squad["match"], None)
+
+    keys = squad[["match", "match_day", "fatigue", "objective"]].drop_duplicates()
+    plans = pd.DataFrame.from_records(
+        [key + row
+         for key in keys.itertuples(index=False, name=None)
+         for row in _plan_rows(plan_key(*key))],
+        columns=["match", "match_day", "fatigue", "objective", "day", "type", "detail", "intensity"],
+    )
+    # El merge no empareja None con None de forma fiable: se usa un marcador
+    on = ["match", "match_day", "fatigue", "objective"]
+    merged = squad.fillna({"match_day": ""}).merge(plans.fillna({"match_day": ""}), on=on, sort=False)
+    return merged[PLAN_COLUMNS].reset_index(drop=True)
+
+
+# ─────────────────────────────────────────────
+# ESCRITURA EN BLOQUE
+# ─────────────────────────────────────────────
+
+def write_plan_rows(rows, out) -> int:
+    """
+    Escribe filas de `iter_plan_rows` como CSV en `out` (ruta o archivo abierto),
+    en bloques de `_WRITE_CHUNK` filas. Devuelve la cantidad de filas escritas.
+    """
+    if isinstance(out, str):
+        with open(out, "w", newline="", encoding="utf-8") as f:
+            return write_plan_rows(rows, f)
+
+    writer = csv.writer(out)
+    writer.writerow(PLAN_COLUMNS)
+    total = 0
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= _WRITE_CHUNK:
+            writer.writerows(chunk)
+            total += len(chunk)
+            chunk.clear()
+    writer.writerows(chunk)
+    return total + len(chunk)
+
+
+def main(argv: list) -> None:
+    """Uso: python -m trainer_batch plantilla.csv planes.csv"""
+    if len(argv) != 3:
+        sys.exit(main.__doc__)
+    count = write_plan_rows(iter_plan_rows(read_squad_csv(argv[1])), argv[2])
+    print(f"{count // 7} jugadores planificados → {argv[2]}")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
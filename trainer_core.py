@@ -0,0 +1,371 @@
+"""
+Smart Football Trainer — núcleo de planificación
+================================================
+Lógica pura del plan semanal y de la carga, sin dependencias de Streamlit.
+Se puede importar desde la app, scripts por lotes, tests u otros servicios
+sin costo de interfaz: solo usa la biblioteca estándar.
+"""
+
+import sys
+from functools import lru_cache
+from types import MappingProxyType
+
+from records import Record
+
+# ─────────────────────────────────────────────
+# CONSTANTES
+# ─────────────────────────────────────────────
+DAYS_ES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+DAYS_LABEL = {
+    "Monday": "Lunes", "Tuesday": "Martes", "Wednesday": "Miércoles",
+    "Thursday": "Jueves", "Friday": "Viernes", "Saturday": "Sábado", "Sunday": "Domingo"
+}
+OBJECTIVES = ["Velocidad", "Resistencia", "Mantener"]
+FATIGUE_LEVELS = [1, 2, 3, 4, 5]
+
+# Sesiones fijas (se copian antes de usarlas en un plan)
+_REST_SESSION = {"type": "Descanso", "detail": "Recuperación completa. Hidratación y sueño.", "intensity": 0}
+_MATCH_SESSION = {
+    "type": "⚽ MATCH DAY",
+    "detail": "Partido oficial. Calentamiento 15 min. Mantén concentración.",
+    "intensity": 5
+}
+_REGEN_SESSION = {
+    "type": "Regenerativo",
+    "detail": "Trote suave 15 min + estiramientos. Foco en recuperación.",
+    "intensity": 1
+}
+_ACTIVATION_SESSION = {
+    "type": "Activación",
+    "detail": "Activación corta 20 min: movilidad, pases cortos, remates suaves.",
+    "intensity": 2
+}
+
+_SESSION_FIELDS = ("day", "type", "detail", "intensity")
+
+
+# ─────────────────────────────────────────────
+# SESIÓN DEL PLAN
+# ─────────────────────────────────────────────
+
+class Session(Record):
+    """
+    Sesión de un día del plan: inmutable y sin `__dict__`.
+    Se lee como atributo (`session.type`) o como mapping (`session["type"]`,
+    `dict(session)`), igual que los dicts que reemplaza.
+    """
+    __slots__ = _fields = _SESSION_FIELDS
+
+    def __init__(self, day: str, type: str, detail: str, intensity: int):
+        super().__init__(day, type, detail, intensity)
+
+
+@lru_cache(maxsize=None)
+def make_session(day: str, type: str, detail: str, intensity: int) -> Session:
+    """
+    Sesión internada: la misma combinación de valores devuelve siempre el mismo
+    objeto, así los planes que repiten sesiones no duplican textos ni registros.
+    """
+    return Session(sys.intern(day), sys.intern(type), sys.intern(detail), intensity)
+
+
+# ─────────────────────────────────────────────
+# CARGA Y PLAN SEMANAL
+# ─────────────────────────────────────────────
+
+def calculate_load(minutes: int, fatigue: int) -> int:
+    """
+    Calcula la carga semanal del jugador.
+    Fórmula: carga = minutos * fatiga
+    """
+    return minutes * fatigue
+
+
+def day_offset(base_day: str, offset: int) -> str:
+    """Devuelve el día de la semana sumando 'offset' días a 'base_day'."""
+    idx = DAYS_ES.index(base_day)
+    return DAYS_ES[(idx + offset) % 7]
+
+
+def week_start(today: "date") -> "date":
+    """Lunes en que empieza el plan: hoy si es lunes, si no el próximo lunes."""
+    # Por ordinal, sin importar `datetime`: el núcleo no lo necesita para nada más
+    return today.fromordinal(today.toordinal() + (7 - today.weekday()) % 7)
+
+
+def intensity_bar_html(level: int, max_level: int = 5) -> str:
+    """Genera una barra de intensidad visual en HTML."""
+    colors = ["#607d8b", "#8bc34a", "#ffeb3b", "#ff9800", "#f44336"]
+    color = colors[min(level - 1, 4)]
+    width = int((level / max_level) * 100)
+    return (
+        f'<div class="intensity-bar" style="width:{width}%;background:{color};"></div>'
+        f'<span style="font-size:0.78rem;color:{color};margin-left:6px;">{level}/5</span>'
+    )
+
+
+def card_class(session_type: str) -> str:
+    """Determina la clase CSS de la tarjeta según el tipo de sesión."""
+    t = session_type.lower()
+    if "match" in t or "partido" in t:
+        return "match"
+    if "rest" in t or "descanso" in t:
+        return "rest"
+    if "regen" in t or "recup" in t:
+        return "regen"
+    if "baja" in t or "activaci" in t:
+        return "low"
+    if "media" in t:
+        return "medium"
+    return "high"
+
+
+def generate_week_plan(
+    match: bool,
+    match_day: str,
+    fatigue: int,
+    objective: str
+) -> tuple:
+    """
+    Devuelve el plan semanal de entrenamiento.
+
+    El dominio de entradas es finito (sin partido o 7 días de partido × 5
+    fatigas × 3 objetivos), así que todos los planes se precalculan una vez
+    y cada llamada es una búsqueda O(1) en la tabla.
+
+    Devuelve una tupla de 7 `Session` internadas (lunes a domingo), que se
+    leen como los dicts { 'day', 'type', 'detail', 'intensity' }.
+    Las entradas fuera del dominio se calculan con `_build_week_plan`.
+
+    Son las ramas de referencia: la app y los demás módulos planifican con
+    las reglas de `plan_rules.yaml` (`plan_rules.default_rules`), que dan el
+    mismo plan mientras no se editen (ver `benchmarks/bench_plan_rules`).
+    """
+    key = plan_key(match, match_day, fatigue, objective)
+    plan = _plan_table().get(key)
+    if plan is None:
+        plan = _freeze_plan(_build_week_plan(match, match_day, fatigue, objective))
+    return plan
+
+
+def plan_key(match: bool, match_day: str, fatigue: int, objective: str) -> tuple:
+    """Clave normalizada de la tabla de planes (sin partido, el día no importa)."""
+    return (bool(match), match_day if match else None, fatigue, objective)
+
+
+def _freeze_plan(plan: list) -> tuple:
+    """Convierte un plan (lista de dicts) en una tupla de sesiones internadas."""
+    return tuple(make_session(**session) for session in plan)
+
+
+@lru_cache(maxsize=None)
+def _plan_table() -> MappingProxyType:
+    """Tabla inmutable con todos los planes posibles, construida la primera vez que se usa."""
+    table = {}
+    for fatigue in FATIGUE_LEVELS:
+        for objective in OBJECTIVES:
+            table[plan_key(False, None, fatigue, objective)] = _freeze_plan(
+                _build_week_plan(False, None, fatigue, objective))
+            for match_day in DAYS_ES:
+                table[plan_key(True, match_day, fatigue, objective)] = _freeze_plan(
+                    _build_week_plan(True, match_day, fatigue, objective))
+    return MappingProxyType(table)
+
+
+def _build_week_plan(
+    match: bool,
+    match_day: str,
+    fatigue: int,
+    objective: str
+) -> list:
+    """
+    Construye el plan semanal de entrenamiento (implementación de referencia
+    con la que se llena la tabla de `generate_week_plan`).
+
+    Parámetros:
+        match      - ¿Hay partido esta semana?
+        match_day  - Día del partido (string del día en inglés)
+        fatigue    - Nivel de fatiga (1–5)
+        objective  - 'Velocidad' | 'Resistencia' | 'Mantener'
+
+    Devuelve lista de dicts:
+        [{ 'day', 'type', 'detail', 'intensity' }, ...]
+    """
+
+    # Inicializar plan con descanso por defecto
+    plan = {day: dict(_REST_SESSION) for day in DAYS_ES}
+
+    if match:
+        idx_match = DAYS_ES.index(match_day)
+
+        # Día del partido
+        plan[match_day] = dict(_MATCH_SESSION)
+
+        # Día posterior → regenerativo
+        post = DAYS_ES[(idx_match + 1) % 7]
+        plan[post] = dict(_REGEN_SESSION)
+
+        # 3 días antes → intensidad media
+        day_minus3 = DAYS_ES[(idx_match - 3) % 7]
+        plan[day_minus3] = _build_session("media", fatigue, objective)
+
+        # 2 días antes → intensidad baja
+        day_minus2 = DAYS_ES[(idx_match - 2) % 7]
+        plan[day_minus2] = _build_session("baja", fatigue, objective)
+
+        # 1 día antes → activación corta (NUNCA intenso)
+        day_minus1 = DAYS_ES[(idx_match - 1) % 7]
+        plan[day_minus1] = dict(_ACTIVATION_SESSION)
+
+    else:
+        # Sin partido: plan distribuido por objetivos
+        sessions = _no_match_sessions(objective)
+        rest_days = set()
+
+        # Distribuir sesiones en días no consecutivos preferentemente
+        used = []
+        for i, session in enumerate(sessions):
+            day = DAYS_ES[i]
+            plan[day] = session
+            used.append(day)
+
+        # Los 2 días restantes quedan como descanso (ya inicializados)
+
+    _apply_fatigue_adjustment(plan, fatigue)
+
+    # Construir lista ordenada de lunes a domingo
+    return [{"day": day, **plan[day]} for day in DAYS_ES]
+
+
+def build_fixture_week(match_days, fatigue: int, objective: str) -> tuple:
+    """
+    Plan semanal con cualquier cantidad de partidos (0, 1 o varios).
+
+    Con 0 o 1 partido es exactamente `generate_week_plan`. Con varios, cada
+    partido reserva sus días alrededor (-3 media, -2 baja, -1 activación,
+    +1 regenerativo) y, si dos partidos reclaman el mismo día, gana la sesión
+    más liviana para el partido más cercano (partido > activación >
+    regenerativo > baja > media). Devuelve la misma tupla de `Session` que
+    `generate_week_plan`; como esta, es la referencia de `plan_rules`.
+    """
+    days = tuple(day for day in DAYS_ES if day in set(match_days))
+    if len(days) <= 1:
+        return generate_week_plan(bool(days), days[0] if days else None, fatigue, objective)
+    return _fixture_week(days, fatigue, objective)
+
+
+@lru_cache(maxsize=1024)
+def _fixture_week(match_days: tuple, fatigue: int, objective: str) -> tuple:
+    """Plan congelado de una semana con varios partidos (memoizado)."""
+    plan = {day: dict(_REST_SESSION) for day in DAYS_ES}
+    rank = {}
+
+    def place(day: str, session: dict, priority: int) -> None:
+        if priority > rank.get(day, 0):
+            plan[day] = session
+            rank[day] = priority
+
+    for match_day in match_days:
+        idx_match = DAYS_ES.index(match_day)
+        place(DAYS_ES[(idx_match - 3) % 7], _build_session("media", fatigue, objective), 1)
+        place(DAYS_ES[(idx_match - 2) % 7], _build_session("baja", fatigue, objective), 2)
+        place(DAYS_ES[(idx_match + 1) % 7], dict(_REGEN_SESSION), 3)
+        place(DAYS_ES[(idx_match - 1) % 7], dict(_ACTIVATION_SESSION), 4)
+        place(match_day, dict(_MATCH_SESSION), 5)
+
+    _apply_fatigue_adjustment(plan, fatigue)
+    return _freeze_plan([{"day": day, **plan[day]} for day in DAYS_ES])
+
+
+def _apply_fatigue_adjustment(plan: dict, fatigue: int) -> None:
+    """Ajuste de volumen si fatiga >= 4: reducir intensidad en 1 (mínimo 1)."""
+    if fatigue >= 4:
+        for day, session in plan.items():
+            if session["intensity"] > 1:
+                session["intensity"] = max(1, session["intensity"] - 1)
+                session["detail"] += " [Vol. -30% por fatiga alta]"
+
+
+def _build_session(intensity_level: str, fatigue: int, objective: str) -> dict:
+    """Genera una sesión según nivel de intensidad y objetivo."""
+    if intensity_level == "media":
+        if objective == "Velocidad":
+            return {
+                "type": "Velocidad / Media",
+                "detail": "Pasadas cortas 5×30m + circuito de agilidad 3 rondas.",
+                "intensity": 3
+            }
+        elif objective == "Resistencia":
+            return {
+                "type": "Resistencia / Media",
+                "detail": "Carrera continua 30 min ritmo moderado + técnica de balón.",
+                "intensity": 3
+            }
+        else:
+            return {
+                "type": "Balanceado / Media",
+                "detail": "Técnica de pase 20 min + trote 20 min. Ejercicios tácticos.",
+                "intensity": 3
+            }
+    else:  # baja
+        if objective == "Velocidad":
+            return {
+                "type": "Velocidad / Baja",
+                "detail": "Aceleración progresiva 4×20m. Sin forzar. Técnica de carrera.",
+                "intensity": 2
+            }
+        elif objective == "Resistencia":
+            return {
+                "type": "Aeróbico / Baja",
+                "detail": "Trote suave 25 min. Mantener frecuencia cardíaca baja.",
+                "intensity": 2
+            }
+        else:
+            return {
+                "type": "Técnica / Baja",
+                "detail": "Control, dominio y pases cortos. Ritmo tranquilo 25 min.",
+                "intensity": 2
+            }
+
+
+def _no_match_sessions(objective: str) -> list:
+    """Devuelve 5 sesiones para semana sin partido según objetivo."""
+    base = [
+        {
+            "type": "VO₂ Máx",
+            "detail": "Intervalos: 8×1 min al 90% + 1 min descanso. Mejora capacidad aeróbica.",
+            "intensity": 5
+        },
+        {
+            "type": "Pasadas Explosivas",
+            "detail": "Sprints 6×40m + cambios de dirección. Máxima potencia muscular.",
+            "intensity": 4
+        },
+        {
+            "type": "Fondo",
+            "detail": "Carrera continua 40 min a ritmo cómodo. Construir base aeróbica.",
+            "intensity": 3
+        },
+        {
+            "type": "Técnica",
+            "detail": "Control, regate, pases en corto y largo. Dominio del balón 45 min.",
+            "intensity": 2
+        },
+        {
+            "type": "Descanso Activo",
+            "detail": "Estiramientos, movilidad articular y foam roller 20 min.",
+            "intensity": 1
+        }
+    ]
+
+    # Ajuste por objetivo
+    if objective == "Velocidad":
+        base[1]["detail"] = "Sprints 8×30m + reacciones explosivas. Énfasis en potencia de arranque."
+        base[1]["intensity"] = 5
+        base[0]["detail"] = "Intervalos cortos: 10×30s al máximo + 90s descanso (pasadas explosivas)."
+    elif objective == "Resistencia":
+        base[2]["detail"] = "Carrera continua 45 min ritmo moderado-alto. Trabajo aeróbico principal."
+        base[2]["intensity"] = 4
+        base[0]["detail"] = "VO₂ Máx largo: 6×2 min al 85% + 2 min recuperación activa."
+
+    return base
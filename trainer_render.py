@@ -0,0 +1,157 @@
+"""
+Smart Football Trainer — HTML de resultados
+===========================================
+Genera el HTML de las secciones de resultado (tarjetas de carga, plan
+semanal, disposición prevista e historial), cada una como un único bloque
+para emitirlo con una sola llamada a `st.markdown`.
+
+Las funciones están memoizadas y su clave es el contenido mostrado: como los
+planes salen de una tabla finita, volver a mostrar un plan ya renderizado no
+reconstruye su HTML. No depende de Streamlit.
+"""
+
+from functools import lru_cache
+
+from trainer_core import DAYS_LABEL, card_class, intensity_bar_html
+from workload import ACWR_DANGER, ACWR_SWEET_SPOT
+
+_REST_BAR = '<span style="font-size:0.78rem;color:#455a64;">Descanso</span>'
+
+
+# ─────────────────────────────────────────────
+# CARGA SEMANAL
+# ─────────────────────────────────────────────
+
+def _load_card(label: str, value, color: str = None) -> str:
+    """Tarjeta individual de la sección de carga."""
+    style = f' style="color:{color}"' if color else ""
+    return (
+        f'<div class="load-card" style="text-align:center">'
+        f'<div class="load-label">{label}</div>'
+        f'<div class="load-number"{style}>{value}</div>'
+        f'</div>'
+    )
+
+
+@lru_cache(maxsize=1024)
+def load_cards_html(current_load: int, prev_load, variation_pct, acwr) -> str:
+    """Las cuatro tarjetas de carga (actual, anterior, variación, ACWR) en una grilla."""
+    if variation_pct is not None:
+        sign = "+" if variation_pct > 0 else ""
+        var_color = "#f44336" if variation_pct > 20 else ("#00e676" if variation_pct <= 0 else "#ffc107")
+        var_str = f"{sign}{variation_pct:.1f}%"
+    else:
+        var_str, var_color = "—", "#607d8b"
+
+    if acwr is not None:
+        low, high = ACWR_SWEET_SPOT
+        acwr_color = "#f44336" if acwr > ACWR_DANGER else ("#00e676" if low <= acwr <= high else "#ffc107")
+        acwr_str = f"{acwr:.2f}"
+    else:
+        acwr_str, acwr_color = "—", "#607d8b"
+
+    cards = (
+        _load_card("Carga actual", current_load)
+        + _load_card("Carga anterior", prev_load if prev_load is not None else "—", "#607d8b")
+        + _load_card("Variación", var_str, var_color)
+        + _load_card("ACWR", acwr_str, acwr_color)
+    )
+    return f'<div style="display:grid;grid-template-columns:repeat(4,1fr);gap:0.75rem;">{cards}</div>'
+
+
+@lru_cache(maxsize=1024)
+def overload_warning_html(acwr, variation_pct) -> str:
+    """Advertencia de sobrecarga: por ACWR si se indica, si no por variación semanal."""
+    if acwr is not None:
+        return (
+            f'<div class="warning-box">⚠️ <strong>Advertencia de sobrecarga:</strong> '
+            f'Tu relación de carga aguda:crónica (ACWR) es <strong>{acwr:.2f}</strong> '
+            f'(zona segura: {ACWR_SWEET_SPOT[0]}–{ACWR_SWEET_SPOT[1]}, riesgo alto por encima de {ACWR_DANGER}). '
+            f'Considera reducir volumen o intensidad para evitar lesiones.</div>'
+        )
+    return (
+        f'<div class="warning-box">⚠️ <strong>Advertencia de sobrecarga:</strong> '
+        f'Tu carga aumentó un <strong>{variation_pct:.1f}%</strong> respecto a la semana pasada '
+        f'(límite recomendado: 20%). Considera reducir volumen o intensidad para evitar lesiones.</div>'
+    )
+
+
+# ─────────────────────────────────────────────
+# PLAN SEMANAL
+# ─────────────────────────────────────────────
+
+def day_cards_html(week_plan) -> str:
+    """Las siete tarjetas de día del plan en un único bloque HTML."""
+    return _day_cards_html(tuple(
+        (s["day"], s["type"], s["detail"], s["intensity"]) for s in week_plan
+    ))
+
+
+@lru_cache(maxsize=512)
+def _day_cards_html(sessions: tuple) -> str:
+    """HTML de las tarjetas, memoizado por el contenido de las sesiones."""
+    cards = []
+    for day, s_type, s_detail, s_intensity in sessions:
+        bar_html = intensity_bar_html(s_intensity) if s_intensity > 0 else _REST_BAR
+        cards.append(
+            f'<div class="day-card {card_class(s_type)}">'
+            f'  <div style="display:flex;justify-content:space-between;align-items:center;">'
+            f'    <span class="day-name">{DAYS_LABEL[day]}</span>'
+            f'    <span class="day-type">{s_type}</span>'
+            f'  </div>'
+            f'  <div class="day-detail">{s_detail}</div>'
+            f'  <div style="margin-top:8px;">{bar_html}</div>'
+            f'</div>'
+        )
+    return "".join(cards)
+
+
+def forecast_html(forecast) -> str:
+    """Fila de disposición prevista por día (valores redondeados)."""
+    return _forecast_html(tuple(
+        (day["day"], f'{day["readiness"]:+.0f}', day["readiness"] >= 0) for day in forecast
+    ))
+
+
+@lru_cache(maxsize=1024)
+def _forecast_html(days: tuple) -> str:
+    """HTML de la fila de disposición, memoizado por día y valor mostrado."""
+    cells = "".join(
+        f'<div style="flex:1;text-align:center;">'
+        f'<div class="load-label">{DAYS_LABEL[day][:3]}</div>'
+        f'<div style="font-family:Barlow Condensed,sans-serif;font-size:1.2rem;font-weight:700;'
+        f'color:{"#00e676" if positive else "#ff9800"};">{value}</div>'
+        f'</div>'
+        for day, value, positive in days
+    )
+    return f'<div class="load-card" style="display:flex;gap:4px;">{cells}</div>'
+
+
+# ─────────────────────────────────────────────
+# HISTORIAL
+# ─────────────────────────────────────────────
+
+def history_panel_html(history: list) -> str:
+    """Filas del historial reciente (la entrada más reciente primero) en un único bloque."""
+    return _history_panel_html(tuple(
+        (entry["date"], entry["inputs"].get("objective", "—"), entry["load"]) for entry in history
+    ))
+
+
+@lru_cache(maxsize=1024)
+def _history_panel_html(rows: tuple) -> str:
+    """HTML del historial, memoizado por las filas mostradas."""
+    html = []
+    for i, (entry_date, obj_str, load) in enumerate(reversed(rows)):
+        label = "Esta semana" if i == 0 else entry_date
+        emoji = "🔥" if i == 0 else "📅"
+        html.append(
+            f'<div style="display:flex;justify-content:space-between;padding:6px 0;'
+            f'border-bottom:1px solid rgba(255,255,255,0.05);font-size:0.88rem;">'
+            f'<span style="color:#90a4ae;">{emoji} {label}</span>'
+            f'<span style="color:#b0bec5;">{obj_str}</span>'
+            f'<span style="color:#00e676;font-family:Barlow Condensed,sans-serif;'
+            f'font-size:1rem;font-weight:700;">{load}</span>'
+            f'</div>'
+        )
+    return "".join(html)
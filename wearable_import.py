@@ -0,0 +1,232 @@
+"""
+Smart Football Trainer — importación de exportaciones de wearables/GPS
+=====================================================================
+Importa exportaciones de sesiones (CSV, JSON Lines o un array JSON) al
+historial SQLite, agrupadas en una entrada por jugador y semana con el mismo
+formato que las de la app:
+
+    { 'date': lunes de la semana, 'load', 'inputs': { 'minutes_played',
+      'fatigue', 'sessions', 'source': 'wearable' } }
+
+El archivo se lee fila por fila (el array JSON, por bloques), así que la
+memoria depende de la cantidad de semanas × jugadores y no del tamaño del
+archivo. Las entradas se insertan en transacciones de `IMPORT_BATCH`.
+
+El historial guarda una entrada por jugador y día: la semana importada
+reemplaza a la entrada que el jugador ya tuviera ese lunes (por ejemplo, la
+que guardó la app). `import_sessions` informa esas entradas reemplazadas
+(sin contar las de importaciones anteriores) para que no se pierdan en
+silencio.
+
+Columnas reconocidas por sesión (se aceptan los alias entre paréntesis):
+    athlete_id (athlete, player) · date (timestamp, start_time)
+    minutes (duration_min, duration) · load (training_load) · fatigue (rpe)
+
+La carga de cada sesión es `load` si viene en la exportación; si no,
+`calculate_load(minutos, fatiga)`. Un RPE de 1–10 se convierte a la escala
+de fatiga 1–5 de la app.
+
+Ejecutar:
+    python -m wearable_import export.csv [--db training_history.db] [--athlete nombre]
+"""
+
+import argparse
+import csv
+import json
+import math
+import re
+from datetime import date, timedelta
+
+import history_db
+from history_records import HistoryEntry, entry_inputs
+from trainer_core import FATIGUE_LEVELS, calculate_load
+
+IMPORT_BATCH = 5_000        # entradas semanales por transacción
+DEFAULT_FATIGUE = 3         # fatiga supuesta si la sesión no la informa
+_READ_CHUNK = 1 << 20       # caracteres por lectura del array JSON
+_SEPARATORS = re.compile(r"[\s,]*")
+
+_ALIASES = {
+    "athlete_id": ("athlete_id", "athlete", "player"),
+    "date": ("date", "timestamp", "start_time"),
+    "minutes": ("minutes", "duration_min", "duration"),
+    "load": ("load", "training_load"),
+    "fatigue": ("fatigue",),
+    "rpe": ("rpe",),
+}
+
+
+# ─────────────────────────────────────────────
+# LECTURA EN STREAMING
+# ─────────────────────────────────────────────
+
+def _iter_json_array(f):
+    """Recorre los objetos de un array JSON leyendo el archivo por bloques."""
+    decoder = json.JSONDecoder()
+    buffer = f.read(_READ_CHUNK)
+    pos = _SEPARATORS.match(buffer).end()
+    if not buffer.startswith("[", pos):
+        raise ValueError("se esperaba un array JSON")
+    pos += 1
+    while True:
+        pos = _SEPARATORS.match(buffer, pos).end()
+        if buffer.startswith("]", pos):
+            return
+        try:
+            if pos == len(buffer):
+                raise json.JSONDecodeError("fin del bloque", buffer, pos)
+            obj, pos = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            # Objeto cortado al final del bloque: se agrega el siguiente
+            chunk = f.read(_READ_CHUNK)
+            if not chunk:
+                raise ValueError("array JSON incompleto o inválido") from None
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+        yield obj
+
+
+def read_sessions(path: str):
+    """
+    Recorre las sesiones de una exportación (dict por sesión).
+    El formato se detecta por el contenido: array JSON, JSON Lines o CSV.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        head = f.read(1)
+        while head.isspace():
+            head = f.read(1)
+        f.seek(0)
+        if head == "[":
+            yield from _iter_json_array(f)
+        elif head == "{":
+            for line_no, line in enumerate(f, start=1):
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError as exc:
+                        raise ValueError(f"{path}, línea {line_no}: {exc}") from exc
+        else:
+            yield from csv.DictReader(f)
+
+
+# ─────────────────────────────────────────────
+# AGREGACIÓN SEMANAL
+# ─────────────────────────────────────────────
+
+def _field(row: dict, name: str):
+    """Valor de una columna por su nombre o alias (None si falta o está vacía)."""
+    for key in _ALIASES[name]:
+        value = row.get(key)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def _session_fatigue(row: dict):
+    """Fatiga 1–5 de la sesión: columna `fatigue` o RPE 1–10 convertido."""
+    fatigue = _field(row, "fatigue")
+    if fatigue is None:
+        rpe = _field(row, "rpe")
+        if rpe is None:
+            return None
+        fatigue = math.ceil(float(rpe) / 2)
+    return min(max(round(float(fatigue)), FATIGUE_LEVELS[0]), FATIGUE_LEVELS[-1])
+
+
+def parse_session(row: dict, default_athlete: str = None) -> tuple:
+    """Normaliza una sesión: (athlete_id, lunes de la semana, minutos, carga, fatiga o None)."""
+    athlete = _field(row, "athlete_id") or default_athlete
+    if athlete is None:
+        raise ValueError("falta athlete_id (o use --athlete)")
+    day = date.fromisoformat(str(_field(row, "date"))[:10])
+    minutes = float(_field(row, "minutes") or 0)
+    fatigue = _session_fatigue(row)
+    load = _field(row, "load")
+    load = float(load) if load is not None else calculate_load(minutes, fatigue or DEFAULT_FATIGUE)
+    return (" ".join(str(athlete).split()).lower(),
+            day - timedelta(days=day.weekday()), minutes, load, fatigue)
+
+
+def weekly_entries(sessions, default_athlete: str = None):
+    """
+    Agrupa sesiones por jugador y semana. Genera pares (athlete_id, `HistoryEntry`)
+    ordenados por fecha, una vez leídas todas las sesiones.
+    """
+    weeks = {}   # (athlete_id, lunes) → [minutos, carga, suma de fatiga, sesiones con fatiga, sesiones]
+    for line_no, row in enumerate(sessions, start=1):
+        if not isinstance(row, dict):
+            raise ValueError(f"sesión {line_no}: se esperaba un objeto, no {type(row).__name__}")
+        try:
+            athlete, monday, minutes, load, fatigue = parse_session(row, default_athlete)
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"sesión {line_no}: {exc}") from exc
+        acc = weeks.setdefault((athlete, monday), [0.0, 0.0, 0, 0, 0])
+        acc[0] += minutes
+        acc[1] += load
+        if fatigue is not None:
+            acc[2] += fatigue
+            acc[3] += 1
+        acc[4] += 1
+
+    for (athlete, monday), (minutes, load, fatigue_sum, rated, count) in sorted(
+            weeks.items(), key=lambda item: item[0][1]):
+        yield athlete, HistoryEntry(monday.isoformat(), round(load), entry_inputs(
+            minutes_played=round(minutes),
+            fatigue=round(fatigue_sum / rated) if rated else None,
+            sessions=count,
+            source="wearable",
+        ))
+
+
+# ─────────────────────────────────────────────
+# INSERCIÓN EN BLOQUE
+# ─────────────────────────────────────────────
+
+def import_sessions(conn, sessions, default_athlete: str = None, batch_size: int = IMPORT_BATCH) -> dict:
+    """
+    Inserta las semanas de `sessions` en el historial, `batch_size` por transacción.
+    Devuelve { 'weeks': semanas insertadas, 'replaced': pares (athlete_id,
+    `HistoryEntry`) de entradas que no venían de una importación y quedaron
+    reemplazadas por una semana importada del mismo día }.
+    """
+    report = {"weeks": 0, "replaced": []}
+
+    def insert(batch):
+        report["replaced"] += [
+            (athlete_id, entry) for athlete_id, entry in history_db.same_day_entries(conn, batch)
+            if entry["inputs"].get("source") != "wearable"
+        ]
+        report["weeks"] += history_db.insert_batch(conn, batch)
+
+    batch = []
+    for item in weekly_entries(sessions, default_athlete):
+        batch.append(item)
+        if len(batch) >= batch_size:
+            insert(batch)
+            batch.clear()
+    if batch:
+        insert(batch)
+    return report
+
+
+def import_file(conn, path: str, default_athlete: str = None, batch_size: int = IMPORT_BATCH) -> dict:
+    """Importa una exportación (CSV, JSON Lines o array JSON). Devuelve el informe de `import_sessions`."""
+    return import_sessions(conn, read_sessions(path), default_athlete, batch_size)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Importa sesiones de wearables al historial por semana.")
+    parser.add_argument("export", help="archivo CSV, JSON Lines o array JSON")
+    parser.add_argument("--db", default="training_history.db")
+    parser.add_argument("--athlete", help="jugador de las sesiones sin columna athlete_id")
+    args = parser.parse_args(argv)
+
+    conn = history_db.connect(args.db)
+    report = import_file(conn, args.export, args.athlete)
+    print(f"{report['weeks']} semanas importadas → {args.db}")
+    for athlete_id, entry in report["replaced"]:
+        print(f"  reemplazada: {athlete_id} {entry['date']} (carga {entry['load']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Smart Football Trainer — relación de carga aguda:crónica (ACWR)
+===============================================================
+Cada entrada del historial es la carga de una semana (minutos de la semana
+anterior × fatiga), así que las ventanas se cuentan en semanas: la carga
+aguda es la de la última semana y la crónica, el promedio de las últimas 4.
+Dos variantes:
+  - promedio móvil: carga de 1 semana  vs  suma de 4 semanas / 4
+  - EWMA: medias exponenciales semanales con λ = 2 / (N + 1) para N = 1 y N = 4
+
+Con una carga semanal constante, ambos cocientes dan 1.0.
+
+Las semanas van de lunes a domingo y cada una tiene una sola carga: si hay
+varias entradas en la misma semana, la última reemplaza a las anteriores
+(volver a generar el plan no suma la carga dos veces). Las semanas sin
+entradas cuentan como carga 0.
+
+Cada jugador tiene un estado acumulado (`new_state`) que se actualiza en O(1)
+con cada entrada nueva (`update_workload`), sin releer el historial. Para
+reconstruir el estado desde cero sobre todo el historial hay una versión
+vectorizada con pandas (`backfill_workload`) y una en Python puro
+(`replay_workload`) que dan el mismo resultado.
+"""
+
+from datetime import date
+
+from history_records import HistoryColumns, week_number
+
+ACUTE_WEEKS = 1
+CHRONIC_WEEKS = 4
+LAMBDA_ACUTE = 2 / (ACUTE_WEEKS + 1)
+LAMBDA_CHRONIC = 2 / (CHRONIC_WEEKS + 1)
+
+ACWR_SWEET_SPOT = (0.8, 1.3)    # zona de adaptación segura
+ACWR_DANGER = 1.5               # por encima, riesgo elevado de lesión
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_EWMA = (("acute", LAMBDA_ACUTE), ("chronic", LAMBDA_CHRONIC))
+
+
+# ─────────────────────────────────────────────
+# ESTADO INCREMENTAL
+# ─────────────────────────────────────────────
+
+def new_state() -> dict:
+    """Estado vacío (serializable a JSON) de un jugador sin historial."""
+    return {
+        "first_week": None,             # número de la primera semana con carga
+        "last_week": None,              # número de la última semana con carga
+        "weekly": [0] * CHRONIC_WEEKS,  # buffer circular: carga de la semana w en weekly[w % 4]
+        # EWMA hasta la semana anterior a `last_week`, ya decaída: la media de
+        # la última semana es base + λ·carga, así se puede reemplazar su carga
+        "base_acute": 0.0,
+        "base_chronic": 0.0,
+        "ewma_acute": 0.0,
+        "ewma_chronic": 0.0,
+    }
+
+
+def _advance(state: dict, week: int) -> None:
+    """Corre el estado hasta `week` con carga 0 en las semanas intermedias y en `week`."""
+    last = state["last_week"]
+    gap = week - last
+    if gap <= 0:
+        return
+    weekly = state["weekly"]
+    for w in range(last + 1, last + 1 + min(gap, CHRONIC_WEEKS)):
+        weekly[w % CHRONIC_WEEKS] = 0
+    for name, lam in _EWMA:
+        state[f"base_{name}"] = state[f"ewma_{name}"] = state[f"ewma_{name}"] * (1 - lam) ** gap
+    state["last_week"] = week
+
+
+def update_workload(state: dict, day, load) -> dict:
+    """
+    Registra la carga de la semana de `day` en el estado del jugador en O(1)
+    y lo devuelve. Si la semana ya tenía carga, la reemplaza. Las fechas deben
+    llegar en orden de semana no decreciente (ValueError si no).
+    """
+    week = week_number(day)
+    if state["last_week"] is None:
+        state["first_week"] = state["last_week"] = week
+    elif week < state["last_week"]:
+        raise ValueError("las entradas deben agregarse en orden cronológico")
+    else:
+        _advance(state, week)
+
+    state["weekly"][week % CHRONIC_WEEKS] = load
+    first = week == state["first_week"]
+    for name, lam in _EWMA:
+        # Como pandas.ewm(adjust=False): la media arranca en la primera carga
+        state[f"ewma_{name}"] = load if first else state[f"base_{name}"] + lam * load
+    return state
+
+
+def workload_ratios(state: dict, as_of=None) -> dict:
+    """
+    Métricas agudas/crónicas del estado, a la fecha `as_of` (por defecto la última semana).
+
+    Devuelve: acute, chronic, acwr (promedio móvil), ewma_acute, ewma_chronic,
+    ewma_acwr y chronic_ready (True si ya hay 4 semanas de historial).
+    Los cocientes son None si la carga crónica es 0.
+    """
+    if state["last_week"] is None:
+        return {"acute": 0.0, "chronic": 0.0, "acwr": None, "ewma_acute": 0.0,
+                "ewma_chronic": 0.0, "ewma_acwr": None, "chronic_ready": False}
+    if as_of is not None and week_number(as_of) > state["last_week"]:
+        state = {**state, "weekly": list(state["weekly"])}
+        _advance(state, week_number(as_of))
+
+    last, weekly = state["last_week"], state["weekly"]
+    acute = sum(weekly[(last - i) % CHRONIC_WEEKS] for i in range(ACUTE_WEEKS)) / ACUTE_WEEKS
+    chronic = sum(weekly) / CHRONIC_WEEKS
+    ewma_acute, ewma_chronic = state["ewma_acute"], state["ewma_chronic"]
+    return {
+        "acute": acute,
+        "chronic": chronic,
+        "acwr": acute / chronic if chronic > 0 else None,
+        "ewma_acute": ewma_acute,
+        "ewma_chronic": ewma_chronic,
+        "ewma_acwr": ewma_acute / ewma_chronic if ewma_chronic > 0 else None,
+        "chronic_ready": last - state["first_week"] + 1 >= CHRONIC_WEEKS,
+    }
+
+
+# ─────────────────────────────────────────────
+# RECONSTRUCCIÓN SOBRE TODO EL HISTORIAL
+# ─────────────────────────────────────────────
+
+def replay_workload(entries) -> dict:
+    """
+    Estado final aplicando `update_workload` entrada por entrada (Python puro).
+    Acepta una lista de entradas o un `HistoryColumns`.
+    """
+    state = new_state()
+    if isinstance(entries, HistoryColumns):
+        for day, load in zip(entries.days, entries.loads):
+            update_workload(state, day, load)
+        return state
+    for entry in sorted(entries, key=lambda e: e["date"]):
+        update_workload(state, entry["date"], entry["load"])
+    return state
+
+
+def backfill_workload(entries):
+    """
+    Métricas semanales de todo el historial, calculadas de forma vectorizada con pandas.
+    Acepta una lista de entradas o un `HistoryColumns`.
+
+    Devuelve (frame, state): un DataFrame indexado por semana (fecha del lunes)
+    con las columnas load, acute, chronic, acwr, ewma_acute, ewma_chronic,
+    ewma_acwr; y el estado incremental a la última semana, listo para seguir
+    con `update_workload`.
+    """
+    import pandas as pd
+
+    columns = entries if isinstance(entries, HistoryColumns) else HistoryColumns.from_entries(entries)
+    if not len(columns):
+        return pd.DataFrame(columns=["load", "acute", "chronic", "acwr",
+                                     "ewma_acute", "ewma_chronic", "ewma_acwr"]), new_state()
+
+    days, values, _ = columns.to_numpy()
+    # La última entrada de cada semana es su carga; las semanas sin entradas valen 0
+    loads = pd.Series(values, index=(days - 1) // 7)
+    by_week = loads.groupby(level=0).last()
+    first_week, last_week = int(by_week.index[0]), int(by_week.index[-1])
+    weeks = by_week.reindex(range(first_week, last_week + 1), fill_value=0)
+    weeks.index = pd.to_datetime(weeks.index * 7 + 1 - _EPOCH_ORDINAL, unit="D")
+
+    frame = pd.DataFrame({"load": weeks})
+    frame["acute"] = weeks.rolling(ACUTE_WEEKS, min_periods=1).sum() / ACUTE_WEEKS
+    frame["chronic"] = weeks.rolling(CHRONIC_WEEKS, min_periods=1).sum() / CHRONIC_WEEKS
+    frame["acwr"] = frame["acute"] / frame["chronic"].where(frame["chronic"] > 0)
+    frame["ewma_acute"] = weeks.ewm(alpha=LAMBDA_ACUTE, adjust=False).mean()
+    frame["ewma_chronic"] = weeks.ewm(alpha=LAMBDA_CHRONIC, adjust=False).mean()
+    frame["ewma_acwr"] = frame["ewma_acute"] / frame["ewma_chronic"].where(frame["ewma_chronic"] > 0)
+
+    state = new_state()
+    window = weeks.iloc[-CHRONIC_WEEKS:].tolist()
+    for offset, value in enumerate(reversed(window)):
+        state["weekly"][(last_week - offset) % CHRONIC_WEEKS] = value
+    state.update(first_week=first_week, last_week=last_week)
+    for name, lam in _EWMA:
+        ewma = frame[f"ewma_{name}"]
+        state[f"ewma_{name}"] = float(ewma.iloc[-1])
+        state[f"base_{name}"] = float(ewma.iloc[-2]) * (1 - lam) if len(ewma) > 1 else 0.0
+    return frame, state
+
+
+def state_from_history(entries) -> dict:
+    """
+    Estado incremental a partir del historial completo (vectorizado si hay pandas).
+    Acepta una lista de entradas o un `HistoryColumns`.
+    """
+    try:
+        import pandas  # noqa: F401
+    except ImportError:
+        return replay_workload(entries)
+    return backfill_workload(entries)[1]